@@ -0,0 +1,275 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from mysql.connector import Error
+
+logger = logging.getLogger(__name__)
+
+# Time-to-conversion histogram buckets, in days (upper bound inclusive)
+CONVERSION_BUCKETS = [(0, 7), (8, 30), (31, 90), (91, 180), (181, None)]
+
+
+class AnalyticsEngine:
+    """Lead conversion funnel and cohort analytics
+
+    The heavy lifting runs in the database against client_contact_summary,
+    a per-client rollup of the contacts table, so the analyses read one
+    row per client instead of scanning every contact. Conversion is
+    attributed to the last contact before a client's converted_at.
+    """
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def rebuild_client_summary(self, since: Optional[datetime] = None) -> int:
+        """Recompute the per-client rollup
+
+        With since, only clients with contacts written after that moment
+        are recomputed. Summary rows of clients left without any contact
+        are removed either way. Returns the number of clients refreshed
+        or removed, or -1 on error.
+        """
+        source = self.db_manager.contacts_source(date.min)
+        where = ""
+        params = []
+        if since is not None:
+            where = """
+                WHERE c.client_id IN (
+                    SELECT client_id FROM contacts WHERE updated_at >= %s
+                    UNION
+                    SELECT id FROM clients WHERE updated_at >= %s
+                )
+            """
+            params = [since, since]
+        try:
+            cursor = self.db_manager.connection.cursor()
+            # The upsert's rowcount counts an updated row twice, so the
+            # clients are counted on their own
+            cursor.execute(
+                f"SELECT COUNT(DISTINCT c.client_id) FROM {source} c {where}",
+                params
+            )
+            refreshed = cursor.fetchone()[0]
+            # Whole history, archived contacts included
+            cursor.execute(f"""
+                INSERT INTO client_contact_summary
+                    (client_id, first_contact_at, last_contact_at,
+                     contact_count, completed_count, max_rating, converted_at)
+                SELECT c.client_id,
+                       MIN(c.contact_datetime),
+                       MAX(c.contact_datetime),
+                       COUNT(*),
+                       SUM(c.status = 'Completed'),
+                       MAX(c.conversion_rating),
+                       cl.converted_at
+                FROM {source} c
+                JOIN clients cl ON c.client_id = cl.id
+                {where}
+                GROUP BY c.client_id, cl.converted_at
+                ON DUPLICATE KEY UPDATE
+                    first_contact_at = VALUES(first_contact_at),
+                    last_contact_at = VALUES(last_contact_at),
+                    contact_count = VALUES(contact_count),
+                    completed_count = VALUES(completed_count),
+                    max_rating = VALUES(max_rating),
+                    converted_at = VALUES(converted_at)
+            """, params)
+            # Deleted contacts leave no updated_at behind, so stale rows
+            # are found by what is missing
+            cursor.execute("""
+                DELETE s FROM client_contact_summary s
+                WHERE NOT EXISTS (SELECT 1 FROM contacts c
+                                  WHERE c.client_id = s.client_id)
+                  AND NOT EXISTS (SELECT 1 FROM contacts_archive a
+                                  WHERE a.client_id = s.client_id)
+            """)
+            removed = cursor.rowcount
+            self.db_manager.connection.commit()
+            cursor.close()
+            return refreshed + removed
+        except Error as e:
+            logger.error(f"Error rebuilding client summary: {e}")
+            try:
+                self.db_manager.connection.rollback()
+            except Error:
+                pass
+            return -1
+
+    def time_to_conversion(self, start_date: date,
+                           end_date: date) -> Dict[str, Any]:
+        """How long converted clients took from first contact to conversion
+
+        Covers clients converted between the two dates (inclusive).
+        Returns the count, mean and median days and a histogram over
+        CONVERSION_BUCKETS. The database groups the clients, so only one
+        row per bucket and the median's one or two days come back.
+        """
+        result = {'count': 0, 'mean_days': None, 'median_days': None,
+                  'histogram': [{'from': low, 'to': high, 'count': 0}
+                                for low, high in CONVERSION_BUCKETS]}
+        conversions = """
+            SELECT DATEDIFF(converted_at, first_contact_at) AS days
+            FROM client_contact_summary
+            WHERE converted_at >= %s AND converted_at < %s
+              AND converted_at >= first_contact_at
+        """
+        bucket = "CASE " + " ".join(
+            f"WHEN days <= {high} THEN {index}"
+            for index, (low, high) in enumerate(CONVERSION_BUCKETS)
+            if high is not None
+        ) + f" ELSE {len(CONVERSION_BUCKETS) - 1} END"
+        params = (start_date, end_date + timedelta(days=1))
+        try:
+            cursor = self.db_manager.connection.cursor(dictionary=True)
+            cursor.execute(f"""
+                SELECT {bucket} AS bucket, COUNT(*) AS clients,
+                       SUM(days) AS total_days
+                FROM ({conversions}) AS conversions
+                GROUP BY bucket
+            """, params)
+            buckets = cursor.fetchall()
+            # The median is the mean of the one or two days holding the
+            # middle positions of the sorted durations
+            cursor.execute(f"""
+                SELECT AVG(days) AS median_days
+                FROM (
+                    SELECT days, clients,
+                           SUM(clients) OVER (ORDER BY days) AS running,
+                           SUM(clients) OVER () AS total
+                    FROM (
+                        SELECT days, COUNT(*) AS clients
+                        FROM ({conversions}) AS conversions
+                        GROUP BY days
+                    ) AS per_day
+                ) AS ranked
+                WHERE (running - clients < (total + 1) DIV 2
+                       AND running >= (total + 1) DIV 2)
+                   OR (running - clients < total DIV 2 + 1
+                       AND running >= total DIV 2 + 1)
+            """, params)
+            median = cursor.fetchone()
+            cursor.close()
+        except Error as e:
+            logger.error(f"Error analysing time to conversion: {e}")
+            return result
+
+        total = sum(row['clients'] for row in buckets)
+        if not total:
+            return result
+        for row in buckets:
+            result['histogram'][row['bucket']]['count'] = row['clients']
+        result['count'] = total
+        result['mean_days'] = float(sum(row['total_days'] for row in buckets)) / total
+        result['median_days'] = float(median['median_days'])
+        return result
+
+    def cohorts(self, start_date: date, end_date: date,
+                months: int = 12) -> List[Dict[str, Any]]:
+        """Conversion of clients grouped by the month they were first contacted
+
+        One row per cohort month between the two dates, with the cohort
+        size and the cumulative share converted after 0..months-1 months.
+        """
+        try:
+            cursor = self.db_manager.connection.cursor(dictionary=True)
+            query = """
+                SELECT DATE_FORMAT(first_contact_at, '%Y-%m') AS cohort,
+                       COUNT(*) AS size,
+                       TIMESTAMPDIFF(MONTH, first_contact_at, converted_at) AS months_to_convert,
+                       COUNT(converted_at) AS converted
+                FROM client_contact_summary
+                WHERE first_contact_at >= %s AND first_contact_at < %s
+                GROUP BY cohort, months_to_convert
+                ORDER BY cohort, months_to_convert
+            """
+            cursor.execute(query, (start_date, end_date + timedelta(days=1)))
+            rows = cursor.fetchall()
+            cursor.close()
+        except Error as e:
+            logger.error(f"Error analysing cohorts: {e}")
+            return []
+
+        cohorts = {}
+        for row in rows:
+            cohort = cohorts.setdefault(row['cohort'], {
+                'cohort': row['cohort'], 'size': 0, 'converted': [0] * months
+            })
+            cohort['size'] += row['size']
+            offset = row['months_to_convert']
+            if offset is not None and 0 <= offset < months:
+                cohort['converted'][offset] += row['converted']
+
+        result = []
+        for cohort in cohorts.values():
+            running = 0
+            rates = []
+            for converted in cohort['converted']:
+                running += converted
+                rates.append(running / cohort['size'] if cohort['size'] else 0.0)
+            result.append({
+                'cohort': cohort['cohort'],
+                'size': cohort['size'],
+                'conversion_rates': rates
+            })
+        return result
+
+    def conversion_rates(self, dimension: str, start_date: date,
+                         end_date: date) -> List[Dict[str, Any]]:
+        """Conversion rate per employee or per contact method
+
+        A lead is a client who was a potential client when contacted. The
+        conversion is credited to the last contact before converted_at;
+        the rate is credited conversions over distinct leads contacted.
+        """
+        if dimension == 'employee':
+            group = "e.name"
+            join = "JOIN employees e ON c.employee_id = e.id"
+        elif dimension == 'method':
+            group = "c.contact_method"
+            join = ""
+        else:
+            raise ValueError(f"Unknown dimension: {dimension}")
+
+        try:
+            cursor = self.db_manager.connection.cursor(dictionary=True)
+            query = f"""
+                SELECT {group} AS label,
+                       COUNT(DISTINCT c.client_id) AS leads,
+                       SUM(c.last_touch = 1 AND c.converted) AS conversions
+                FROM (
+                    SELECT ct.*,
+                           cl.converted_at IS NOT NULL
+                               AND ct.contact_datetime <= cl.converted_at AS converted,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY ct.client_id,
+                                   (cl.converted_at IS NOT NULL
+                                    AND ct.contact_datetime <= cl.converted_at)
+                               ORDER BY ct.contact_datetime DESC
+                           ) AS last_touch
+                    FROM {self.db_manager.contacts_source(start_date)} ct
+                    JOIN clients cl ON ct.client_id = cl.id
+                    WHERE (cl.client_type = 'potential'
+                           OR ct.contact_datetime <= cl.converted_at)
+                      AND ct.contact_datetime >= %s AND ct.contact_datetime < %s
+                ) AS c
+                {join}
+                GROUP BY label
+                ORDER BY label
+            """
+            cursor.execute(query, (start_date, end_date + timedelta(days=1)))
+            rows = cursor.fetchall()
+            cursor.close()
+        except Error as e:
+            logger.error(f"Error analysing conversion rates: {e}")
+            return []
+
+        return [
+            {
+                'label': row['label'],
+                'leads': row['leads'],
+                'conversions': int(row['conversions'] or 0),
+                'rate': int(row['conversions'] or 0) / row['leads'] if row['leads'] else 0.0
+            }
+            for row in rows
+        ]
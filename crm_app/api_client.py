@@ -0,0 +1,235 @@
+import copy
+import gzip
+import http.client
+import logging
+import socket
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from api_protocol import EXPOSED, STREAMED, dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+class ApiError(Exception):
+    """The API service refused or failed a call"""
+
+
+# What a failed call can raise on the way: network, HTTP or bad payload
+_FAILURES = (OSError, http.client.HTTPException, ValueError, ApiError)
+
+
+class _RemoteAnalytics:
+    """AnalyticsEngine look-alike whose methods run on the service"""
+
+    def __init__(self, manager: 'HttpDatabaseManager'):
+        self._manager = manager
+
+    def __getattr__(self, name):
+        method = f"analytics.{name}"
+        if method not in EXPOSED:
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self._manager.call(method, *args, **kwargs)
+
+
+class HttpDatabaseManager:
+    """DatabaseManager backend that talks to the API service over HTTP
+
+    Exposes the same methods as DatabaseManager, so stores and widgets
+    work unchanged. Like DatabaseManager, failed calls are logged and
+    return the method's failure value (None, [], False..., or None for a
+    call passing strict=True), except the iter_* streams, which raise so
+    an export never looks complete when it is not. A connection is kept alive per manager; use clone() for other
+    threads.
+    """
+
+    # Mirrors DatabaseManager.REPORT_COLUMNS, which callers read directly
+    REPORT_COLUMNS = [
+        "Date/Time", "Client Name", "Type", "Employee",
+        "Method", "Rating", "Status", "Notes"
+    ]
+
+    def __init__(self, url: str = 'http://127.0.0.1:8765',
+                 timeout: float = 30.0, token: Optional[str] = None):
+        self.url = url
+        self.timeout = timeout
+        self.token = token
+        parts = urlsplit(url)
+        self._host = parts.hostname or '127.0.0.1'
+        self._port = parts.port or 8765
+        self._http = None
+        self._token = None
+        # Writes go through the service's own managers, so change feed
+        # events never carry an origin of ours
+        self.origin = None
+
+    def connect(self) -> bool:
+        """Check the service is reachable"""
+        try:
+            self._request('GET', '/health')
+            return True
+        except _FAILURES as e:
+            logger.error(f"Error connecting to API service at {self.url}: {e}")
+            return False
+
+    def close(self):
+        """Close the HTTP connection"""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def ensure_connected(self) -> bool:
+        """Requests reopen a dropped connection themselves"""
+        return True
+
+    def clone(self) -> 'HttpDatabaseManager':
+        """Return an unconnected manager for another thread, same login"""
+        return HttpDatabaseManager(self.url, self.timeout, self.token)
+
+    def analytics(self):
+        return _RemoteAnalytics(self)
+
+    @contextmanager
+    def running(self, token):
+        """Let a database.CancelToken interrupt the calls in the block
+
+        Cancelling drops the connection, so the call fails at once. The
+        service's own query stops at its session max_execution_time.
+        """
+        if token is None:
+            yield True
+            return
+        if not token.attach(self._interrupt):
+            yield False
+            return
+        self._token = token
+        try:
+            yield True
+        finally:
+            token.detach()
+            self._token = None
+
+    def _interrupt(self):
+        connection = self._http
+        if connection is not None and connection.sock is not None:
+            # Unlike close(), shutdown wakes a thread blocked reading
+            try:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    # Calls
+
+    def __getattr__(self, name):
+        if name not in EXPOSED and name not in STREAMED:
+            raise AttributeError(name)
+        if name in STREAMED:
+            return lambda *args, **kwargs: self.stream(name, *args, **kwargs)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    def verify_login(self, login_id: str, password: str) -> Optional[dict]:
+        """Log in; later calls carry the session token the service returns"""
+        try:
+            response = self._request('POST', '/rpc', {
+                'method': 'verify_login', 'args': [login_id, password]
+            })
+        except _FAILURES as e:
+            logger.error(f"Error verifying login: {e}")
+            return None
+        self.token = response.get('token')
+        return response.get('result')
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        """Run one DatabaseManager method on the service"""
+        try:
+            response = self._request('POST', '/rpc', {
+                'method': method, 'args': list(args), 'kwargs': kwargs
+            })
+            return response['result']
+        except _FAILURES as e:
+            logger.error(f"Error calling {method}: {e}")
+            return self._failure(method, kwargs)
+
+    def batch(self, calls: List[Tuple[str, tuple, Dict[str, Any]]]) -> List[Any]:
+        """Run several (method, args, kwargs) calls in one round-trip
+
+        On failure every call gets its failure value.
+        """
+        try:
+            response = self._request('POST', '/batch', {'calls': [
+                {'method': method, 'args': list(args), 'kwargs': kwargs}
+                for method, args, kwargs in calls
+            ]})
+            return response['results']
+        except _FAILURES as e:
+            logger.error(f"Error calling batch of {len(calls)}: {e}")
+            return [self._failure(method, kwargs) for method, _, kwargs in calls]
+
+    @staticmethod
+    def _failure(method: str, kwargs: Dict[str, Any]) -> Any:
+        if kwargs.get('strict'):
+            return None
+        # A fresh default; callers may mutate what they get back
+        return copy.deepcopy(EXPOSED[method])
+
+    def stream(self, method: str, *args, **kwargs) -> Iterator[list]:
+        """Yield the batches of a streamed generator method"""
+        # A stream ties up its connection, so it gets one of its own
+        connection = http.client.HTTPConnection(self._host, self._port,
+                                                timeout=self.timeout)
+        try:
+            connection.request('POST', '/stream', dumps({
+                'method': method, 'args': list(args), 'kwargs': kwargs
+            }), self._headers())
+            response = connection.getresponse()
+            if response.status != 200:
+                raise ApiError(loads(response.read()).get('error'))
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                # A stream the service cuts short raises IncompleteRead
+                yield loads(line)
+        except _FAILURES as e:
+            logger.error(f"Error streaming {method}: {e}")
+            raise
+        finally:
+            connection.close()
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {'Content-Type': 'application/json',
+                   'Accept-Encoding': 'gzip'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        return headers
+
+    def _request(self, verb: str, path: str, payload=None) -> Any:
+        body = dumps(payload) if payload is not None else None
+        for attempt in range(2):
+            if self._http is None:
+                self._http = http.client.HTTPConnection(
+                    self._host, self._port, timeout=self.timeout
+                )
+            try:
+                self._http.request(verb, path, body, self._headers())
+                response = self._http.getresponse()
+                data = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError):
+                # The service closed an idle keep-alive connection; retry
+                # once on a fresh one
+                self.close()
+                if attempt or (self._token and self._token.interrupted):
+                    raise
+            except (OSError, http.client.HTTPException):
+                self.close()
+                raise
+
+        if response.getheader('Content-Encoding') == 'gzip':
+            data = gzip.decompress(data)
+        result = loads(data)
+        if response.status != 200:
+            raise ApiError(f"{response.status}: {result.get('error')}")
+        return result
@@ -0,0 +1,114 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+# DatabaseManager methods the API service exposes, with the value the
+# HTTP backend returns when a call fails, mirroring DatabaseManager's own
+# failure values
+EXPOSED = {
+    'verify_login': None,
+    'get_state_codes': [],
+    'get_clients': [],
+    'get_client': None,
+    'create_client': None,
+    'update_client': False,
+    'delete_client': False,
+    'get_employee_contacts': [],
+    'count_report_contacts': 0,
+    'get_contact_trends': [],
+    'search_contact_notes': [],
+    'get_contact': None,
+    'get_contact_notes': None,
+    'get_conflicting_contacts': [],
+    'create_contact': None,
+    'update_contact': False,
+    'delete_contact': False,
+    'get_series': None,
+    'create_series': None,
+    'end_series': False,
+    'get_clients_needing_contact': [],
+    'insert_contacts': -1,
+    'get_employees': [],
+    'get_employee': None,
+    'create_employee': None,
+    'update_employee': False,
+    'delete_employee': False,
+    'latest_change': 0,
+    'get_changes': [],
+    'get_changes_by_seq': [],
+    'analytics.rebuild_client_summary': -1,
+    'analytics.time_to_conversion': {'count': 0, 'mean_days': None,
+                                     'median_days': None, 'histogram': []},
+    'analytics.cohorts': [],
+    'analytics.conversion_rates': [],
+}
+
+# Generator methods, streamed as one JSON line per batch
+STREAMED = {'iter_report_contacts', 'iter_clients'}
+
+MANAGER_ONLY = {
+    'create_employee', 'update_employee', 'delete_employee', 'iter_clients',
+    'get_clients_needing_contact', 'insert_contacts',
+    'analytics.rebuild_client_summary', 'analytics.time_to_conversion',
+    'analytics.cohorts', 'analytics.conversion_rates',
+}
+
+# Methods whose employee_id a non-manager may only set to their own id
+EMPLOYEE_SCOPED = {
+    'get_employee_contacts', 'count_report_contacts', 'iter_report_contacts',
+    'get_contact_trends', 'search_contact_notes', 'get_conflicting_contacts',
+}
+
+
+# Methods on one contact or series, which a non-manager may only call on
+# rows of their own: method -> (table, argument holding the id, key of
+# the id when the argument is a dict)
+EMPLOYEE_OWNED = {
+    'get_contact': ('contacts', 'contact_id', None),
+    'get_contact_notes': ('contacts', 'contact_id', None),
+    'update_contact': ('contacts', 'contact_data', 'id'),
+    'delete_contact': ('contacts', 'contact_id', None),
+    'get_series': ('contact_series', 'series_id', None),
+    'end_series': ('contact_series', 'series_id', None),
+}
+
+# Methods whose record a non-manager always creates or keeps as their
+# own: method -> argument holding the record
+EMPLOYEE_RECORD = {
+    'create_contact': 'contact_data',
+    'update_contact': 'contact_data',
+    'create_series': 'series_data',
+}
+
+def _default(value):
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def _object_hook(obj):
+    if len(obj) == 1:
+        if '$datetime' in obj:
+            return datetime.fromisoformat(obj['$datetime'])
+        if '$date' in obj:
+            return date.fromisoformat(obj['$date'])
+    return obj
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a value as JSON, keeping dates and datetimes typed"""
+    return json.dumps(value, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """Decode JSON written by dumps"""
+    return json.loads(data, object_hook=_object_hook)
@@ -0,0 +1,418 @@
+import argparse
+import asyncio
+import gzip
+import inspect
+import logging
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from api_protocol import (EXPOSED, STREAMED, MANAGER_ONLY, EMPLOYEE_SCOPED,
+                          EMPLOYEE_OWNED, EMPLOYEE_RECORD, dumps, loads)
+from audit import AuditLog
+from database import DatabaseManager
+from log_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Responses smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_BATCH_CALLS = 100
+SESSION_TTL = 12 * 3600
+
+
+class ApiError(Exception):
+    """A request the service refuses, with its HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiServer:
+    """Asyncio HTTP/JSON service in front of a pool of DatabaseManagers
+
+    Desktop seats talk to this process instead of holding a MySQL
+    connection each; pool_size connections serve all of them. Endpoints:
+
+        GET  /health          pool state, no login needed
+        POST /rpc             {"method", "args", "kwargs"} -> {"result"}
+        POST /batch           {"calls": [...]} -> {"results": [...]}, run
+                              back to back on one pooled connection
+        POST /stream          generator methods, one JSON line per batch
+
+    Every call but verify_login needs the bearer token verify_login
+    returns. Blocking database work runs on a thread per pooled
+    connection; responses are gzipped when the client accepts it.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, pool_size: int = 8,
+                 host: str = '127.0.0.1', port: int = 8765,
+                 audit: bool = True):
+        self.template = db_manager
+        self.pool_size = pool_size
+        self.host = host
+        self.port = port
+        self.audit = audit
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self._pool: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="api-db"
+        )
+        self._audit_log = None
+
+    # Lifecycle
+
+    async def start(self):
+        """Connect the pool and start listening"""
+        self._pool = asyncio.Queue()
+        if self.audit:
+            self._audit_log = AuditLog(self.template)
+            if not self._audit_log.start():
+                self._audit_log = None
+        for _ in range(self.pool_size):
+            manager = self.template.clone()
+            if not manager.connect():
+                raise RuntimeError("Could not connect to the database")
+            manager.audit_log = self._audit_log
+            self._pool.put_nowait(manager)
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        logger.info(f"API service listening on http://{self.host}:{self.port} "
+                    f"with {self.pool_size} database connections")
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """Close the listener and every pooled connection"""
+        self._server.close()
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+        if self._audit_log is not None:
+            self._audit_log.close()
+        self._executor.shutdown(wait=False)
+
+    # HTTP
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except ApiError as e:
+                    # The body cannot be told from the next request, so
+                    # the connection ends after the error
+                    await self._respond(writer, {}, e.status, {'error': str(e)})
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._dispatch(writer, method, path, headers, body)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, path, _ = line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise ConnectionError("Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise ApiError(400, "Bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise ConnectionError("Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return method, path, headers, body
+
+    async def _dispatch(self, writer, method, path, headers, body):
+        self.requests += 1
+        started = time.perf_counter()
+        try:
+            if method == 'GET' and path == '/health':
+                await self._respond(writer, headers, 200, {
+                    'status': 'ok',
+                    'pool_size': self.pool_size,
+                    'pool_idle': self._pool.qsize(),
+                    'sessions': len(self.sessions),
+                    'requests': self.requests
+                })
+                return
+            if method != 'POST':
+                raise ApiError(405, "Only POST is supported")
+            payload = loads(body) if body else {}
+            if path == '/rpc':
+                result = await self._call(headers, payload)
+                await self._respond(writer, headers, 200, result)
+            elif path == '/batch':
+                calls = payload.get('calls') or []
+                if len(calls) > MAX_BATCH_CALLS:
+                    raise ApiError(400, f"At most {MAX_BATCH_CALLS} calls per batch")
+                results = await self._call_batch(headers, calls)
+                await self._respond(writer, headers, 200, {'results': results})
+            elif path == '/stream':
+                await self._stream(writer, headers, payload)
+            else:
+                raise ApiError(404, f"No endpoint {path}")
+        except ApiError as e:
+            await self._respond(writer, headers, e.status, {'error': str(e)})
+        except ValueError as e:
+            await self._respond(writer, headers, 400, {'error': f"Bad request: {e}"})
+        except ConnectionError:
+            raise
+        except Exception as e:
+            # Bugs, and database errors a method let through, fail the
+            # request rather than the connection
+            logger.error(f"Error serving {path}: {e!r}")
+            await self._respond(writer, headers, 500, {'error': "Internal error"})
+        finally:
+            logger.debug(f"{method} {path} took "
+                         f"{(time.perf_counter() - started) * 1000:.1f} ms")
+
+    async def _respond(self, writer, request_headers, status, payload):
+        body = dumps(payload)
+        extra = ""
+        if (len(body) >= GZIP_MIN_BYTES
+                and 'gzip' in request_headers.get('accept-encoding', '')):
+            body = gzip.compress(body, compresslevel=5)
+            extra = "Content-Encoding: gzip\r\n"
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n{extra}\r\n".encode('latin-1')
+            + body
+        )
+        await writer.drain()
+
+    # Calls
+
+    def _session(self, headers, method: str) -> Optional[Dict[str, Any]]:
+        if method == 'verify_login':
+            return None
+        token = headers.get('authorization', '').removeprefix('Bearer ').strip()
+        session = self.sessions.get(token)
+        if session is None or session['expires'] < time.time():
+            self.sessions.pop(token, None)
+            raise ApiError(401, "Not logged in")
+        return session
+
+    @staticmethod
+    def _target(manager: DatabaseManager, method: str):
+        if method.startswith('analytics.'):
+            return getattr(manager.analytics(), method.split('.', 1)[1])
+        return getattr(manager, method)
+
+    def _prepare(self, headers, call: Dict[str, Any], allowed) -> Tuple:
+        """Check a call and bind its arguments by name"""
+        method = call.get('method')
+        if method not in allowed:
+            raise ApiError(404, f"No method {method}")
+        session = self._session(headers, method)
+        user = session['user'] if session else None
+        if method in MANAGER_ONLY and user['role'] != 'manager':
+            raise ApiError(403, f"{method} is for managers only")
+
+        if method.startswith('analytics.'):
+            from analytics import AnalyticsEngine
+            function = getattr(AnalyticsEngine, method.split('.', 1)[1])
+        else:
+            function = getattr(DatabaseManager, method)
+        try:
+            bound = inspect.signature(function).bind(
+                None, *call.get('args', []), **call.get('kwargs', {})
+            )
+        except TypeError as e:
+            raise ApiError(400, str(e))
+        arguments = dict(bound.arguments)
+        arguments.pop('self')
+
+        # Employees only ever see their own contacts
+        if method in EMPLOYEE_SCOPED and user['role'] != 'manager':
+            arguments['employee_id'] = user['id']
+            if 'is_manager' in inspect.signature(function).parameters:
+                arguments['is_manager'] = False
+        # ...and only book and keep them for themselves
+        record = EMPLOYEE_RECORD.get(method)
+        if record and user['role'] != 'manager':
+            if not isinstance(arguments.get(record), dict):
+                raise ApiError(400, f"{record} must be an object")
+            arguments[record] = dict(arguments[record], employee_id=user['id'])
+        return method, user, arguments
+
+    @staticmethod
+    def _check_owner(manager, method, user, arguments):
+        """Refuse a non-manager a contact or series that is not theirs
+
+        Needs the database, so it runs in the worker thread with the call.
+        """
+        if method not in EMPLOYEE_OWNED or user['role'] == 'manager':
+            return
+        table, argument, key = EMPLOYEE_OWNED[method]
+        row_id = arguments.get(argument)
+        if key is not None:
+            row_id = row_id.get(key) if isinstance(row_id, dict) else None
+        if manager.get_owner(table, row_id) != user['id']:
+            raise ApiError(404, f"No {table} row {row_id}")
+
+    async def _acquire(self) -> DatabaseManager:
+        """Take a pooled manager, reconnecting it if its connection dropped
+
+        Connections idle past MySQL's wait_timeout, or cut by a server
+        restart, come back on their next use instead of failing every
+        call until the service restarts.
+        """
+        manager = await self._pool.get()
+        try:
+            connected = await asyncio.get_running_loop().run_in_executor(
+                self._executor, manager.ensure_connected
+            )
+        except BaseException:
+            self._pool.put_nowait(manager)
+            raise
+        if not connected:
+            self._pool.put_nowait(manager)
+            raise ApiError(503, "Database unavailable")
+        return manager
+
+    def _run(self, manager, method, user, arguments, checked=False):
+        """Run one call on a pooled manager (in a worker thread)"""
+        if not checked:
+            self._check_owner(manager, method, user, arguments)
+        manager.audit_user_id = user['id'] if user else None
+        return self._target(manager, method)(**arguments)
+
+    async def _call(self, headers, call):
+        method, user, arguments = self._prepare(headers, call, EXPOSED)
+        manager = await self._acquire()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._run, manager, method, user, arguments
+            )
+        finally:
+            self._pool.put_nowait(manager)
+
+        if method == 'verify_login':
+            if not result:
+                return {'result': None}
+            now = time.time()
+            for expired in [t for t, s in self.sessions.items()
+                            if s['expires'] < now]:
+                del self.sessions[expired]
+            token = secrets.token_urlsafe(32)
+            self.sessions[token] = {'user': result,
+                                    'expires': now + SESSION_TTL}
+            return {'result': result, 'token': token}
+        return {'result': result}
+
+    async def _call_batch(self, headers, calls):
+        prepared = [self._prepare(headers, call, EXPOSED) for call in calls]
+        if any(method == 'verify_login' for method, _, _ in prepared):
+            raise ApiError(400, "verify_login cannot be batched")
+
+        def run_all(manager):
+            # Refuse the whole batch before any of it runs
+            for call in prepared:
+                self._check_owner(manager, *call)
+            return [self._run(manager, *call, checked=True)
+                    for call in prepared]
+
+        manager = await self._acquire()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, run_all, manager
+            )
+        finally:
+            self._pool.put_nowait(manager)
+
+    async def _stream(self, writer, headers, call):
+        method, user, arguments = self._prepare(headers, call, STREAMED)
+        loop = asyncio.get_running_loop()
+        manager = await self._acquire()
+        try:
+            batches = self._run(manager, method, user, arguments)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/x-ndjson\r\n"
+                b"Transfer-Encoding: chunked\r\n\r\n"
+            )
+            while True:
+                # Each batch is fetched on the pool thread, then written
+                # while the client reads, so memory holds one batch
+                batch = await loop.run_in_executor(
+                    self._executor, next, batches, None
+                )
+                if batch is None:
+                    break
+                chunk = dumps(batch) + b"\n"
+                writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except Exception as e:
+            # Headers are already sent; cutting the stream short tells
+            # the client it is incomplete
+            logger.error(f"Error streaming {method}: {e}")
+            writer.close()
+            # The connection may hold unread rows; start it afresh
+            manager.close()
+            await loop.run_in_executor(self._executor, manager.connect)
+        finally:
+            self._pool.put_nowait(manager)
+
+
+def main():
+    """Run the API service from the command line"""
+    parser = argparse.ArgumentParser(description="CRM JSON API service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pool-size', type=int, default=8)
+    parser.add_argument('--db-host', default='localhost')
+    parser.add_argument('--db-name', default='crm_db')
+    parser.add_argument('--db-user', default='root')
+    parser.add_argument('--db-password', default='')
+    parser.add_argument('--no-audit', action='store_true')
+    options = parser.parse_args()
+    configure_logging('api')
+
+    server = ApiServer(
+        DatabaseManager(host=options.db_host, database=options.db_name,
+                        user=options.db_user, password=options.db_password),
+        pool_size=options.pool_size, host=options.host, port=options.port,
+        audit=not options.no_audit
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
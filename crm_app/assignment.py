@@ -0,0 +1,127 @@
+"""Spreading follow-up contacts for a batch of clients across employees
+
+plan_assignments() gives each client to the least loaded employee who
+can take them, using a min-heap keyed on scheduled minutes. With
+territories on, clients go to the employees covering their state, and to
+employees without a territory when nobody covers it. Each contact is
+booked into the chosen employee's next free slot within working hours,
+so existing bookings and earlier assignments are never double-booked.
+
+The planner works on plain rows and writes nothing; the caller stores
+the result with DatabaseManager.insert_contacts() in one transaction.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from heapq import heapify, heappop, heapreplace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from scheduling import DEFAULT_DURATION, FREE_STATUSES, ScheduleIndex
+
+
+def plan_assignments(clients: Iterable[Dict[str, Any]],
+                     employees: Iterable[Dict[str, Any]],
+                     booked: Iterable[Dict[str, Any]],
+                     start: datetime,
+                     minutes: int = DEFAULT_DURATION,
+                     contact_method: str = 'phone',
+                     use_territories: bool = True,
+                     day_start: time = time(8), day_end: time = time(18),
+                     workdays: Iterable[int] = range(5),
+                     horizon_days: int = 90
+                     ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Plan one contact per client; returns (contacts, clients left over)
+
+    clients need id and state_code, employees id and territory. booked
+    holds the employees' contacts from start on (with duration_minutes
+    and status); they count towards the load and block their time.
+    Clients are left over when every employee who could take them is
+    fully booked for horizon_days.
+    """
+    booked = list(booked)
+    index = ScheduleIndex()
+    index.rebuild(booked)
+    load: Dict[int, int] = defaultdict(int)
+    for contact in booked:
+        if contact.get('status') not in FREE_STATUSES:
+            load[contact['employee_id']] += (contact.get('duration_minutes')
+                                             or DEFAULT_DURATION)
+
+    # territory -> heap of (scheduled minutes, employee id); None holds
+    # the employees without a territory, or everyone without territories
+    heaps: Dict[Optional[str], List[Tuple[int, int]]] = defaultdict(list)
+    for employee in employees:
+        territory = employee.get('territory') if use_territories else None
+        heaps[territory or None].append((load[employee['id']], employee['id']))
+    for heap in heaps.values():
+        heapify(heap)
+
+    # Where each employee's next slot search starts; assignments are
+    # booked in order, so the search never looks back
+    search_from: Dict[int, datetime] = defaultdict(lambda: start)
+    horizon_end = start + timedelta(days=horizon_days)
+    length = timedelta(minutes=minutes)
+    contacts, unassigned = [], []
+    for client in clients:
+        heap = heaps.get(client.get('state_code') or None) if use_territories else None
+        if not heap:
+            heap = heaps.get(None)
+        slot = None
+        while heap:
+            employee_load, employee_id = heap[0]
+            # Whole days, rounded up so a part day left before the horizon
+            # is still searched; slots past the horizon are cut off below
+            remaining = horizon_end - search_from[employee_id]
+            slot = index.next_free_slot(
+                employee_id, search_from[employee_id], minutes,
+                day_start=day_start, day_end=day_end, workdays=workdays,
+                horizon_days=math.ceil(remaining.total_seconds() / 86400)
+            )
+            if slot is not None and slot >= horizon_end:
+                slot = None
+            if slot is not None:
+                heapreplace(heap, (employee_load + minutes, employee_id))
+                break
+            # Fully booked for the horizon; stop offering this employee
+            heappop(heap)
+        if slot is None:
+            unassigned.append(client)
+            continue
+        search_from[employee_id] = slot + length
+        contacts.append({
+            'client_id': client['id'],
+            'employee_id': employee_id,
+            'contact_datetime': slot,
+            'duration_minutes': minutes,
+            'contact_method': contact_method,
+            'status': 'Scheduled',
+        })
+    return contacts, unassigned
+
+
+def plan_followups(db_manager, start: datetime,
+                   client_type: Optional[str] = None,
+                   state_code: Optional[str] = None,
+                   employee_ids: Optional[Iterable[int]] = None,
+                   horizon_days: int = 90, **options
+                   ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """plan_assignments() for the clients with nothing scheduled
+
+    Employees default to everyone with the employee role. Their load is
+    what is scheduled in the horizon, recurring occurrences included.
+    Other keyword arguments go to plan_assignments().
+    """
+    clients = db_manager.get_clients_needing_contact(client_type, state_code)
+    employees = db_manager.get_employees()
+    if employee_ids is None:
+        employees = [e for e in employees if e['role'] == 'employee']
+    else:
+        wanted = set(employee_ids)
+        employees = [e for e in employees if e['id'] in wanted]
+    booked = db_manager.get_employee_contacts(
+        None, True, start, start + timedelta(days=horizon_days), 'Scheduled',
+        columns=['employee_id', 'contact_datetime', 'duration_minutes', 'status'],
+        occurrences=True
+    )
+    return plan_assignments(clients, employees, booked, start,
+                            horizon_days=horizon_days, **options)
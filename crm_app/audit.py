@@ -0,0 +1,173 @@
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from mysql.connector import Error
+
+logger = logging.getLogger(__name__)
+
+# Never written to the audit log
+SECRET_FIELDS = {'password', 'password_hash'}
+
+# Read-only columns that would only add noise to a diff
+IGNORED_FIELDS = {'created_at', 'updated_at', 'client_name', 'employee_name',
+                  'state_name', 'notes_preview'}
+
+_STOP = object()
+
+
+def diff(before: Optional[Dict[str, Any]],
+         after: Optional[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Changed fields as {field: [before, after]}
+
+    With no before row every field in after is reported as new; with no
+    after row (a delete) every field in before is reported as removed.
+    """
+    before = before or {}
+    after = after or {}
+    changes = {}
+    for field in set(before) | set(after):
+        if field in SECRET_FIELDS or field in IGNORED_FIELDS or field == 'id':
+            continue
+        old, new = before.get(field), after.get(field)
+        if field not in after and before and after:
+            # A partial write leaves other fields unchanged
+            continue
+        if old != new:
+            changes[field] = [old, new]
+    if any(f in SECRET_FIELDS and after.get(f) for f in after):
+        changes['password'] = ["***", "***"]
+    return changes
+
+
+class AuditLog:
+    """Asynchronous, batched audit trail of data changes
+
+    record() only puts a tuple on a bounded queue, so auditing costs the
+    save path microseconds. A background thread with its own connection
+    turns queued events into before/after diffs and inserts them in
+    batches. When the queue is full, record() blocks for up to
+    put_timeout seconds (backpressure) before dropping the event.
+    close() flushes everything still queued. A batch that fails is retried
+    once on a reconnected connection before its events are dropped.
+    """
+
+    def __init__(self, db_manager, max_queue: int = 10000,
+                 batch_size: int = 500, put_timeout: float = 5.0):
+        # The writer thread needs a connection of its own
+        self.db_manager = db_manager.clone()
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+
+    def start(self) -> bool:
+        """Connect and start the writer thread"""
+        if not self.db_manager.connect():
+            logger.error("Audit log disabled: could not connect")
+            return False
+        self._thread = threading.Thread(
+            target=self._run, name="audit-writer", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        """Events queued but not yet written"""
+        return self._queue.qsize()
+
+    def record(self, table: str, action: str, row_id: Optional[int],
+               before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]],
+               user_id: Optional[int] = None):
+        """Queue a change event; the diff is computed off the save path"""
+        if not self.running:
+            return
+        event = (table, action, row_id, user_id, datetime.now(),
+                 dict(before) if before else None,
+                 dict(after) if after else None)
+        try:
+            self._queue.put(event, timeout=self.put_timeout)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Audit queue full; dropped {table} {action} {row_id}")
+
+    def close(self, timeout: float = 10.0):
+        """Flush queued events and stop the writer, waiting up to timeout"""
+        if not self.running:
+            return
+        deadline = time.monotonic() + timeout
+        try:
+            # A full queue waits for the writer to make room
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning(f"Audit writer stuck; {self.pending} events not written")
+            return
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+        if self._thread.is_alive():
+            logger.warning(f"Audit writer did not finish; {self.pending} "
+                           "events not written")
+            return
+        self.db_manager.close()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            # Whatever queued up while the last batch was written goes
+            # into the next one
+            item = self._queue.get()
+            batch = []
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        rows = []
+        for table, action, row_id, user_id, changed_at, before, after in batch:
+            rows.append((
+                table, row_id, action, user_id, changed_at,
+                json.dumps(diff(before, after), default=str)
+            ))
+        for attempt in range(2):
+            # The connection may have timed out while the log was idle
+            if not self.db_manager.ensure_connected():
+                continue
+            try:
+                cursor = self.db_manager.connection.cursor()
+                cursor.executemany("""
+                    INSERT INTO audit_log
+                        (table_name, row_id, action, user_id, changed_at, changes)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, rows)
+                self.db_manager.connection.commit()
+                cursor.close()
+                self.written += len(rows)
+                return
+            except Error as e:
+                logger.warning(f"Error writing {len(rows)} audit events: {e}")
+                try:
+                    self.db_manager.connection.rollback()
+                except Error:
+                    pass
+        self.dropped += len(rows)
+        logger.error(f"Dropped {len(rows)} audit events")
@@ -0,0 +1,106 @@
+import time
+from typing import Dict, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+
+class ChangeFeedSubscriber(QObject):
+    """Applies other users' writes to the open stores as they happen
+
+    Every write appends an event to change_feed in its own transaction, so
+    polling from the last sequence number seen is one indexed range query
+    per interval. Only the rows named by new events are re-fetched; the
+    stores then emit row signals and every bound view updates itself.
+
+    Sequence numbers are handed out at insert time but become visible at
+    commit time, so a slow transaction can show up behind a later one.
+    Missing numbers are therefore re-checked, by number, for GAP_TIMEOUT
+    seconds before being written off as rolled back.
+
+    Tables that are not held in a store, like contact_series, can instead
+    map to a signal, emitted once per poll that saw events for them.
+    """
+
+    # Emitted with the number of events applied by a poll
+    changes_applied = Signal(int)
+
+    GAP_TIMEOUT = 30
+    BATCH = 500
+
+    def __init__(self, db_manager, stores: Dict[str, object],
+                 signals: Optional[Dict[str, object]] = None,
+                 interval_ms: int = 2000, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        # table name -> EntityStore
+        self.stores = stores
+        # table name -> bound signal
+        self.signals = signals or {}
+        self.last_seq = 0
+        self._gaps: Dict[int, float] = {}
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        """Follow the feed from now on"""
+        self.last_seq = self.db_manager.latest_change()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    @Slot()
+    def poll(self):
+        """Fetch and apply the events since the last poll"""
+        now = time.monotonic()
+        for seq, first_missed in list(self._gaps.items()):
+            if now - first_missed > self.GAP_TIMEOUT:
+                del self._gaps[seq]
+        # Open gaps are looked up by number, so a gap never holds the
+        # forward read back behind events already applied
+        changes = []
+        if self._gaps:
+            changes = self.db_manager.get_changes_by_seq(
+                sorted(self._gaps)[:self.BATCH]
+            )
+        forward = self.db_manager.get_changes(self.last_seq, self.BATCH)
+
+        rows, resets, signalled = {}, set(), set()
+        for change in changes + forward:
+            seq = change['seq']
+            if seq in self._gaps:
+                del self._gaps[seq]
+            elif seq > self.last_seq:
+                for missing in range(self.last_seq + 1, seq):
+                    self._gaps[missing] = now
+                self.last_seq = seq
+            else:
+                continue
+            if change['origin'] == getattr(self.db_manager, 'origin', None):
+                # Our own write; the store already has it
+                continue
+            if change['table_name'] in self.signals:
+                signalled.add(change['table_name'])
+            elif change['table_name'] not in self.stores:
+                continue
+            elif change['action'] == 'reset':
+                resets.add(change['table_name'])
+            else:
+                # Only the last event per row matters
+                rows[(change['table_name'], change['row_id'])] = change['action']
+
+        for table in resets:
+            self.stores[table].refresh()
+        for (table, row_id), action in rows.items():
+            if table not in resets:
+                self.stores[table].apply_change(row_id, action == 'delete')
+        for table in signalled:
+            self.signals[table].emit()
+
+        applied = len(resets) + len(rows) + len(signalled)
+        if applied:
+            self.changes_applied.emit(applied)
+        # A full forward page means more are waiting
+        if len(forward) == self.BATCH:
+            QTimer.singleShot(0, self.poll)
@@ -0,0 +1,227 @@
+import csv
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLIENT_TYPES = ('client', 'potential')
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def read_rows(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (line number, row) from a CSV or JSONL file, one row at a time"""
+    with open(path, newline='', encoding='utf-8') as handle:
+        if path.lower().endswith(('.jsonl', '.ndjson')):
+            for line_no, line in enumerate(handle, 1):
+                if line.strip():
+                    try:
+                        yield line_no, json.loads(line)
+                    except ValueError:
+                        yield line_no, {'_raw': line.rstrip('\n')}
+        else:
+            reader = csv.DictReader(handle)
+            for row in reader:
+                # Header is line 1
+                yield reader.line_num, row
+
+
+def normalize_client(row: Dict[str, Any], state_codes: Set[str]) -> Dict[str, Any]:
+    """Validated and normalized client fields, or ValueError with the reason"""
+    if not isinstance(row, dict) or '_raw' in row:
+        raise ValueError("unreadable row")
+
+    def field(name):
+        value = row.get(name)
+        value = "" if value is None else str(value).strip()
+        return value or None
+
+    name = field('name')
+    if not name:
+        raise ValueError("name is required")
+    if len(name) > 100:
+        raise ValueError("name is longer than 100 characters")
+
+    client_type = (field('client_type') or 'potential').lower()
+    if client_type not in CLIENT_TYPES:
+        raise ValueError(f"unknown client type '{client_type}'")
+
+    email = field('email')
+    if email is not None:
+        email = email.lower()
+        if not EMAIL_PATTERN.match(email):
+            raise ValueError(f"invalid email '{email}'")
+
+    phone = field('phone')
+    if phone is not None:
+        digits = re.sub(r"\D", "", phone)
+        if not 7 <= len(digits) <= 15:
+            raise ValueError(f"invalid phone '{phone}'")
+        phone = ("+" if phone.startswith("+") else "") + digits
+
+    state_code = field('state_code')
+    if state_code is not None:
+        state_code = state_code.upper()
+        if state_code not in state_codes:
+            raise ValueError(f"unknown state code '{state_code}'")
+
+    return {
+        'name': name,
+        'client_type': client_type,
+        'email': email,
+        'phone': phone,
+        'address': field('address'),
+        'state_code': state_code
+    }
+
+
+def validate_chunk(chunk: List[Tuple[int, Dict[str, Any]]],
+                   state_codes: Set[str]):
+    """Split a chunk into valid clients and (line, reason, row) rejects
+
+    Module-level so it can run in a worker process.
+    """
+    valid, rejected = [], []
+    for line_no, row in chunk:
+        try:
+            valid.append(normalize_client(row, state_codes))
+        except ValueError as e:
+            rejected.append((line_no, str(e), row))
+    return valid, rejected
+
+
+def _chunks(rows: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ClientImporter:
+    """Streams a CSV or JSONL file of clients into the database
+
+    The file is read in chunks that are validated in worker processes
+    while earlier chunks are inserted; at most a few chunks are in flight,
+    so memory stays bounded whatever the file size. Each chunk is inserted
+    with one executemany and committed as one transaction together with
+    the import's checkpoint (how many source rows are done), so running
+    the same import again resumes exactly after the last committed chunk.
+    Followers are told about the new clients once, when the import ends.
+    """
+
+    def __init__(self, db_manager, chunk_size: int = 5000,
+                 workers: Optional[int] = None):
+        self.db_manager = db_manager
+        self.chunk_size = chunk_size
+        # 0 validates in-process, which is simpler to debug
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+
+    def run(self, path: str, error_path: Optional[str] = None,
+            source: Optional[str] = None,
+            progress: Optional[Callable[[int, float], None]] = None) -> Dict[str, Any]:
+        """Import a file and return counts and throughput
+
+        Rejected rows go to error_path (default: the source name with
+        .errors.csv) with their line number and reason. The checkpoint is
+        kept under source (default: the file's absolute path). progress
+        is called with the rows processed and the current rows per second.
+        """
+        error_path = error_path or f"{path}.errors.csv"
+        source = source or os.path.abspath(path)
+        state_codes = {s['code'] for s in self.db_manager.get_state_codes()}
+
+        stat = os.stat(path)
+        checkpoint = {'source': source, 'file_size': stat.st_size,
+                      'file_mtime': stat.st_mtime, 'rows_done': 0}
+        done = self._resume_from(self.db_manager.get_import_checkpoint(source),
+                                 checkpoint, path)
+        rows = read_rows(path)
+        for _ in range(done):
+            next(rows, None)
+
+        result = {'imported': 0, 'rejected': 0, 'skipped': done,
+                  'seconds': 0.0, 'rows_per_second': 0.0}
+        started = time.monotonic()
+        processed = 0
+
+        with open(error_path, 'a' if done else 'w', newline='',
+                  encoding='utf-8') as error_file:
+            errors = csv.writer(error_file)
+            if not done:
+                errors.writerow(['line', 'reason', 'row'])
+
+            try:
+                for chunk_len, (valid, rejected) in self._validated(rows, state_codes):
+                    # Rejects are written first: a crash before the commit
+                    # repeats a chunk's reject lines, never loses them
+                    for line_no, reason, row in rejected:
+                        errors.writerow([line_no, reason, json.dumps(row, default=str)])
+                    error_file.flush()
+                    result['rejected'] += len(rejected)
+
+                    checkpoint['rows_done'] = done + chunk_len
+                    result['imported'] += self.db_manager.insert_clients(
+                        valid, checkpoint, record_change=False
+                    )
+                    processed += chunk_len
+                    done += chunk_len
+                    if progress:
+                        elapsed = time.monotonic() - started
+                        progress(processed, processed / elapsed if elapsed else 0.0)
+            except BaseException:
+                # The chunks committed so far stay; let followers see them
+                if result['imported']:
+                    self.db_manager.end_import(source, finished=False)
+                raise
+
+        # Finished: a later run of the same file starts over
+        self.db_manager.end_import(source)
+        result['seconds'] = time.monotonic() - started
+        if result['seconds']:
+            result['rows_per_second'] = processed / result['seconds']
+        logger.info(
+            f"Imported {result['imported']} clients from {path}, "
+            f"rejected {result['rejected']}, "
+            f"{result['rows_per_second']:.0f} rows/s"
+        )
+        return result
+
+    def _validated(self, rows, state_codes):
+        """Yield (source rows, validate_chunk result) in file order"""
+        chunks = _chunks(rows, self.chunk_size)
+        if not self.workers:
+            for chunk in chunks:
+                yield len(chunk), validate_chunk(chunk, state_codes)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = []
+            for chunk in chunks:
+                pending.append((len(chunk), pool.submit(validate_chunk, chunk, state_codes)))
+                # Bound the chunks held in memory
+                if len(pending) > self.workers * 2:
+                    size, future = pending.pop(0)
+                    yield size, future.result()
+            for size, future in pending:
+                yield size, future.result()
+
+    @staticmethod
+    def _resume_from(saved: Optional[Dict[str, Any]],
+                     current: Dict[str, Any], path: str) -> int:
+        """Source rows already imported, 0 unless saved is for this very file"""
+        if saved is None:
+            return 0
+        if (saved['file_size'] != current['file_size']
+                or saved['file_mtime'] != current['file_mtime']):
+            logger.warning(f"Ignoring checkpoint for changed file {path}")
+            return 0
+        return int(saved['rows_done'])
@@ -0,0 +1,356 @@
+"""Command-line tool for batch jobs: reports, export, import and maintenance
+
+Runs without Qt, so nightly jobs start quickly and work on headless
+servers. Modules are imported inside each command, so a command only
+pays for what it uses.
+
+    python crm.py report --start 2024-01-01 --end 2024-01-31
+    python crm.py export report.csv.gz --start 2024-01-01 --end 2024-12-31
+    python crm.py import clients.csv
+    python crm.py assign --start 2024-02-05 --client-type potential
+    python crm.py rollup rebuild
+    python crm.py health
+    python crm.py benchmark --iterations 20
+
+Database settings come from --db-* options or CRM_DB_HOST, CRM_DB_NAME,
+CRM_DB_USER and CRM_DB_PASSWORD.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+
+def _date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _out(line: str = ""):
+    # Flush per line so output streams through pipes
+    print(line, flush=True)
+
+
+def _err(line: str):
+    print(line, file=sys.stderr, flush=True)
+
+
+def connect(options):
+    """Connected DatabaseManager for the command line options"""
+    from database import DatabaseManager
+    db_manager = DatabaseManager(
+        host=options.db_host, database=options.db_name,
+        user=options.db_user, password=options.db_password
+    )
+    if not db_manager.connect():
+        _err("Error: Could not connect to database.")
+        sys.exit(1)
+    return db_manager
+
+
+# Commands
+
+def cmd_report(options):
+    """Summarise contacts per status and method, streaming the rows"""
+    db_manager = connect(options)
+    total = rated = rating_sum = 0
+    by_status, by_method = {}, {}
+    for batch in db_manager.iter_report_contacts(
+            options.start, options.end, options.status, options.employee):
+        for row in batch:
+            _, _, _, _, method, rating, status, _ = row
+            total += 1
+            by_status[status] = by_status.get(status, 0) + 1
+            by_method[method] = by_method.get(method, 0) + 1
+            if rating:
+                rated += 1
+                rating_sum += rating
+
+    _out(f"Contacts {options.start} to {options.end}: {total}")
+    for status, count in sorted(by_status.items()):
+        _out(f"  {status:<12} {count}")
+    for method, count in sorted(by_method.items()):
+        _out(f"  {method:<12} {count}")
+    _out(f"Average rating: {rating_sum / rated:.2f}" if rated
+         else "Average rating: n/a")
+
+
+def cmd_export(options):
+    """Stream a filtered report to CSV, gzipped CSV or XLSX"""
+    from report_export import export_report
+    db_manager = connect(options)
+    started = time.monotonic()
+    written = export_report(
+        db_manager, options.path, options.start, options.end,
+        options.status, options.employee, options.format,
+        progress=lambda rows: _err(f"  {rows} rows") if rows % 50000 == 0 else None
+    )
+    _out(f"Exported {written} rows to {options.path} "
+         f"in {time.monotonic() - started:.1f}s")
+
+
+def cmd_import(options):
+    """Bulk import clients from CSV or JSONL"""
+    from client_import import ClientImporter
+    db_manager = connect(options)
+    importer = ClientImporter(db_manager, chunk_size=options.chunk_size,
+                              workers=options.workers)
+    result = importer.run(
+        options.path, error_path=options.errors,
+        progress=lambda rows, rate: _err(f"  {rows} rows, {rate:.0f} rows/s")
+    )
+    if result['skipped']:
+        _out(f"Resumed after {result['skipped']} rows")
+    _out(f"Imported {result['imported']}, rejected {result['rejected']} "
+         f"in {result['seconds']:.1f}s ({result['rows_per_second']:.0f} rows/s)")
+    return 1 if result['rejected'] else 0
+
+
+def cmd_rollup(options):
+    """Rebuild the per-client contact summary analytics read"""
+    db_manager = connect(options)
+    since = (datetime.combine(options.since, datetime.min.time())
+             if options.since else None)
+    refreshed = db_manager.analytics().rebuild_client_summary(since)
+    if refreshed < 0:
+        _err("Error: rollup rebuild failed")
+        return 1
+    _out(f"Refreshed summary rows: {refreshed}")
+
+
+def cmd_archive(options):
+    """Move old contacts to the archive and prune the change feed"""
+    db_manager = connect(options)
+    before = (datetime.combine(options.before, datetime.min.time())
+              if options.before else None)
+    moved = db_manager.archive_contacts(before)
+    if moved < 0:
+        _err("Error: archiving failed")
+        return 1
+    _out(f"Archived {moved} contacts")
+    pruned = db_manager.prune_changes()
+    if pruned >= 0:
+        _out(f"Pruned {pruned} change feed events")
+
+
+def cmd_assign(options):
+    """Spread follow-ups for clients with nothing scheduled across employees"""
+    from assignment import plan_followups
+    db_manager = connect(options)
+    start = datetime.combine(options.start or date.today() + timedelta(days=1),
+                             datetime.min.time())
+    started = time.perf_counter()
+    contacts, unassigned = plan_followups(
+        db_manager, start, options.client_type, options.state,
+        minutes=options.minutes, contact_method=options.method,
+        use_territories=not options.no_territories
+    )
+    planned = time.perf_counter() - started
+
+    per_employee = {}
+    for contact in contacts:
+        employee_id = contact['employee_id']
+        per_employee[employee_id] = per_employee.get(employee_id, 0) + 1
+    names = {e['id']: e['name'] for e in db_manager.get_employees()}
+    for employee_id, count in sorted(per_employee.items(),
+                                     key=lambda item: names.get(item[0], "")):
+        _out(f"  {names.get(employee_id, employee_id)}: {count}")
+    _out(f"Planned {len(contacts)} contacts in {planned:.2f}s, "
+         f"{len(unassigned)} clients left unassigned")
+    if options.dry_run or not contacts:
+        return 0
+    if db_manager.insert_contacts(contacts) < 0:
+        _err("Error: saving the assignments failed; nothing was saved")
+        return 1
+    _out(f"Saved {len(contacts)} contacts")
+
+
+def cmd_dedup(options):
+    """List likely duplicate clients"""
+    from dedup import find_duplicate_pairs
+    db_manager = connect(options)
+
+    def clients():
+        for batch in db_manager.iter_clients():
+            yield from batch
+
+    pairs = 0
+    for first, second, score in find_duplicate_pairs(clients(), options.threshold):
+        pairs += 1
+        _out(f"{first}\t{second}\t{score:.2f}")
+    _err(f"{pairs} likely duplicate pairs")
+
+
+def cmd_health(options):
+    """Check the database answers, and report its state"""
+    db_manager = connect(options)
+    health = db_manager.health()
+    if not health:
+        _err("Error: health check failed")
+        return 1
+    _out(f"MySQL {health['version']}, round-trip {health['ping_ms']:.1f} ms")
+    for name, value in sorted(health['status'].items()):
+        _out(f"  {name:<18} {value}")
+    for table, rows in health['table_rows'].items():
+        _out(f"  {table:<24} ~{rows} rows")
+
+
+def _timings(label: str, samples):
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1000
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000
+    _out(f"{label:<28} p50 {p50:8.1f} ms   p95 {p95:8.1f} ms")
+
+
+def cmd_benchmark(options):
+    """Time the queries the desktop app runs most
+
+    With --api-url, load-tests a running API service instead, from
+    --concurrency threads.
+    """
+    if options.api_url:
+        return _benchmark_api(options)
+
+    db_manager = connect(options)
+    today = date.today()
+    now = datetime.now()
+    month_ago = today - timedelta(days=30)
+    year_ago = today - timedelta(days=365)
+    queries = [
+        ("clients (all)", lambda: db_manager.get_clients()),
+        ("client search", lambda: db_manager.get_clients("a", limit=20)),
+        ("contacts (hot)", lambda: db_manager.get_employee_contacts(0, True)),
+        ("contacts (week window)", lambda: db_manager.get_employee_contacts(
+            0, True, now - timedelta(days=7), now)),
+        ("report count (month)", lambda: db_manager.count_report_contacts(
+            month_ago, today)),
+        ("report count (year)", lambda: db_manager.count_report_contacts(
+            year_ago, today)),
+        ("trends (year, weekly)", lambda: db_manager.get_contact_trends(
+            year_ago, today, 7)),
+        ("notes search", lambda: db_manager.search_contact_notes("follow*")),
+    ]
+    for label, query in queries:
+        samples = []
+        for _ in range(options.iterations):
+            started = time.perf_counter()
+            query()
+            samples.append(time.perf_counter() - started)
+        _timings(label, samples)
+
+
+def _benchmark_api(options):
+    from concurrent.futures import ThreadPoolExecutor
+    from api_client import HttpDatabaseManager
+
+    client = HttpDatabaseManager(options.api_url)
+    if not client.verify_login(options.login, options.password):
+        _err("Error: API login failed")
+        return 1
+
+    def worker(_):
+        manager = client.clone()
+        samples = []
+        for _ in range(options.iterations):
+            started = time.perf_counter()
+            manager.get_employee_contacts(0, True)
+            samples.append(time.perf_counter() - started)
+        manager.close()
+        return samples
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+        samples = [s for batch in pool.map(worker, range(options.concurrency))
+                   for s in batch]
+    elapsed = time.perf_counter() - started
+    _timings(f"api contacts x{options.concurrency}", samples)
+    _out(f"{len(samples) / elapsed:.0f} requests/s")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="crm", description=__doc__.splitlines()[0])
+    parser.add_argument('--db-host', default=os.environ.get('CRM_DB_HOST', 'localhost'))
+    parser.add_argument('--db-name', default=os.environ.get('CRM_DB_NAME', 'crm_db'))
+    parser.add_argument('--db-user', default=os.environ.get('CRM_DB_USER', 'root'))
+    parser.add_argument('--db-password', default=os.environ.get('CRM_DB_PASSWORD', ''))
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def report_filters(command):
+        command.add_argument('--start', type=_date, required=True,
+                             help="first day, YYYY-MM-DD")
+        command.add_argument('--end', type=_date, required=True,
+                             help="last day (inclusive), YYYY-MM-DD")
+        command.add_argument('--status', choices=['Scheduled', 'Completed', 'Cancelled'])
+        command.add_argument('--employee', type=int, help="employee id")
+
+    command = commands.add_parser('report', help="summarise contacts in a period")
+    report_filters(command)
+    command.set_defaults(handler=cmd_report)
+
+    command = commands.add_parser('export', help="export a report to a file")
+    command.add_argument('path')
+    command.add_argument('--format', choices=['csv', 'csv.gz', 'xlsx'],
+                         help="default: from the file name")
+    report_filters(command)
+    command.set_defaults(handler=cmd_export)
+
+    command = commands.add_parser('import', help="bulk import clients")
+    command.add_argument('path', help="CSV or JSONL file")
+    command.add_argument('--errors', help="rejected rows file")
+    command.add_argument('--chunk-size', type=int, default=5000)
+    command.add_argument('--workers', type=int, default=None,
+                         help="validation processes, 0 for none")
+    command.set_defaults(handler=cmd_import)
+
+    command = commands.add_parser(
+        'assign', help="assign follow-ups to the least loaded employees"
+    )
+    command.add_argument('--start', type=_date,
+                         help="first day to book, YYYY-MM-DD (default tomorrow)")
+    command.add_argument('--client-type', choices=['client', 'potential'])
+    command.add_argument('--state', help="only clients in this state code")
+    command.add_argument('--minutes', type=int, default=30)
+    command.add_argument('--method', default='phone',
+                         choices=['phone', 'email', 'in-person', 'other'])
+    command.add_argument('--no-territories', action='store_true',
+                         help="ignore employee territories")
+    command.add_argument('--dry-run', action='store_true',
+                         help="show the plan without saving it")
+    command.set_defaults(handler=cmd_assign)
+
+    command = commands.add_parser('rollup', help="analytics rollups")
+    command.add_argument('action', choices=['rebuild'])
+    command.add_argument('--since', type=_date,
+                         help="only clients changed since this day")
+    command.set_defaults(handler=cmd_rollup)
+
+    command = commands.add_parser('archive', help="archive old contacts")
+    command.add_argument('--before', type=_date)
+    command.set_defaults(handler=cmd_archive)
+
+    command = commands.add_parser('dedup', help="list likely duplicate clients")
+    command.add_argument('--threshold', type=float, default=0.6)
+    command.set_defaults(handler=cmd_dedup)
+
+    command = commands.add_parser('health', help="check the database")
+    command.set_defaults(handler=cmd_health)
+
+    command = commands.add_parser('benchmark', help="time common queries")
+    command.add_argument('--iterations', type=int, default=10)
+    command.add_argument('--api-url', help="load-test this API service instead")
+    command.add_argument('--concurrency', type=int, default=10)
+    command.add_argument('--login', default='admin')
+    command.add_argument('--password', default='')
+    command.set_defaults(handler=cmd_benchmark)
+    return parser
+
+
+def main(argv=None) -> int:
+    options = build_parser().parse_args(argv)
+    from log_config import configure_logging
+    configure_logging('crm')
+    return options.handler(options) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
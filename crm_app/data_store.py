@@ -0,0 +1,662 @@
+import abc
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional
+
+from PySide6.QtCore import QObject, Qt, Signal, Slot
+from PySide6.QtWidgets import QTableWidgetItem
+from scheduling import DEFAULT_DURATION
+
+
+class _StoreMeta(abc.ABCMeta, type(QObject)):
+    """ABCMeta for QObject subclasses
+
+    Shiboken allocates QObjects itself, skipping the abstract method check
+    of object.__new__, so the check is repeated here.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        if cls.__abstractmethods__:
+            raise TypeError(
+                f"Can't instantiate abstract class {cls.__name__} with "
+                f"abstract methods {', '.join(sorted(cls.__abstractmethods__))}"
+            )
+        return super().__call__(*args, **kwargs)
+
+
+class EntityStore(QObject, abc.ABC, metaclass=_StoreMeta):
+    """Ordered, id-indexed rows of one entity, shared by every view in a session
+
+    The store loads its rows once and afterwards only changes through its
+    own write methods, which emit one signal per affected row so bound
+    tables and combo boxes can patch themselves instead of re-querying.
+    """
+
+    # Emitted after the full row set was (re)loaded
+    rows_reset = Signal()
+    # Emitted with (position, row) once a row is in place
+    row_inserted = Signal(int, object)
+    # Emitted with (position, row) for a row whose position did not change
+    row_updated = Signal(int, object)
+    # Emitted with (position, row_id) once a row is gone
+    row_removed = Signal(int, int)
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self._rows: List[Dict[str, Any]] = []
+        self._keys: List[tuple] = []
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._loaded = False
+
+    # Subclass hooks
+
+    @abc.abstractmethod
+    def sort_key(self, row: Dict[str, Any]):
+        """Return the value rows are ordered by"""
+
+    @abc.abstractmethod
+    def fetch_all(self) -> List[Dict[str, Any]]:
+        """Query every row the store should hold"""
+
+    @abc.abstractmethod
+    def fetch_one(self, row_id: int) -> Optional[Dict[str, Any]]:
+        """Query a single row by id"""
+
+    @abc.abstractmethod
+    def write_create(self, data: Dict[str, Any]) -> Optional[int]:
+        """Insert a row in the database, returning its id"""
+
+    @abc.abstractmethod
+    def write_update(self, data: Dict[str, Any],
+                     previous: Optional[Dict[str, Any]] = None) -> bool:
+        """Update a row in the database; previous is the row before, if known"""
+
+    @abc.abstractmethod
+    def write_delete(self, row_id: int,
+                     previous: Optional[Dict[str, Any]] = None) -> bool:
+        """Delete a row in the database; previous is the row before, if known"""
+
+    def compose_row(self, data: Dict[str, Any],
+                    previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the row a write will produce, without asking the database
+
+        The default merges the written fields over the previous row;
+        subclasses fill in joined display columns.
+        """
+        row = dict(previous) if previous else {}
+        row.update(data)
+        # Only the database knows the new timestamp; a missing version
+        # makes the next refresh reconcile the row with the server copy
+        row['updated_at'] = None
+        return row
+
+    def version(self, row: Dict[str, Any]):
+        """Value that changes whenever a row's displayed content changes
+
+        None means the row has no trustworthy version and must be treated
+        as changed.
+        """
+        return row.get('updated_at')
+
+    def accepts(self, row: Dict[str, Any]) -> bool:
+        """Whether a row fetched by id belongs in this store"""
+        return True
+
+    # Large columns fetch_all() leaves out; full_row() fetches them
+    lazy_columns: tuple = ()
+
+    # Reading
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the rows have been loaded at least once"""
+        return self._loaded
+
+    def ensure_loaded(self):
+        """Load the rows on first use only"""
+        if not self._loaded:
+            self.load()
+
+    def load(self):
+        """(Re)load every row from the database"""
+        self._set_rows(self.fetch_all())
+
+    def refresh(self, fresh: Optional[List[Dict[str, Any]]] = None):
+        """Re-query and apply only what changed since the last load
+
+        Rows are matched by id and compared by version, so an unchanged
+        result set emits nothing and a few changed rows emit a few row
+        signals. When most rows differ, a single reset is cheaper. Rows
+        already fetched, e.g. by a worker thread, can be passed as fresh.
+        """
+        if fresh is None:
+            fresh = self.fetch_all()
+        if not self._loaded:
+            self._set_rows(fresh)
+            return
+
+        fresh_ids = {row['id'] for row in fresh}
+        removed = [row_id for row_id in self._by_id if row_id not in fresh_ids]
+        changed = []
+        for row in fresh:
+            old = self._by_id.get(row['id'])
+            if old is None or self.version(old) is None \
+                    or self.version(old) != self.version(row):
+                changed.append(row)
+
+        if len(removed) + len(changed) > max(len(self._rows), len(fresh)) // 2:
+            self._set_rows(fresh)
+            return
+        for row_id in removed:
+            self.discard(row_id)
+        for row in changed:
+            self.put(row)
+
+    def apply_change(self, row_id: int, deleted: bool = False):
+        """Bring one row up to date after someone else changed it"""
+        if not self._loaded:
+            return
+        row = None if deleted else self.fetch_one(row_id)
+        if row is None or not self.accepts(row):
+            self.discard(row_id)
+            return
+        old = self._by_id.get(row_id)
+        if old is None or self.version(old) is None \
+                or self.version(old) != self.version(row):
+            self.put(row)
+
+    def _set_rows(self, rows: List[Dict[str, Any]]):
+        rows.sort(key=self._key)
+        self._rows = rows
+        self._keys = [self._key(row) for row in rows]
+        self._by_id = {row['id']: row for row in rows}
+        self._loaded = True
+        self.rows_reset.emit()
+
+    def full_row(self, row_id) -> Optional[Dict[str, Any]]:
+        """A row with its lazy columns, fetched once and then kept"""
+        row = self._by_id.get(row_id)
+        if row is None or all(name in row for name in self.lazy_columns):
+            return row
+        full = self.fetch_one(row_id)
+        if full is not None:
+            # Display columns are unchanged, so no signal is needed
+            row.update({name: full.get(name) for name in self.lazy_columns})
+        return row
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Rows in display order; callers must not mutate the list"""
+        return self._rows
+
+    def get(self, row_id) -> Optional[Dict[str, Any]]:
+        """Row with the given id, if loaded"""
+        return self._by_id.get(row_id)
+
+    def position(self, row_id) -> int:
+        """Display position of a row, or -1 when it is not in the store"""
+        row = self._by_id.get(row_id)
+        if row is None:
+            return -1
+        return bisect_left(self._keys, self._key(row))
+
+    def __len__(self):
+        return len(self._rows)
+
+    # Writing
+
+    # Writes cost a single round-trip: the store composes the resulting
+    # row itself rather than re-reading it, applies updates and deletes
+    # before the write and rolls them back if the write fails.
+
+    def create(self, data: Dict[str, Any]) -> Optional[int]:
+        """Create a row in the database and add it to the store"""
+        row_id = self.write_create(data)
+        if row_id:
+            row = self.compose_row(data, None)
+            row['id'] = row_id
+            self.put(row)
+        return row_id
+
+    def update(self, data: Dict[str, Any]) -> bool:
+        """Patch a row in the store, then update it in the database"""
+        previous = self._by_id.get(data['id'])
+        if previous is None:
+            return self.write_update(data)
+
+        self.put(self.compose_row(data, previous))
+        if not self.write_update(data, previous):
+            # Nothing was updated, maybe because someone else deleted or
+            # changed the row; show what the database has instead
+            self.put(previous)
+            self.apply_change(data['id'])
+            return False
+        return True
+
+    def delete(self, row_id: int) -> bool:
+        """Drop a row from the store, then delete it in the database"""
+        previous = self._by_id.get(row_id)
+        self.discard(row_id)
+        if not self.write_delete(row_id, previous):
+            if previous is not None:
+                self.put(previous)
+            return False
+        return True
+
+    def put(self, row: Dict[str, Any]):
+        """Insert or replace a row, emitting the matching signals"""
+        key = self._key(row)
+        old = self._by_id.get(row['id'])
+        self._by_id[row['id']] = row
+        if old is not None:
+            old_position = bisect_left(self._keys, self._key(old))
+            self._rows.pop(old_position)
+            self._keys.pop(old_position)
+            position = bisect_left(self._keys, key)
+            self._rows.insert(position, row)
+            self._keys.insert(position, key)
+            if position == old_position:
+                self.row_updated.emit(position, row)
+                return
+            # The row moved; it stays known by id while it is in flight so
+            # listeners can tell a move from a delete
+            self.row_removed.emit(old_position, row['id'])
+            self.row_inserted.emit(position, row)
+            return
+
+        position = bisect_left(self._keys, key)
+        self._rows.insert(position, row)
+        self._keys.insert(position, key)
+        self.row_inserted.emit(position, row)
+
+    def discard(self, row_id: int):
+        """Drop a row from the store without touching the database"""
+        row = self._by_id.get(row_id)
+        if row is None:
+            return
+        position = bisect_left(self._keys, self._key(row))
+        self._remove_at(position)
+        self.row_removed.emit(position, row_id)
+
+    def _remove_at(self, position: int):
+        row = self._rows.pop(position)
+        self._keys.pop(position)
+        del self._by_id[row['id']]
+
+    def _key(self, row: Dict[str, Any]) -> tuple:
+        return (self.sort_key(row), row['id'])
+
+
+class ClientStore(EntityStore):
+    """All clients, ordered by name"""
+
+    # Everything but the address, which only the edit form shows
+    COLUMNS = ['name', 'email', 'phone', 'state_code', 'state_name',
+               'client_type', 'converted_at', 'updated_at']
+    lazy_columns = ('address',)
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(db_manager, parent)
+        self._state_names = None
+
+    def compose_row(self, data, previous):
+        row = super().compose_row(data, previous)
+        if self._state_names is None:
+            self._state_names = {
+                state['code']: state['description']
+                for state in self.db_manager.get_state_codes()
+            }
+        row['state_name'] = self._state_names.get(row.get('state_code'))
+        return row
+
+    def version(self, row):
+        if row.get('updated_at') is None:
+            return None
+        return (row['updated_at'], row.get('state_name'))
+
+    def sort_key(self, row):
+        return (row['name'] or "").lower()
+
+    def fetch_all(self):
+        return self.db_manager.get_clients(columns=self.COLUMNS)
+
+    def fetch_one(self, row_id):
+        return self.db_manager.get_client(row_id)
+
+    def write_create(self, data):
+        return self.db_manager.create_client(data)
+
+    def write_update(self, data, previous=None):
+        return self.db_manager.update_client(data, previous)
+
+    def write_delete(self, row_id, previous=None):
+        return self.db_manager.delete_client(row_id, previous)
+
+
+class EmployeeStore(EntityStore):
+    """All employees, ordered by name"""
+
+    def compose_row(self, data, previous):
+        row = super().compose_row(data, previous)
+        # Never keep the plain-text password around
+        row.pop('password', None)
+        return row
+
+    def sort_key(self, row):
+        return (row['name'] or "").lower()
+
+    def fetch_all(self):
+        return self.db_manager.get_employees()
+
+    def fetch_one(self, row_id):
+        return self.db_manager.get_employee(row_id)
+
+    def write_create(self, data):
+        return self.db_manager.create_employee(data)
+
+    def write_update(self, data, previous=None):
+        return self.db_manager.update_employee(data, previous)
+
+    def write_delete(self, row_id, previous=None):
+        return self.db_manager.delete_employee(row_id, previous)
+
+
+class ContactStore(EntityStore):
+    """Contacts visible to the logged-in user, ordered by date/time
+
+    Recurring series are not rows of the store: their occurrences are
+    expanded per window by the views that show a time range.
+    """
+
+    # Emitted after a recurring series was created or ended
+    series_changed = Signal()
+
+    # Lists show a notes preview; the full notes load with the edit form
+    COLUMNS = ['client_id', 'employee_id', 'contact_datetime', 'duration_minutes',
+               'contact_method', 'conversion_rating', 'notes_preview', 'status',
+               'series_id', 'occurrence_at', 'updated_at', 'client_name',
+               'client_type', 'employee_name']
+    lazy_columns = ('notes',)
+
+    def __init__(self, db_manager, user_data, parent=None):
+        super().__init__(db_manager, parent)
+        self.user_data = user_data
+        self.client_store = None
+        self.employee_store = None
+
+    def compose_row(self, data, previous):
+        row = super().compose_row(data, previous)
+        row.setdefault('conversion_rating', None)
+        row.setdefault('status', 'Scheduled')
+        row.setdefault('duration_minutes', DEFAULT_DURATION)
+        row.setdefault('series_id', None)
+        row.setdefault('occurrence_at', None)
+        if 'notes' in data:
+            row['notes_preview'] = (data['notes'] or "")[:100] or None
+
+        client = self.client_store.get(row['client_id']) if self.client_store else None
+        if client is None and (previous is None
+                               or previous['client_id'] != row['client_id']):
+            client = self.db_manager.get_client(row['client_id'])
+        if client is not None:
+            row['client_name'] = client['name']
+            row['client_type'] = client['client_type']
+
+        if row['employee_id'] == self.user_data['id']:
+            row['employee_name'] = self.user_data['name']
+        elif self.employee_store and self.employee_store.get(row['employee_id']):
+            row['employee_name'] = self.employee_store.get(row['employee_id'])['name']
+        return row
+
+    def version(self, row):
+        # Joined columns change without touching the contact's timestamp
+        if row.get('updated_at') is None:
+            return None
+        return (row['updated_at'], row.get('client_name'),
+                row.get('client_type'), row.get('employee_name'))
+
+    def accepts(self, row):
+        return (self.user_data['role'] == 'manager'
+                or row['employee_id'] == self.user_data['id'])
+
+    def sort_key(self, row):
+        return row['contact_datetime']
+
+    def fetch_all(self):
+        return self.db_manager.get_employee_contacts(
+            self.user_data['id'],
+            self.user_data['role'] == 'manager',
+            columns=self.COLUMNS
+        )
+
+    def fetch_one(self, row_id):
+        row = self.db_manager.get_contact(row_id)
+        if row is not None:
+            row['notes_preview'] = (row['notes'] or "")[:100] or None
+        return row
+
+    def write_create(self, data):
+        return self.db_manager.create_contact(data)
+
+    def write_update(self, data, previous=None):
+        return self.db_manager.update_contact(data, previous)
+
+    def write_delete(self, row_id, previous=None):
+        return self.db_manager.delete_contact(row_id, previous)
+
+    def create_series(self, data: Dict[str, Any]) -> Optional[int]:
+        """Create a recurring series, for the windowed views to expand"""
+        series_id = self.db_manager.create_series(data)
+        if series_id:
+            self.series_changed.emit()
+        return series_id
+
+    def end_series(self, series_id: int, ends_on) -> bool:
+        """Make ends_on the last day of a series"""
+        if not self.db_manager.end_series(series_id, ends_on):
+            return False
+        self.series_changed.emit()
+        return True
+
+    def follow(self, client_store: ClientStore, employee_store: EmployeeStore):
+        """Keep the joined client and employee columns in step with their stores"""
+        self.client_store = client_store
+        self.employee_store = employee_store
+        client_store.row_updated.connect(self._client_changed)
+        client_store.row_inserted.connect(self._client_changed)
+        client_store.row_removed.connect(self._client_removed)
+        employee_store.row_updated.connect(self._employee_changed)
+        employee_store.row_inserted.connect(self._employee_changed)
+
+    @Slot(int, object)
+    def _client_changed(self, position, client):
+        self._patch_joined('client_id', client['id'], {
+            'client_name': client['name'],
+            'client_type': client['client_type']
+        })
+
+    @Slot(int, int)
+    def _client_removed(self, position, client_id):
+        # A client that only moved position is still known by id
+        if self.sender().get(client_id) is not None:
+            return
+        for row in [r for r in self._rows if r['client_id'] == client_id]:
+            self.discard(row['id'])
+
+    @Slot(int, object)
+    def _employee_changed(self, position, employee):
+        self._patch_joined('employee_id', employee['id'], {
+            'employee_name': employee['name']
+        })
+
+    def _patch_joined(self, field, value, columns):
+        for position, row in enumerate(self._rows):
+            if row[field] != value:
+                continue
+            if all(row.get(name) == new for name, new in columns.items()):
+                continue
+            row.update(columns)
+            self.row_updated.emit(position, row)
+
+
+class ReportStore(ContactStore):
+    """Read-only contact rows matching the report filters
+
+    Rows come from a ReportCache, so switching back and forth between
+    filter sets is answered from memory.
+    """
+
+    def __init__(self, db_manager, user_data, report_cache, parent=None):
+        super().__init__(db_manager, user_data, parent)
+        self.report_cache = report_cache
+        self.filters = {}
+
+    def set_filters(self, start_date, end_date, status: Optional[str],
+                    employee_id: Optional[int]):
+        """Filters used by the next refresh; None means all"""
+        self.filters = {
+            'start_date': start_date,
+            'end_date': end_date,
+            'status': status,
+            'employee_id': employee_id
+        }
+
+    def cache_query(self) -> tuple:
+        """Arguments of the report_cache.get() call for the filters"""
+        employee_id = self.filters['employee_id']
+        return (
+            self.filters['start_date'],
+            self.filters['end_date'],
+            self.filters['status'],
+            employee_id or self.user_data['id'],
+            self.user_data['role'] == 'manager' and employee_id is None
+        )
+
+    def fetch_all(self):
+        return list(self.report_cache.get(*self.cache_query()))
+
+
+class TableBinding(QObject):
+    """Mirror a store into a QTableWidget, one table row per store row
+
+    Each column is a callable that formats a row dict into cell text. The
+    row id is kept under Qt.UserRole on the first cell, as the editors
+    already expect. Formatted cells are cached per row version and
+    existing items are re-used, so redrawing an unchanged row allocates
+    nothing and formats nothing.
+    """
+
+    def __init__(self, store: EntityStore, table,
+                 columns: List[Callable[[Dict[str, Any]], str]], parent=None):
+        super().__init__(parent or table)
+        self.store = store
+        self.table = table
+        self.columns = columns
+        self._filter = None
+        self._cells: Dict[int, tuple] = {}  # row id -> (version, cell texts)
+        store.rows_reset.connect(self._reset)
+        store.row_inserted.connect(self._insert)
+        store.row_updated.connect(self._update)
+        store.row_removed.connect(self._remove)
+        if store.loaded:
+            self._reset()
+
+    def set_filter(self, predicate: Optional[Callable[[Dict[str, Any]], bool]]):
+        """Hide rows the predicate rejects; None shows every row"""
+        self._filter = predicate
+        for position, row in enumerate(self.store.rows()):
+            self.table.setRowHidden(position, not self._accepts(row))
+
+    def _accepts(self, row):
+        return self._filter is None or self._filter(row)
+
+    def _format(self, row):
+        version = self.store.version(row)
+        cached = self._cells.get(row['id'])
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1]
+        texts = tuple(formatter(row) for formatter in self.columns)
+        if version is not None:
+            self._cells[row['id']] = (version, texts)
+        else:
+            self._cells.pop(row['id'], None)
+        return texts
+
+    def _fill(self, position, row):
+        for column, text in enumerate(self._format(row)):
+            item = self.table.item(position, column)
+            if item is None:
+                self.table.setItem(position, column, QTableWidgetItem(text))
+            elif item.text() != text:
+                item.setText(text)
+        self.table.item(position, 0).setData(Qt.UserRole, row['id'])
+        self.table.setRowHidden(position, not self._accepts(row))
+
+    @Slot()
+    def _reset(self):
+        rows = self.store.rows()
+        live_ids = {row['id'] for row in rows}
+        for row_id in [i for i in self._cells if i not in live_ids]:
+            del self._cells[row_id]
+
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(rows))
+        for position, row in enumerate(rows):
+            self._fill(position, row)
+        self.table.setUpdatesEnabled(True)
+
+    @Slot(int, object)
+    def _insert(self, position, row):
+        self.table.insertRow(position)
+        self._fill(position, row)
+
+    @Slot(int, object)
+    def _update(self, position, row):
+        self._fill(position, row)
+
+    @Slot(int, int)
+    def _remove(self, position, row_id):
+        self.table.removeRow(position)
+        if self.store.get(row_id) is None:
+            self._cells.pop(row_id, None)
+
+
+class ComboBinding(QObject):
+    """Mirror a store into a QComboBox, keeping any fixed leading items"""
+
+    def __init__(self, store: EntityStore, combo,
+                 label: Callable[[Dict[str, Any]], str], leading: int = 0,
+                 parent=None):
+        super().__init__(parent or combo)
+        self.store = store
+        self.combo = combo
+        self.label = label
+        self.leading = leading
+        store.rows_reset.connect(self._reset)
+        store.row_inserted.connect(self._insert)
+        store.row_updated.connect(self._update)
+        store.row_removed.connect(self._remove)
+        if store.loaded:
+            self._reset()
+
+    @Slot()
+    def _reset(self):
+        current = self.combo.currentData()
+        while self.combo.count() > self.leading:
+            self.combo.removeItem(self.combo.count() - 1)
+        for row in self.store.rows():
+            self.combo.addItem(self.label(row), row['id'])
+        index = self.combo.findData(current)
+        if index >= 0:
+            self.combo.setCurrentIndex(index)
+
+    @Slot(int, object)
+    def _insert(self, position, row):
+        self.combo.insertItem(self.leading + position, self.label(row), row['id'])
+
+    @Slot(int, object)
+    def _update(self, position, row):
+        self.combo.setItemText(self.leading + position, self.label(row))
+
+    @Slot(int, int)
+    def _remove(self, position, row_id):
+        self.combo.removeItem(self.leading + position)
@@ -1,25 +1,115 @@
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import ClientFlag, Error
 import bcrypt
+import heapq
 import logging
-from datetime import datetime
-from typing import Optional, List, Dict, Any
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from scheduling import (DEFAULT_DURATION, MAX_DURATION, contact_interval,
+                        expand_series)
+
 logger = logging.getLogger(__name__)
 
+
+class CancelToken:
+    """Lets the UI stop a running query, or stops it at a deadline
+
+    A backend attaches the token while a call runs on it (see
+    DatabaseManager.running()); cancel() then interrupts that call from
+    any thread. The interrupted call fails as usual, returning its
+    failure value, and the caller checks `interrupted` to tell a
+    cancelled or timed out call from an empty result.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.cancelled = False
+        self.timed_out = False
+        self._lock = threading.Lock()
+        self._interrupt = None
+        self._timer = None
+        if timeout is not None:
+            self._timer = threading.Timer(timeout, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def interrupted(self) -> bool:
+        return self.cancelled or self.timed_out
+
+    def cancel(self):
+        """Stop the running call, if any, and any later one
+
+        Returns at once; the interrupt, which may have to open a
+        connection, runs on a thread of its own.
+        """
+        with self._lock:
+            if self.interrupted:
+                return
+            self.cancelled = True
+            interrupt = self._interrupt
+        if self._timer is not None:
+            self._timer.cancel()
+        if interrupt is not None:
+            threading.Thread(target=interrupt, name="cancel-query",
+                             daemon=True).start()
+
+    def _expire(self):
+        with self._lock:
+            if self.interrupted:
+                return
+            self.timed_out = True
+            interrupt = self._interrupt
+        if interrupt is not None:
+            interrupt()
+
+    def attach(self, interrupt) -> bool:
+        """Register how to interrupt the call about to run
+
+        Returns False, and registers nothing, if the token has already
+        fired.
+        """
+        with self._lock:
+            if self.interrupted:
+                return False
+            self._interrupt = interrupt
+            return True
+
+    def detach(self):
+        with self._lock:
+            self._interrupt = None
+
+    def finish(self):
+        """Stop the deadline timer once the work is done"""
+        if self._timer is not None:
+            self._timer.cancel()
+
+
 class DatabaseManager:
+    # Default ceiling on any SELECT and on metadata lock waits, so a
+    # runaway query or a locked table cannot hang the app indefinitely
+    QUERY_TIMEOUT = 60.0
+
     def __init__(self, host: str = 'localhost', database: str = 'crm_db',
-                 user: str = 'root', password: str = ''):
+                 user: str = 'root', password: str = '',
+                 query_timeout: Optional[float] = QUERY_TIMEOUT):
         self.host = host
         self.database = database
         self.user = user
         self.password = password
+        self.query_timeout = query_timeout
         self.connection = None
+        # Set after login to record changes (see audit.AuditLog)
+        self.audit_log = None
+        self.audit_user_id = None
+        # Tags this manager's change feed events so it can skip its own
+        self.origin = uuid.uuid4().hex[:16]
 
     def connect(self) -> bool:
         """Establish database connection"""
@@ -28,8 +118,20 @@ class DatabaseManager:
                 host=self.host,
                 database=self.database,
                 user=self.user,
-                password=self.password
+                password=self.password,
+                # rowcount counts the rows an UPDATE matched, not only
+                # those it changed, so saving an unchanged row succeeds
+                client_flags=[ClientFlag.FOUND_ROWS]
             )
+            if self.query_timeout:
+                # max_execution_time covers SELECTs, lock_wait_timeout
+                # waits on tables another session has locked
+                cursor = self.connection.cursor()
+                cursor.execute(
+                    "SET SESSION max_execution_time = %s, lock_wait_timeout = %s",
+                    (int(self.query_timeout * 1000), max(1, int(self.query_timeout)))
+                )
+                cursor.close()
             return True
         except Error as e:
             logger.error(f"Error connecting to MySQL: {e}")
@@ -40,6 +142,191 @@ class DatabaseManager:
         if self.connection and self.connection.is_connected():
             self.connection.close()
 
+    def ensure_connected(self) -> bool:
+        """Reconnect if the connection dropped, e.g. after wait_timeout
+
+        Costs a ping, so long-lived managers call it before each use
+        rather than before each query. Returns whether we are connected.
+        """
+        if self.connection is not None and self.connection.is_connected():
+            return True
+        logger.warning("Database connection lost; reconnecting")
+        return self.connect()
+
+    def clone(self) -> 'DatabaseManager':
+        """Return an unconnected manager with the same settings
+
+        Connections must not be shared between threads, so background
+        workers connect through a clone of their own.
+        """
+        return DatabaseManager(
+            host=self.host,
+            database=self.database,
+            user=self.user,
+            password=self.password,
+            query_timeout=self.query_timeout
+        )
+
+    @contextmanager
+    def running(self, token: Optional[CancelToken]):
+        """Let a token interrupt the calls made inside the block
+
+        Cancelling kills the statement on the server (KILL QUERY over a
+        side connection), so abandoned work stops using database CPU; the
+        connection itself stays usable. Yields False, and the block should
+        not query, when the token has already fired.
+        """
+        if token is None:
+            yield True
+            return
+        connection_id = self.connection.connection_id
+        if not token.attach(lambda: self.kill_query(connection_id)):
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            token.detach()
+
+    def kill_query(self, connection_id: int):
+        """Stop the statement running on another connection"""
+        side = self.clone()
+        if not side.connect():
+            return
+        try:
+            cursor = side.connection.cursor()
+            cursor.execute("KILL QUERY %s", (connection_id,))
+            cursor.close()
+        except Error as e:
+            logger.error(f"Error killing query on connection {connection_id}: {e}")
+        finally:
+            side.close()
+
+    def health(self) -> Dict[str, Any]:
+        """Round-trip time, server state and estimated table sizes
+
+        Row counts come from information_schema estimates so the check
+        stays instant on large tables. Returns {} on error.
+        """
+        try:
+            cursor = self.connection.cursor()
+            started = time.perf_counter()
+            cursor.execute("SELECT VERSION()")
+            (version,) = cursor.fetchone()
+            ping_ms = (time.perf_counter() - started) * 1000
+            cursor.execute("SHOW GLOBAL STATUS WHERE Variable_name IN "
+                           "('Threads_connected', 'Uptime', 'Slow_queries')")
+            status = {name: int(value) for name, value in cursor.fetchall()}
+            cursor.execute("""
+                SELECT table_name, table_rows
+                FROM information_schema.tables
+                WHERE table_schema = DATABASE()
+                ORDER BY table_name
+            """)
+            tables = {name: rows or 0 for name, rows in cursor.fetchall()}
+            cursor.close()
+            return {'version': version, 'ping_ms': ping_ms,
+                    'status': status, 'table_rows': tables}
+        except Error as e:
+            logger.error(f"Error checking database health: {e}")
+            return {}
+
+    def analytics(self):
+        """Analytics engine working on this manager's connection"""
+        from analytics import AnalyticsEngine
+        return AnalyticsEngine(self)
+
+    def _audit(self, table: str, action: str, row_id: Optional[int],
+               before: Optional[Dict[str, Any]] = None,
+               after: Optional[Dict[str, Any]] = None):
+        """Queue a change event if auditing is on; never blocks on the database"""
+        if self.audit_log is not None:
+            self.audit_log.record(
+                table, action, row_id, before, after, self.audit_user_id
+            )
+
+    def _record_change(self, cursor, table: str, row_id: Optional[int],
+                       action: str):
+        """Append to the change feed inside the caller's transaction"""
+        cursor.execute(
+            "INSERT INTO change_feed (table_name, row_id, action, origin) "
+            "VALUES (%s, %s, %s, %s)",
+            (table, row_id, action, self.origin)
+        )
+
+    def _rollback(self):
+        """Undo a failed write so nothing half-done is committed later"""
+        try:
+            self.connection.rollback()
+        except Error:
+            pass
+
+    def latest_change(self) -> int:
+        """Sequence number of the newest change feed event, 0 if none"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM change_feed")
+            (seq,) = cursor.fetchone()
+            cursor.close()
+            return seq
+        except Error as e:
+            logger.error(f"Error reading change feed: {e}")
+            return 0
+
+    def get_changes(self, after_seq: int, limit: int = 500) -> List[Dict[str, Any]]:
+        """Change feed events after a sequence number, oldest first"""
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT seq, table_name, row_id, action, origin
+                FROM change_feed
+                WHERE seq > %s
+                ORDER BY seq
+                LIMIT %s
+            """, (after_seq, limit))
+            changes = cursor.fetchall()
+            cursor.close()
+            return changes
+        except Error as e:
+            logger.error(f"Error reading change feed: {e}")
+            return []
+
+    def get_changes_by_seq(self, seqs: List[int]) -> List[Dict[str, Any]]:
+        """Change feed events with the given sequence numbers, oldest first"""
+        if not seqs:
+            return []
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            placeholders = ', '.join(['%s'] * len(seqs))
+            cursor.execute(f"""
+                SELECT seq, table_name, row_id, action, origin
+                FROM change_feed
+                WHERE seq IN ({placeholders})
+                ORDER BY seq
+            """, tuple(seqs))
+            changes = cursor.fetchall()
+            cursor.close()
+            return changes
+        except Error as e:
+            logger.error(f"Error reading change feed: {e}")
+            return []
+
+    def prune_changes(self, days: int = 7) -> int:
+        """Drop change feed events older than days; returns the count, -1 on error"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "DELETE FROM change_feed WHERE changed_at < %s",
+                (datetime.now() - timedelta(days=days),)
+            )
+            pruned = cursor.rowcount
+            self.connection.commit()
+            cursor.close()
+            return pruned
+        except Error as e:
+            logger.error(f"Error pruning change feed: {e}")
+            return -1
+
     def verify_login(self, login_id: str, password: str) -> Optional[dict]:
         """Verify user login credentials"""
         try:
@@ -95,37 +382,177 @@ class DatabaseManager:
                 client_data['client_type']
             )
             cursor.execute(query, values)
-            self.connection.commit()
             client_id = cursor.lastrowid
+            self._record_change(cursor, 'clients', client_id, 'create')
+            self.connection.commit()
             cursor.close()
+            self._audit('clients', 'create', client_id, None, client_data)
             return client_id
         except Error as e:
             logger.error(f"Error creating client: {e}")
+            self._rollback()
             return None
 
-    def get_clients(self, search_term: str = "") -> List[Dict[str, Any]]:
-        """Get all clients, optionally filtered by search term"""
+    def insert_clients(self, clients: List[Dict[str, Any]],
+                       checkpoint: Optional[Dict[str, Any]] = None,
+                       record_change: bool = True) -> int:
+        """Insert many clients in one transaction
+
+        Used by bulk imports: the batch is sent as a single multi-row
+        insert and committed once. With checkpoint (an import_checkpoints
+        row), the import's progress is saved in the same transaction, so
+        a chunk never lands without it. An import passes record_change
+        False and announces its rows once with end_import(). On error the
+        batch is rolled back and the error is logged and re-raised so the
+        import can stop at a known checkpoint.
+        """
+        cursor = self.connection.cursor()
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            if search_term:
+            if clients:
                 query = """
-                    SELECT c.*, s.description as state_name 
-                    FROM clients c
-                    LEFT JOIN state_codes s ON c.state_code = s.code
-                    WHERE c.name LIKE %s OR c.email LIKE %s
-                    ORDER BY c.name
+                    INSERT INTO clients (name, email, phone, address, state_code, client_type)
+                    VALUES (%s, %s, %s, %s, %s, %s)
                 """
+                cursor.executemany(query, [
+                    (
+                        client['name'],
+                        client.get('email'),
+                        client.get('phone'),
+                        client.get('address'),
+                        client.get('state_code'),
+                        client['client_type']
+                    )
+                    for client in clients
+                ])
+            if checkpoint is not None:
+                cursor.execute("""
+                    INSERT INTO import_checkpoints
+                        (source, file_size, file_mtime, rows_done)
+                    VALUES (%(source)s, %(file_size)s, %(file_mtime)s, %(rows_done)s)
+                    ON DUPLICATE KEY UPDATE
+                        file_size = VALUES(file_size),
+                        file_mtime = VALUES(file_mtime),
+                        rows_done = VALUES(rows_done)
+                """, checkpoint)
+            if clients and record_change:
+                # Ids of a bulk insert are not reported one by one;
+                # followers reload instead
+                self._record_change(cursor, 'clients', None, 'reset')
+            self.connection.commit()
+            if clients:
+                self._audit('clients', 'import', None, None, {'rows': len(clients)})
+            return len(clients)
+        except Error as e:
+            logger.error(f"Error inserting clients: {e}")
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def get_import_checkpoint(self, source: str) -> Optional[Dict[str, Any]]:
+        """The saved progress of an import, None if it has none
+
+        Errors are logged and re-raised: starting over would import the
+        committed rows twice.
+        """
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            cursor.execute(
+                "SELECT source, file_size, file_mtime, rows_done "
+                "FROM import_checkpoints WHERE source = %s",
+                (source,)
+            )
+            checkpoint = cursor.fetchone()
+            cursor.close()
+            return checkpoint
+        except Error as e:
+            logger.error(f"Error reading import checkpoint: {e}")
+            raise
+
+    def end_import(self, source: str, finished: bool = True) -> bool:
+        """Announce an import's clients to followers with one reset event
+
+        A finished import also drops its checkpoint, so importing the
+        same file again starts over; an interrupted one keeps it.
+        """
+        try:
+            cursor = self.connection.cursor()
+            if finished:
+                cursor.execute(
+                    "DELETE FROM import_checkpoints WHERE source = %s", (source,)
+                )
+            self._record_change(cursor, 'clients', None, 'reset')
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            logger.error(f"Error ending import: {e}")
+            self._rollback()
+            return False
+
+    # Columns a caller may ask get_clients() for, and their SQL
+    CLIENT_FIELDS = {
+        'id': "c.id", 'name': "c.name", 'email': "c.email", 'phone': "c.phone",
+        'address': "c.address", 'state_code': "c.state_code",
+        'client_type': "c.client_type", 'converted_at': "c.converted_at",
+        'created_at': "c.created_at", 'updated_at': "c.updated_at",
+        'state_name': "s.description",
+    }
+
+    @staticmethod
+    def _projection(fields: Dict[str, str],
+                    columns: Optional[List[str]]) -> Tuple[str, set]:
+        """SELECT list for the requested columns, and the aliases it reads
+
+        None selects every column. Names are checked against the field
+        catalog, so a column list can come from an API call.
+        """
+        names = list(fields) if columns is None else list(columns)
+        unknown = [name for name in names if name not in fields]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        if 'id' not in names:
+            names.insert(0, 'id')
+        select = ", ".join(f"{fields[name]} AS {name}" for name in names)
+        aliases = {alias for name in names
+                   for alias in re.findall(r"(\w+)\.", fields[name])}
+        return select, aliases
+
+    def get_clients(self, search_term: str = "",
+                    limit: Optional[int] = None,
+                    columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get all clients, optionally filtered by search term
+
+        With a limit, matches are ranked so names starting with the search
+        term come first, which is what type-ahead pickers want. columns
+        (names from CLIENT_FIELDS) limits what is fetched; list views
+        leave out the address and skip the state join.
+        """
+        try:
+            select, aliases = self._projection(self.CLIENT_FIELDS, columns)
+            cursor = self.connection.cursor(dictionary=True)
+            query = f"SELECT {select} FROM clients c"
+            if 's' in aliases:
+                query += " LEFT JOIN state_codes s ON c.state_code = s.code"
+            params = []
+            if search_term:
+                query += " WHERE c.name LIKE %s OR c.email LIKE %s"
                 search_pattern = f"%{search_term}%"
-                cursor.execute(query, (search_pattern, search_pattern))
+                params = [search_pattern, search_pattern]
+                if limit:
+                    query += """
+                    ORDER BY CASE WHEN c.name LIKE %s THEN 0 ELSE 1 END, c.name
+                    """
+                    params.append(f"{search_term}%")
+                else:
+                    query += " ORDER BY c.name"
             else:
-                query = """
-                    SELECT c.*, s.description as state_name 
-                    FROM clients c
-                    LEFT JOIN state_codes s ON c.state_code = s.code
-                    ORDER BY c.name
-                """
-                cursor.execute(query)
-            
+                query += " ORDER BY c.name"
+            if limit:
+                query += " LIMIT %s"
+                params.append(limit)
+            cursor.execute(query, params)
+
             clients = cursor.fetchall()
             cursor.close()
             return clients
@@ -133,65 +560,936 @@ class DatabaseManager:
             logger.error(f"Error fetching clients: {e}")
             return []
 
+    def iter_clients(self, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """Stream the id, name, email and phone of every client in batches
+
+        Like iter_report_contacts, errors are logged and re-raised so a
+        batch job never mistakes a broken stream for the whole table.
+        """
+        cursor = self.connection.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(
+                "SELECT id, name, email, phone FROM clients ORDER BY id"
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        except Error as e:
+            logger.error(f"Error streaming clients: {e}")
+            raise
+        finally:
+            try:
+                cursor.close()
+            except Error:
+                pass
+
+    def get_client(self, client_id: int) -> Optional[Dict[str, Any]]:
+        """Get a single client by id"""
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            query = """
+                SELECT c.*, s.description as state_name 
+                FROM clients c
+                LEFT JOIN state_codes s ON c.state_code = s.code
+                WHERE c.id = %s
+            """
+            cursor.execute(query, (client_id,))
+            client = cursor.fetchone()
+            cursor.close()
+            return client
+        except Error as e:
+            logger.error(f"Error fetching client: {e}")
+            return None
+
+    def update_client(self, client_data: Dict[str, Any],
+                      previous: Optional[Dict[str, Any]] = None) -> bool:
+        """Update an existing client
+
+        previous, the row as it was before, is only used for the audit diff.
+        """
+        try:
+            cursor = self.connection.cursor()
+            # converted_at is assigned before client_type so it still sees
+            # the old type; MySQL applies SET assignments left to right
+            query = """
+                UPDATE clients
+                SET converted_at = CASE
+                        WHEN client_type = 'potential' AND %s = 'client'
+                        THEN NOW() ELSE converted_at END,
+                    name = %s, email = %s, phone = %s, address = %s,
+                    state_code = %s, client_type = %s
+                WHERE id = %s
+            """
+            values = (
+                client_data['client_type'],
+                client_data['name'],
+                client_data.get('email'),
+                client_data.get('phone'),
+                client_data.get('address'),
+                client_data.get('state_code'),
+                client_data['client_type'],
+                client_data['id']
+            )
+            cursor.execute(query, values)
+            # No row means it was deleted meanwhile
+            updated = cursor.rowcount > 0
+            if updated:
+                self._record_change(cursor, 'clients', client_data['id'], 'update')
+            self.connection.commit()
+            cursor.close()
+            if updated:
+                self._audit('clients', 'update', client_data['id'],
+                            previous, client_data)
+            return updated
+        except Error as e:
+            logger.error(f"Error updating client: {e}")
+            self._rollback()
+            return False
+
+    def delete_client(self, client_id: int,
+                      previous: Optional[Dict[str, Any]] = None) -> bool:
+        """Delete a client and its contacts, archived ones included"""
+        try:
+            cursor = self.connection.cursor()
+            # The archive has no foreign keys, so nothing cascades there
+            cursor.execute(
+                "DELETE FROM contacts_archive WHERE client_id = %s", (client_id,)
+            )
+            cursor.execute("DELETE FROM clients WHERE id = %s", (client_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                self._record_change(cursor, 'clients', client_id, 'delete')
+            self.connection.commit()
+            cursor.close()
+            if deleted:
+                self._audit('clients', 'delete', client_id, previous, None)
+            return deleted
+        except Error as e:
+            logger.error(f"Error deleting client: {e}")
+            self._rollback()
+            return False
+
     def create_contact(self, contact_data: Dict[str, Any]) -> Optional[int]:
         """Create a new contact record"""
         try:
             cursor = self.connection.cursor()
             query = """
                 INSERT INTO contacts 
-                (client_id, employee_id, contact_datetime, contact_method, 
-                 conversion_rating, notes)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                (client_id, employee_id, contact_datetime, duration_minutes,
+                 contact_method, conversion_rating, notes, status,
+                 series_id, occurrence_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             values = (
                 contact_data['client_id'],
                 contact_data['employee_id'],
                 contact_data['contact_datetime'],
+                contact_data.get('duration_minutes') or DEFAULT_DURATION,
                 contact_data['contact_method'],
                 contact_data.get('conversion_rating'),
-                contact_data.get('notes')
+                contact_data.get('notes'),
+                contact_data.get('status', 'Scheduled'),
+                contact_data.get('series_id'),
+                contact_data.get('occurrence_at')
             )
             cursor.execute(query, values)
-            self.connection.commit()
             contact_id = cursor.lastrowid
+            self._record_change(cursor, 'contacts', contact_id, 'create')
+            self.connection.commit()
             cursor.close()
+            self._audit('contacts', 'create', contact_id, None, contact_data)
             return contact_id
         except Error as e:
             logger.error(f"Error creating contact: {e}")
+            self._rollback()
             return None
 
+    # Contacts older than this many days may have been moved to
+    # contacts_archive by archive_contacts()
+    HOT_WINDOW_DAYS = 180
+
+    CONTACT_COLUMNS = (
+        "id, client_id, employee_id, contact_datetime, duration_minutes, "
+        "contact_method, conversion_rating, notes, status, series_id, "
+        "occurrence_at, created_at, updated_at"
+    )
+
+    # Columns a caller may ask get_employee_contacts() for, and their SQL;
+    # list views take notes_preview and fetch notes on demand
+    CONTACT_FIELDS = {
+        'id': "c.id", 'client_id': "c.client_id", 'employee_id': "c.employee_id",
+        'contact_datetime': "c.contact_datetime",
+        'duration_minutes': "c.duration_minutes",
+        'contact_method': "c.contact_method",
+        'conversion_rating': "c.conversion_rating", 'notes': "c.notes",
+        'notes_preview': "LEFT(c.notes, 100)", 'status': "c.status",
+        'series_id': "c.series_id", 'occurrence_at': "c.occurrence_at",
+        'created_at': "c.created_at", 'updated_at': "c.updated_at",
+        'client_name': "cl.name", 'client_type': "cl.client_type",
+        'employee_name': "e.name",
+    }
+
+    def contacts_source(self, start_date: Optional[date] = None) -> str:
+        """Table expression for contacts from start_date on
+
+        Queries that start inside the hot window read the contacts table
+        alone. Archived contacts are all older than the hot window, so
+        only queries reaching further back read the archive as well; with
+        no start date the hot table is used, which is the default for
+        day-to-day views.
+        """
+        if start_date is None:
+            return "contacts"
+        if not isinstance(start_date, datetime):
+            start_date = datetime.combine(start_date, datetime.min.time())
+        if start_date >= datetime.now() - timedelta(days=self.HOT_WINDOW_DAYS):
+            return "contacts"
+        return (
+            f"(SELECT {self.CONTACT_COLUMNS} FROM contacts "
+            f"UNION ALL SELECT {self.CONTACT_COLUMNS} FROM contacts_archive)"
+        )
+
+    def archive_contacts(self, before: Optional[datetime] = None,
+                         batch_size: int = 5000) -> int:
+        """Move completed and cancelled contacts older than before to the archive
+
+        before defaults to the start of the hot window and may not be
+        later. Each batch is copied and deleted in one transaction, so an
+        interrupted run leaves every contact in exactly one table.
+        Returns the number of contacts moved, or -1 on error.
+        """
+        horizon = datetime.now() - timedelta(days=self.HOT_WINDOW_DAYS)
+        before = min(before or horizon, horizon)
+        moved = 0
+        try:
+            cursor = self.connection.cursor()
+            try:
+                while True:
+                    cursor.execute("""
+                        SELECT id FROM contacts
+                        WHERE contact_datetime < %s
+                          AND status IN ('Completed', 'Cancelled')
+                        ORDER BY id
+                        LIMIT %s
+                    """, (before, batch_size))
+                    ids = [row[0] for row in cursor.fetchall()]
+                    if not ids:
+                        break
+                    placeholders = ", ".join(["%s"] * len(ids))
+                    cursor.execute(
+                        f"INSERT INTO contacts_archive ({self.CONTACT_COLUMNS}) "
+                        f"SELECT {self.CONTACT_COLUMNS} FROM contacts "
+                        f"WHERE id IN ({placeholders})",
+                        ids
+                    )
+                    cursor.execute(
+                        f"DELETE FROM contacts WHERE id IN ({placeholders})", ids
+                    )
+                    self._record_change(cursor, 'contacts', None, 'reset')
+                    self.connection.commit()
+                    moved += len(ids)
+            finally:
+                cursor.close()
+            logger.info(f"Archived {moved} contacts older than {before}")
+            return moved
+        except Error as e:
+            logger.error(f"Error archiving contacts: {e}")
+            self._rollback()
+            return -1
+
     def get_employee_contacts(self, employee_id: int, is_manager: bool = False,
-                            start_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
-        """Get contacts for an employee or all contacts for managers"""
+                            start_date: Optional[datetime] = None,
+                            end_date: Optional[datetime] = None,
+                            status: Optional[str] = None,
+                            columns: Optional[List[str]] = None,
+                            occurrences: bool = False,
+                            strict: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Get contacts for an employee or all contacts for managers
+
+        start_date is inclusive and end_date exclusive, so adjacent windows
+        never overlap. Without start_date only the hot table is read (see
+        contacts_source). columns (names from CONTACT_FIELDS) limits what
+        is fetched; the client and employee joins only run when one of
+        their columns is asked for.
+
+        With occurrences and both dates, the window's occurrences of
+        recurring series that have no contact row yet are merged in, with
+        negative ids (see scheduling.expand_series).
+
+        A failed query returns [], or None with strict, so a caller that
+        caches the rows can tell a failure from an empty window.
+        """
         try:
+            select, aliases = self._projection(self.CONTACT_FIELDS, columns)
             cursor = self.connection.cursor(dictionary=True)
-            query = """
-                SELECT c.*, cl.name as client_name, cl.client_type,
-                       e.name as employee_name
-                FROM contacts c
-                JOIN clients cl ON c.client_id = cl.id
-                JOIN employees e ON c.employee_id = e.id
-            """
+            query = f"SELECT {select} FROM {self.contacts_source(start_date)} c"
+            # Foreign keys guarantee the match, so leaving a join out
+            # never changes which contacts come back
+            if 'cl' in aliases:
+                query += " JOIN clients cl ON c.client_id = cl.id"
+            if 'e' in aliases:
+                query += " JOIN employees e ON c.employee_id = e.id"
+            conditions = []
             params = []
 
             if not is_manager:
-                query += " WHERE c.employee_id = %s"
+                conditions.append("c.employee_id = %s")
                 params.append(employee_id)
 
             if start_date:
-                query += " AND c.contact_datetime >= %s" if params else " WHERE c.contact_datetime >= %s"
+                conditions.append("c.contact_datetime >= %s")
                 params.append(start_date)
 
+            if end_date:
+                conditions.append("c.contact_datetime < %s")
+                params.append(end_date)
+
+            if status:
+                conditions.append("c.status = %s")
+                params.append(status)
+
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
             query += " ORDER BY c.contact_datetime"
             
             cursor.execute(query, params)
             contacts = cursor.fetchall()
+            if occurrences and start_date and end_date \
+                    and status in (None, 'Scheduled'):
+                expanded = self._series_occurrences(
+                    cursor, employee_id, is_manager, start_date, end_date
+                )
+                if expanded:
+                    if columns is not None:
+                        names = ['id'] + list(columns)
+                        expanded = [{name: row[name] for name in names}
+                                    for row in expanded]
+                    contacts = sorted(contacts + expanded,
+                                      key=lambda row: row['contact_datetime'])
             cursor.close()
             return contacts
         except Error as e:
             logger.error(f"Error fetching contacts: {e}")
+            return None if strict else []
+
+    def _series_occurrences(self, cursor, employee_id: int, is_manager: bool,
+                            start: datetime,
+                            end: datetime) -> List[Dict[str, Any]]:
+        """Rows for the series occurrences in [start, end) not stored as contacts
+
+        Reads the series active in the window and the overrides stored for
+        them there; a series costs one row however long it runs.
+        """
+        query = """
+            SELECT s.*, cl.name AS client_name, cl.client_type,
+                   e.name AS employee_name
+            FROM contact_series s
+            JOIN clients cl ON s.client_id = cl.id
+            JOIN employees e ON s.employee_id = e.id
+            WHERE s.first_datetime < %s
+              AND (s.ends_on IS NULL OR s.ends_on >= DATE(%s))
+        """
+        params = [end, start]
+        if not is_manager:
+            query += " AND s.employee_id = %s"
+            params.append(employee_id)
+        cursor.execute(query, params)
+        series_list = cursor.fetchall()
+        if not series_list:
+            return []
+
+        placeholders = ", ".join(["%s"] * len(series_list))
+        cursor.execute(
+            f"SELECT series_id, occurrence_at FROM {self.contacts_source(start)} c "
+            f"WHERE c.series_id IN ({placeholders}) "
+            "AND c.occurrence_at >= %s AND c.occurrence_at < %s",
+            [series['id'] for series in series_list] + [start, end]
+        )
+        overridden = {(row['series_id'], row['occurrence_at'])
+                      for row in cursor.fetchall()}
+        return expand_series(series_list, overridden, start, end)
+
+    def get_clients_needing_contact(self, client_type: Optional[str] = None,
+                                    state_code: Optional[str] = None,
+                                    limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Clients with nothing scheduled from now on, least recently contacted first
+
+        A client counts as scheduled with an upcoming Scheduled contact or
+        a recurring series that has not ended.
+        """
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            query = """
+                SELECT cl.id, cl.name, cl.client_type, cl.state_code
+                FROM clients cl
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM contacts c
+                    WHERE c.client_id = cl.id AND c.status = 'Scheduled'
+                      AND c.contact_datetime >= NOW()
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM contact_series s
+                    WHERE s.client_id = cl.id
+                      AND (s.ends_on IS NULL OR s.ends_on >= CURDATE())
+                )
+            """
+            params = []
+            if client_type:
+                query += " AND cl.client_type = %s"
+                params.append(client_type)
+            if state_code:
+                query += " AND cl.state_code = %s"
+                params.append(state_code)
+            query += """
+                ORDER BY (SELECT MAX(c.contact_datetime) FROM contacts c
+                          WHERE c.client_id = cl.id), cl.id
+            """
+            if limit:
+                query += " LIMIT %s"
+                params.append(limit)
+            cursor.execute(query, params)
+            clients = cursor.fetchall()
+            cursor.close()
+            return clients
+        except Error as e:
+            logger.error(f"Error fetching clients needing contact: {e}")
+            return []
+
+    def insert_contacts(self, contacts: List[Dict[str, Any]]) -> int:
+        """Insert many contacts in one transaction, e.g. planned assignments
+
+        The batch is sent as a single multi-row insert and committed once,
+        so either every contact is created or none is. Returns the number
+        of contacts created, or -1 on error.
+        """
+        if not contacts:
+            return 0
+        try:
+            cursor = self.connection.cursor()
+            query = """
+                INSERT INTO contacts
+                (client_id, employee_id, contact_datetime, duration_minutes,
+                 contact_method, conversion_rating, notes, status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            cursor.executemany(query, [
+                (
+                    contact['client_id'],
+                    contact['employee_id'],
+                    contact['contact_datetime'],
+                    contact.get('duration_minutes') or DEFAULT_DURATION,
+                    contact['contact_method'],
+                    contact.get('conversion_rating'),
+                    contact.get('notes'),
+                    contact.get('status', 'Scheduled')
+                )
+                for contact in contacts
+            ])
+            # Ids of a bulk insert are not reported one by one; followers
+            # reload instead
+            self._record_change(cursor, 'contacts', None, 'reset')
+            self.connection.commit()
+            cursor.close()
+            self._audit('contacts', 'import', None, None, {'rows': len(contacts)})
+            return len(contacts)
+        except Error as e:
+            logger.error(f"Error inserting contacts: {e}")
+            self._rollback()
+            return -1
+
+    def get_series(self, series_id: int) -> Optional[Dict[str, Any]]:
+        """Get a recurring contact series by id"""
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT s.*, cl.name AS client_name, cl.client_type,
+                       e.name AS employee_name
+                FROM contact_series s
+                JOIN clients cl ON s.client_id = cl.id
+                JOIN employees e ON s.employee_id = e.id
+                WHERE s.id = %s
+            """, (series_id,))
+            series = cursor.fetchone()
+            cursor.close()
+            return series
+        except Error as e:
+            logger.error(f"Error fetching contact series: {e}")
+            return None
+
+    def create_series(self, series_data: Dict[str, Any]) -> Optional[int]:
+        """Create a recurring contact series
+
+        Only the rule is stored; occurrences are expanded when a window
+        is read with occurrences=True.
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                INSERT INTO contact_series
+                (client_id, employee_id, first_datetime, duration_minutes,
+                 contact_method, notes, frequency, every, ends_on)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (
+                series_data['client_id'],
+                series_data['employee_id'],
+                series_data['first_datetime'],
+                series_data.get('duration_minutes') or DEFAULT_DURATION,
+                series_data['contact_method'],
+                series_data.get('notes'),
+                series_data['frequency'],
+                series_data.get('every') or 1,
+                series_data.get('ends_on')
+            ))
+            series_id = cursor.lastrowid
+            self._record_change(cursor, 'contact_series', series_id, 'create')
+            self.connection.commit()
+            cursor.close()
+            self._audit('contact_series', 'create', series_id, None, series_data)
+            return series_id
+        except Error as e:
+            logger.error(f"Error creating contact series: {e}")
+            self._rollback()
+            return None
+
+    def end_series(self, series_id: int, ends_on: date) -> bool:
+        """Make ends_on a series' last day, dropping its later occurrences
+
+        Occurrences already stored as contacts are kept.
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "UPDATE contact_series SET ends_on = %s WHERE id = %s",
+                (ends_on, series_id)
+            )
+            updated = cursor.rowcount > 0
+            if updated:
+                self._record_change(cursor, 'contact_series', series_id, 'update')
+            self.connection.commit()
+            cursor.close()
+            if updated:
+                self._audit('contact_series', 'update', series_id, None,
+                            {'ends_on': ends_on})
+            return updated
+        except Error as e:
+            logger.error(f"Error ending contact series: {e}")
+            self._rollback()
+            return False
+
+    # Column order of the rows yielded by iter_report_contacts
+    REPORT_COLUMNS = [
+        "Date/Time", "Client Name", "Type", "Employee",
+        "Method", "Rating", "Status", "Notes"
+    ]
+
+    def _report_filter(self, start_date: date, end_date: date,
+                       status: Optional[str],
+                       employee_id: Optional[int]) -> Tuple[str, list]:
+        """WHERE clause shared by the report queries; end_date is inclusive"""
+        conditions = ["c.contact_datetime >= %s", "c.contact_datetime < %s"]
+        params = [start_date, end_date + timedelta(days=1)]
+        if status:
+            conditions.append("c.status = %s")
+            params.append(status)
+        if employee_id:
+            conditions.append("c.employee_id = %s")
+            params.append(employee_id)
+        return " WHERE " + " AND ".join(conditions), params
+
+    def _report_occurrences(self, start_date: date, end_date: date,
+                            status: Optional[str],
+                            employee_id: Optional[int]) -> List[Dict[str, Any]]:
+        """Unstored series occurrences a report over these filters includes
+
+        Occurrences are always Scheduled, so other statuses get none.
+        """
+        if status not in (None, 'Scheduled'):
+            return []
+        cursor = self.connection.cursor(dictionary=True)
+        try:
+            return self._series_occurrences(
+                cursor, employee_id, not employee_id,
+                datetime.combine(start_date, datetime.min.time()),
+                datetime.combine(end_date + timedelta(days=1),
+                                 datetime.min.time())
+            )
+        finally:
+            cursor.close()
+
+    def count_report_contacts(self, start_date: date, end_date: date,
+                              status: Optional[str] = None,
+                              employee_id: Optional[int] = None) -> int:
+        """Count the contacts a report over these filters would return"""
+        try:
+            cursor = self.connection.cursor()
+            where, params = self._report_filter(
+                start_date, end_date, status, employee_id
+            )
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {self.contacts_source(start_date)} c" + where,
+                params
+            )
+            (count,) = cursor.fetchone()
+            cursor.close()
+            return count + len(self._report_occurrences(
+                start_date, end_date, status, employee_id
+            ))
+        except Error as e:
+            logger.error(f"Error counting report contacts: {e}")
+            return 0
+
+    def iter_report_contacts(self, start_date: date, end_date: date,
+                             status: Optional[str] = None,
+                             employee_id: Optional[int] = None,
+                             batch_size: int = 1000) -> Iterator[List[tuple]]:
+        """Stream report rows in batches, in REPORT_COLUMNS order
+
+        Uses an unbuffered cursor so only one batch of contacts is held in
+        memory at a time; the window's series occurrences, read up front,
+        are merged in by date/time. Unlike the other queries, errors are
+        logged and re-raised: a stream that silently stops would look like
+        a complete export.
+        """
+        try:
+            pending = deque(
+                (row['contact_datetime'], row['client_name'],
+                 row['client_type'], row['employee_name'],
+                 row['contact_method'], None, row['status'], row['notes'])
+                for row in self._report_occurrences(
+                    start_date, end_date, status, employee_id
+                )
+            )
+        except Error as e:
+            logger.error(f"Error streaming report contacts: {e}")
+            raise
+        cursor = self.connection.cursor(buffered=False)
+        try:
+            where, params = self._report_filter(
+                start_date, end_date, status, employee_id
+            )
+            query = f"""
+                SELECT c.contact_datetime, cl.name, cl.client_type, e.name,
+                       c.contact_method, c.conversion_rating, c.status, c.notes
+                FROM {self.contacts_source(start_date)} c
+                JOIN clients cl ON c.client_id = cl.id
+                JOIN employees e ON c.employee_id = e.id
+            """ + where + " ORDER BY c.contact_datetime"
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                due = []
+                while pending and pending[0][0] <= rows[-1][0]:
+                    due.append(pending.popleft())
+                if due:
+                    rows = list(heapq.merge(rows, due, key=itemgetter(0)))
+                yield rows
+            while pending:
+                yield [pending.popleft()
+                       for _ in range(min(batch_size, len(pending)))]
+        except Error as e:
+            logger.error(f"Error streaming report contacts: {e}")
+            raise
+        finally:
+            try:
+                cursor.close()
+            except Error:
+                # Abandoned streams leave unread rows behind; the caller
+                # drops the whole connection in that case
+                pass
+
+    def get_contact_trends(self, start_date: date, end_date: date,
+                           bucket_days: int,
+                           employee_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Contact counts, average rating and method mix per time bucket
+
+        Buckets are bucket_days wide and counted from start_date; grouping
+        happens in the database so only one row per bucket is returned.
+        Unstored series occurrences are added to their buckets, unrated.
+        Empty buckets are omitted.
+        """
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            where, params = self._report_filter(
+                start_date, end_date, None, employee_id
+            )
+            query = f"""
+                SELECT FLOOR((TO_DAYS(c.contact_datetime) - TO_DAYS(%s)) / %s) AS bucket,
+                       COUNT(*) AS total,
+                       AVG(c.conversion_rating) AS avg_rating,
+                       SUM(c.contact_method = 'phone') AS phone,
+                       SUM(c.contact_method = 'email') AS email,
+                       SUM(c.contact_method = 'in-person') AS in_person,
+                       SUM(c.contact_method = 'other') AS other
+                FROM {self.contacts_source(start_date)} c
+            """ + where + " GROUP BY bucket ORDER BY bucket"
+            cursor.execute(query, [start_date, bucket_days] + params)
+            trends = {int(row['bucket']): row for row in cursor.fetchall()}
+            cursor.close()
+            for occurrence in self._report_occurrences(
+                    start_date, end_date, None, employee_id):
+                bucket = ((occurrence['contact_datetime'].date() - start_date).days
+                          // bucket_days)
+                row = trends.setdefault(bucket, {
+                    'bucket': bucket, 'total': 0, 'avg_rating': None,
+                    'phone': 0, 'email': 0, 'in_person': 0, 'other': 0
+                })
+                row['total'] += 1
+                row[occurrence['contact_method'].replace('-', '_')] += 1
+            return [trends[bucket] for bucket in sorted(trends)]
+        except Error as e:
+            logger.error(f"Error fetching contact trends: {e}")
+            return []
+
+    @staticmethod
+    def notes_search_terms(text: str) -> str:
+        """Turn a user's search text into a boolean-mode full-text query
+
+        "Quoted text" is matched as a phrase, a trailing * makes a word a
+        prefix and every term is required. Other operator characters are
+        dropped so user input can never be a syntax error.
+        """
+        terms = []
+        for phrase, word in re.findall(r'"([^"]*)"|(\S+)', text):
+            if phrase:
+                words = re.findall(r"\w+", phrase)
+                if words:
+                    terms.append('+"' + " ".join(words) + '"')
+            else:
+                prefix = word.endswith("*")
+                for part in re.findall(r"\w+", word):
+                    terms.append(f"+{part}")
+                if prefix and terms and terms[-1].startswith("+"):
+                    terms[-1] += "*"
+        return " ".join(terms)
+
+    def search_contact_notes(self, text: str,
+                             employee_id: Optional[int] = None,
+                             start_date: Optional[datetime] = None,
+                             end_date: Optional[datetime] = None,
+                             limit: int = 50) -> List[Dict[str, Any]]:
+        """Contacts whose notes match text, best matches first
+
+        Uses the FULLTEXT indexes on notes, which InnoDB keeps up to date
+        on every contact write. Words shorter than the server's minimum
+        token size (3 by default) and stop words are not indexed. The
+        archive is searched too unless start_date lies inside the hot
+        window; end_date is exclusive. Each row carries a relevance score.
+        """
+        terms = self.notes_search_terms(text)
+        if not terms:
+            return []
+
+        conditions = ["MATCH(c.notes) AGAINST (%s IN BOOLEAN MODE)"]
+        params = [terms]
+        if employee_id:
+            conditions.append("c.employee_id = %s")
+            params.append(employee_id)
+        if start_date:
+            conditions.append("c.contact_datetime >= %s")
+            params.append(start_date)
+        if end_date:
+            conditions.append("c.contact_datetime < %s")
+            params.append(end_date)
+
+        # MATCH needs the indexed base table, so each tier is queried
+        # separately and the ranked results merged
+        tables = ["contacts"]
+        if self.contacts_source(start_date or date.min) != "contacts":
+            tables.append("contacts_archive")
+        selects = [
+            f"""
+                (SELECT c.id, c.client_id, c.employee_id, c.contact_datetime,
+                        c.contact_method, c.status, c.notes,
+                        cl.name as client_name, e.name as employee_name,
+                        '{table}' as source,
+                        MATCH(c.notes) AGAINST (%s IN BOOLEAN MODE) AS score
+                 FROM {table} c
+                 JOIN clients cl ON c.client_id = cl.id
+                 JOIN employees e ON c.employee_id = e.id
+                 WHERE {" AND ".join(conditions)}
+                 ORDER BY score DESC
+                 LIMIT %s)
+            """
+            for table in tables
+        ]
+        query = " UNION ALL ".join(selects) + " ORDER BY score DESC LIMIT %s"
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            cursor.execute(
+                query, ([terms] + params + [limit]) * len(tables) + [limit]
+            )
+            results = cursor.fetchall()
+            cursor.close()
+            return results
+        except Error as e:
+            logger.error(f"Error searching contact notes: {e}")
             return []
 
+    def get_contact(self, contact_id: int) -> Optional[Dict[str, Any]]:
+        """Get a single contact by id"""
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            query = """
+                SELECT c.*, cl.name as client_name, cl.client_type,
+                       e.name as employee_name
+                FROM contacts c
+                JOIN clients cl ON c.client_id = cl.id
+                JOIN employees e ON c.employee_id = e.id
+                WHERE c.id = %s
+            """
+            cursor.execute(query, (contact_id,))
+            contact = cursor.fetchone()
+            cursor.close()
+            return contact
+        except Error as e:
+            logger.error(f"Error fetching contact: {e}")
+            return None
+
+    def get_conflicting_contacts(self, employee_id: int, start: datetime,
+                                 end: datetime,
+                                 exclude_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The employee's booked contacts overlapping [start, end)
+
+        No contact is longer than MAX_DURATION, so the scan is a range on
+        (employee_id, contact_datetime) from start - MAX_DURATION to end.
+        Cancelled contacts take up no time. Unstored occurrences of the
+        employee's series count too, with their negative ids.
+        """
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT c.id, c.contact_datetime, c.duration_minutes,
+                       cl.name AS client_name
+                FROM contacts c
+                JOIN clients cl ON c.client_id = cl.id
+                WHERE c.employee_id = %s
+                  AND c.contact_datetime >= %s AND c.contact_datetime < %s
+                  AND c.contact_datetime + INTERVAL c.duration_minutes MINUTE > %s
+                  AND c.status <> 'Cancelled'
+                  AND c.id <> %s
+                ORDER BY c.contact_datetime
+            """, (employee_id, start - timedelta(minutes=MAX_DURATION), end,
+                  start, exclude_id or 0))
+            conflicts = cursor.fetchall()
+            occurrences = self._series_occurrences(
+                cursor, employee_id, False,
+                start - timedelta(minutes=MAX_DURATION), end
+            )
+            cursor.close()
+            conflicts += [
+                {name: row[name] for name in
+                 ('id', 'contact_datetime', 'duration_minutes', 'client_name')}
+                for row in occurrences
+                if contact_interval(row)[1] > start and row['id'] != exclude_id
+            ]
+            conflicts.sort(key=lambda row: row['contact_datetime'])
+            return conflicts
+        except Error as e:
+            logger.error(f"Error checking contact conflicts: {e}")
+            return []
+
+    def get_contact_notes(self, contact_id: int) -> Optional[str]:
+        """Full notes of one contact, for views that listed a preview"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "SELECT notes FROM contacts WHERE id = %s "
+                "UNION ALL SELECT notes FROM contacts_archive WHERE id = %s",
+                (contact_id, contact_id)
+            )
+            row = cursor.fetchone()
+            cursor.fetchall()
+            cursor.close()
+            return row[0] if row else None
+        except Error as e:
+            logger.error(f"Error fetching contact notes: {e}")
+            return None
+
+    def get_owner(self, table: str, row_id: int) -> Optional[int]:
+        """employee_id of a contact (archived ones included) or series
+
+        None if there is no such row or on error.
+        """
+        queries = {
+            'contacts': "SELECT employee_id FROM contacts WHERE id = %(id)s "
+                        "UNION ALL SELECT employee_id FROM contacts_archive "
+                        "WHERE id = %(id)s",
+            'contact_series': "SELECT employee_id FROM contact_series "
+                              "WHERE id = %(id)s",
+        }
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(queries[table], {'id': row_id})
+            row = cursor.fetchone()
+            cursor.fetchall()
+            cursor.close()
+            return row[0] if row else None
+        except Error as e:
+            logger.error(f"Error fetching owner of {table} {row_id}: {e}")
+            return None
+
+    def update_contact(self, contact_data: Dict[str, Any],
+                       previous: Optional[Dict[str, Any]] = None) -> bool:
+        """Update an existing contact record; previous feeds the audit diff"""
+        try:
+            cursor = self.connection.cursor()
+            query = """
+                UPDATE contacts
+                SET client_id = %s, employee_id = %s, contact_datetime = %s,
+                    duration_minutes = %s, contact_method = %s,
+                    conversion_rating = %s, notes = %s, status = %s
+                WHERE id = %s
+            """
+            values = (
+                contact_data['client_id'],
+                contact_data['employee_id'],
+                contact_data['contact_datetime'],
+                contact_data.get('duration_minutes') or DEFAULT_DURATION,
+                contact_data['contact_method'],
+                contact_data.get('conversion_rating'),
+                contact_data.get('notes'),
+                contact_data.get('status', 'Scheduled'),
+                contact_data['id']
+            )
+            cursor.execute(query, values)
+            # No row means it was deleted meanwhile
+            updated = cursor.rowcount > 0
+            if updated:
+                self._record_change(cursor, 'contacts', contact_data['id'], 'update')
+            self.connection.commit()
+            cursor.close()
+            if updated:
+                self._audit('contacts', 'update', contact_data['id'],
+                            previous, contact_data)
+            return updated
+        except Error as e:
+            logger.error(f"Error updating contact: {e}")
+            self._rollback()
+            return False
+
+    def delete_contact(self, contact_id: int,
+                       previous: Optional[Dict[str, Any]] = None) -> bool:
+        """Delete a contact record"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("DELETE FROM contacts WHERE id = %s", (contact_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                self._record_change(cursor, 'contacts', contact_id, 'delete')
+            self.connection.commit()
+            cursor.close()
+            if deleted:
+                self._audit('contacts', 'delete', contact_id, previous, None)
+            return deleted
+        except Error as e:
+            logger.error(f"Error deleting contact: {e}")
+            self._rollback()
+            return False
+
     def create_employee(self, employee_data: Dict[str, Any]) -> Optional[int]:
         """Create a new employee"""
         try:
@@ -203,22 +1501,26 @@ class DatabaseManager:
             )
             
             query = """
-                INSERT INTO employees (name, login_id, password_hash, role)
-                VALUES (%s, %s, %s, %s)
+                INSERT INTO employees (name, login_id, password_hash, role, territory)
+                VALUES (%s, %s, %s, %s, %s)
             """
             values = (
                 employee_data['name'],
                 employee_data['login_id'],
                 password_hash,
-                employee_data['role']
+                employee_data['role'],
+                employee_data.get('territory')
             )
             cursor.execute(query, values)
-            self.connection.commit()
             employee_id = cursor.lastrowid
+            self._record_change(cursor, 'employees', employee_id, 'create')
+            self.connection.commit()
             cursor.close()
+            self._audit('employees', 'create', employee_id, None, employee_data)
             return employee_id
         except Error as e:
             logger.error(f"Error creating employee: {e}")
+            self._rollback()
             return None
 
     def get_employees(self) -> List[Dict[str, Any]]:
@@ -226,7 +1528,7 @@ class DatabaseManager:
         try:
             cursor = self.connection.cursor(dictionary=True)
             query = """
-                SELECT id, name, login_id, role, created_at, updated_at
+                SELECT id, name, login_id, role, territory, created_at, updated_at
                 FROM employees
                 ORDER BY name
             """
@@ -237,3 +1539,95 @@ class DatabaseManager:
         except Error as e:
             logger.error(f"Error fetching employees: {e}")
             return []
+
+    def get_employee(self, employee_id: int) -> Optional[Dict[str, Any]]:
+        """Get a single employee by id"""
+        try:
+            cursor = self.connection.cursor(dictionary=True)
+            query = """
+                SELECT id, name, login_id, role, territory, created_at, updated_at
+                FROM employees
+                WHERE id = %s
+            """
+            cursor.execute(query, (employee_id,))
+            employee = cursor.fetchone()
+            cursor.close()
+            return employee
+        except Error as e:
+            logger.error(f"Error fetching employee: {e}")
+            return None
+
+    def update_employee(self, employee_data: Dict[str, Any],
+                        previous: Optional[Dict[str, Any]] = None) -> bool:
+        """Update an existing employee, changing the password only if given
+
+        previous, the row as it was before, is only used for the audit diff.
+        """
+        try:
+            cursor = self.connection.cursor()
+            if employee_data.get('password'):
+                password_hash = bcrypt.hashpw(
+                    employee_data['password'].encode('utf-8'),
+                    bcrypt.gensalt()
+                )
+                query = """
+                    UPDATE employees
+                    SET name = %s, login_id = %s, role = %s, territory = %s,
+                        password_hash = %s
+                    WHERE id = %s
+                """
+                values = (
+                    employee_data['name'],
+                    employee_data['login_id'],
+                    employee_data['role'],
+                    employee_data.get('territory'),
+                    password_hash,
+                    employee_data['id']
+                )
+            else:
+                query = """
+                    UPDATE employees
+                    SET name = %s, login_id = %s, role = %s, territory = %s
+                    WHERE id = %s
+                """
+                values = (
+                    employee_data['name'],
+                    employee_data['login_id'],
+                    employee_data['role'],
+                    employee_data.get('territory'),
+                    employee_data['id']
+                )
+            cursor.execute(query, values)
+            # No row means it was deleted meanwhile
+            updated = cursor.rowcount > 0
+            if updated:
+                self._record_change(cursor, 'employees', employee_data['id'], 'update')
+            self.connection.commit()
+            cursor.close()
+            if updated:
+                self._audit('employees', 'update', employee_data['id'],
+                            previous, employee_data)
+            return updated
+        except Error as e:
+            logger.error(f"Error updating employee: {e}")
+            self._rollback()
+            return False
+
+    def delete_employee(self, employee_id: int,
+                        previous: Optional[Dict[str, Any]] = None) -> bool:
+        """Delete an employee"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("DELETE FROM employees WHERE id = %s", (employee_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                self._record_change(cursor, 'employees', employee_id, 'delete')
+            self.connection.commit()
+            cursor.close()
+            if deleted:
+                self._audit('employees', 'delete', employee_id, previous, None)
+            return deleted
+        except Error as e:
+            logger.error(f"Error deleting employee: {e}")
+            self._rollback()
+            return False
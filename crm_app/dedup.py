@@ -0,0 +1,191 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Words that do not tell companies apart
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'gmbh', 'plc', 'lp', 'llp', 'the'
+}
+
+NUM_HASHES = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_HASHES // BANDS
+# Buckets shared by more clients than this say nothing useful about any
+# pair in them (think "smith", a shared info@ address or a switchboard
+# number), so they are not used for candidates
+MAX_BUCKET_SIZE = 200
+
+_PRIME = (1 << 61) - 1
+_MASK = (1 << 32) - 1
+# Fixed coefficients keep signatures stable between runs
+_COEFFICIENTS = [
+    ((i * 0x9E3779B1 + 0x7F4A7C15) % _PRIME | 1,
+     (i * 0x85EBCA6B + 0xC2B2AE35) % _PRIME)
+    for i in range(1, NUM_HASHES + 1)
+]
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lower-case a company/person name and drop punctuation and legal suffixes"""
+    words = re.sub(r"[^\w\s]", " ", (name or "").lower()).split()
+    kept = [w for w in words if w not in LEGAL_SUFFIXES]
+    return " ".join(kept or words)
+
+
+def normalize_email(email: Optional[str]) -> str:
+    """Lower-case an email address and drop any +tag"""
+    email = (email or "").strip().lower()
+    if "@" not in email:
+        return ""
+    local, domain = email.split("@", 1)
+    return f"{local.split('+', 1)[0]}@{domain}"
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Digits of a phone number, without country prefix (last ten digits)"""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:] if len(digits) >= 7 else ""
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Character n-grams of a normalized name"""
+    padded = f" {text} "
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def minhash(grams: Set[str]) -> List[int]:
+    """MinHash signature approximating Jaccard similarity of shingle sets"""
+    hashed = [zlib.crc32(g.encode('utf-8')) for g in grams]
+    return [min(((a * h + b) % _PRIME) & _MASK for h in hashed)
+            for a, b in _COEFFICIENTS]
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class DedupIndex:
+    """Blocking index that finds likely duplicate clients without comparing all pairs
+
+    Clients are bucketed by exact normalized email, exact phone and LSH
+    bands of the MinHash of their name, so a lookup only scores the few
+    clients that share a bucket.
+    """
+
+    def __init__(self, threshold: float = 0.6):
+        self.threshold = threshold
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._buckets: Dict[Tuple, Set[int]] = defaultdict(set)
+
+    def __len__(self):
+        return len(self._records)
+
+    @staticmethod
+    def record(client: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalized fields and blocking keys of a client"""
+        name = normalize_name(client.get('name'))
+        grams = shingles(name) if name else set()
+        keys = []
+        email = normalize_email(client.get('email'))
+        if email:
+            keys.append(('email', email))
+        phone = normalize_phone(client.get('phone'))
+        if phone:
+            keys.append(('phone', phone))
+        if grams:
+            signature = minhash(grams)
+            for band in range(BANDS):
+                rows = tuple(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+                keys.append(('name', band, rows))
+        return {'id': client.get('id'), 'name': client.get('name'),
+                'grams': grams, 'email': email, 'phone': phone, 'keys': keys}
+
+    def add(self, client: Dict[str, Any]):
+        """Index a client, replacing any earlier version of it"""
+        self.remove(client['id'])
+        record = self.record(client)
+        self._records[client['id']] = record
+        for key in record['keys']:
+            self._buckets[key].add(client['id'])
+
+    def remove(self, client_id: int):
+        """Drop a client from the index"""
+        record = self._records.pop(client_id, None)
+        if record is None:
+            return
+        for key in record['keys']:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(client_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def score(self, a: Dict[str, Any], b: Dict[str, Any]) -> float:
+        """Similarity of two records between 0 and 1
+
+        A shared email is enough on its own; a shared phone (often a
+        switchboard) also needs some similarity in the name.
+        """
+        score = 0.6 * jaccard(a['grams'], b['grams'])
+        if a['email'] and a['email'] == b['email']:
+            score += 0.6
+        if a['phone'] and a['phone'] == b['phone']:
+            score += 0.5
+        return min(score, 1.0)
+
+    def matches(self, client: Dict[str, Any],
+                limit: int = 5) -> List[Tuple[float, Dict[str, Any]]]:
+        """Indexed clients that look like the given (possibly unsaved) client"""
+        record = self.record(client)
+        candidates = set()
+        for key in record['keys']:
+            bucket = self._buckets.get(key)
+            if bucket and len(bucket) <= MAX_BUCKET_SIZE:
+                candidates |= bucket
+        candidates.discard(client.get('id'))
+
+        scored = []
+        for candidate_id in candidates:
+            other = self._records[candidate_id]
+            score = self.score(record, other)
+            if score >= self.threshold:
+                scored.append((score, other))
+        scored.sort(key=lambda match: -match[0])
+        return scored[:limit]
+
+
+def find_duplicate_pairs(clients: Iterable[Dict[str, Any]],
+                         threshold: float = 0.6) -> Iterator[Tuple[int, int, float]]:
+    """Yield (earlier id, later id, score) for likely duplicates
+
+    Clients are streamed through a DedupIndex: each one is matched against
+    the clients seen before it and then added, so every pair is reported
+    once and the work grows with bucket sizes rather than n squared.
+    """
+    index = DedupIndex(threshold)
+    for client in clients:
+        for score, other in index.matches(client, limit=50):
+            yield other['id'], client['id'], score
+        index.add(client)
+
+
+def find_duplicates(db_manager, threshold: float = 0.6,
+                    batch_size: int = 1000) -> List[Tuple[int, int, float]]:
+    """Batch job: likely duplicate client pairs across the whole table
+
+    Clients are streamed from the database rather than loaded at once;
+    the index itself keeps only normalized fields and blocking keys.
+    """
+    def clients():
+        for batch in db_manager.iter_clients(batch_size):
+            yield from batch
+
+    pairs = list(find_duplicate_pairs(clients(), threshold))
+    pairs.sort(key=lambda pair: -pair[2])
+    return pairs
@@ -1,8 +1,17 @@
+import os
 import sys
+import time
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
 import mysql.connector
 from database import DatabaseManager
+from api_client import HttpDatabaseManager
+from audit import AuditLog
+from data_store import ClientStore, ContactStore, EmployeeStore
+from reminders import ReminderScheduler
+from change_feed import ChangeFeedSubscriber
+from diagnostics import diagnostics
+from log_config import configure_logging
 from ui.login_window import LoginWindow
 from ui.main_window import MainWindow
 from ui.client_editor import ClientEditor
@@ -39,13 +48,21 @@ class CRMApplication:
             }
         """)
 
-        # Initialize database connection
-        self.db_manager = DatabaseManager(
-            host='localhost',
-            database='crm_db',
-            user='root',
-            password=''  # Set your database password here
-        )
+        # Initialize database connection; with CRM_API_URL set, go through
+        # the API service (api_server.py) instead of connecting directly
+        api_url = os.environ.get('CRM_API_URL')
+        if api_url:
+            self.db_manager = HttpDatabaseManager(api_url)
+        else:
+            self.db_manager = DatabaseManager(
+                host='localhost',
+                database='crm_db',
+                user='root',
+                password=''  # Set your database password here
+            )
+
+        # Time every query for the diagnostics panel
+        diagnostics.instrument(self.db_manager)
 
         # Connect to database
         if not self.db_manager.connect():
@@ -71,23 +88,65 @@ class CRMApplication:
 
     def show_main_window(self, user_data):
         """Show main window after successful login"""
+        # Record who changes what; queued events are flushed on exit. The
+        # API service keeps its own audit log.
+        if isinstance(self.db_manager, DatabaseManager):
+            self.audit_log = AuditLog(self.db_manager)
+            if self.audit_log.start():
+                self.db_manager.audit_log = self.audit_log
+                self.db_manager.audit_user_id = user_data['id']
+                self.app.aboutToQuit.connect(self.audit_log.close)
+
         # Create main window
         self.main_window = MainWindow(self.db_manager, user_data)
 
-        # Create and add components
-        client_editor = ClientEditor(self.db_manager)
-        self.main_window.add_widget('clients', client_editor)
-
-        schedule_manager = ScheduleManager(self.db_manager, user_data)
-        self.main_window.add_widget('contacts', schedule_manager)
-
-        report_viewer = ReportViewer(self.db_manager, user_data)
-        self.main_window.add_widget('reports', report_viewer)
+        # Create the shared data stores every view binds to
+        self.client_store = ClientStore(self.db_manager, self.main_window)
+        self.employee_store = EmployeeStore(self.db_manager, self.main_window)
+        self.contact_store = ContactStore(
+            self.db_manager, user_data, self.main_window
+        )
+        self.contact_store.follow(self.client_store, self.employee_store)
+
+        # Apply other users' changes to the open views as they happen
+        self.change_feed = ChangeFeedSubscriber(self.db_manager, {
+            'clients': self.client_store,
+            'employees': self.employee_store,
+            'contacts': self.contact_store
+        }, signals={
+            # Series are expanded per window by the views that show them
+            'contact_series': self.contact_store.series_changed
+        }, parent=self.main_window)
+        self.change_feed.start()
+
+        # Remind the user of upcoming scheduled contacts
+        self.reminders = ReminderScheduler(
+            self.db_manager, user_data, parent=self.main_window
+        )
+        self.reminders.follow(self.contact_store)
+        self.reminders.reminder_due.connect(self.main_window.show_reminder)
+        self.reminders.load()
+
+        # Create and add components, timing each for the diagnostics panel
+        def add_tab(name, create):
+            started = time.perf_counter()
+            widget = create()
+            diagnostics.record_tab_build(name, time.perf_counter() - started)
+            self.main_window.add_widget(name, widget)
+
+        add_tab('clients', lambda: ClientEditor(self.db_manager, self.client_store))
+        add_tab('contacts', lambda: ScheduleManager(
+            self.db_manager, user_data, self.contact_store, self.client_store
+        ))
+        add_tab('reports', lambda: ReportViewer(
+            self.db_manager, user_data, self.employee_store, self.contact_store
+        ))
 
         # Add employee editor only for managers
         if user_data['role'] == 'manager':
-            employee_editor = EmployeeEditor(self.db_manager)
-            self.main_window.add_widget('employees', employee_editor)
+            add_tab('employees', lambda: EmployeeEditor(
+                self.db_manager, self.employee_store
+            ))
 
         # Center the main window on screen
         screen_geometry = self.app.primaryScreen().geometry()
@@ -99,6 +158,8 @@ class CRMApplication:
 
 def main():
     """Application entry point"""
+    configure_logging('desktop')
+
     # Enable High DPI scaling
     QApplication.setHighDpiScaleFactorRoundingPolicy(
         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
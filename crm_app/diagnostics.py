@@ -0,0 +1,294 @@
+"""Performance diagnostics for support: what is slow on this machine
+
+Collects recent query timings, cache hit rates, connection state, tab
+load times, memory use and an optional cProfile capture, and renders
+them as one plain-text report. The desktop shows the report in a hidden
+panel (Ctrl+Shift+D in the main window) and can save it to a file, so a
+single screenshot or attachment is enough to find the hot path.
+
+Collection is always on and cheap: a query costs two clock reads and a
+deque append. tracemalloc and cProfile only run when asked for.
+"""
+import cProfile
+import functools
+import inspect
+import io
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from api_protocol import EXPOSED, STREAMED
+
+# DatabaseManager methods timed by instrument()
+QUERY_METHODS = [name for name in EXPOSED if '.' not in name] + sorted(STREAMED)
+
+
+class Diagnostics:
+    """Collector behind the diagnostics panel and report file"""
+
+    def __init__(self, recent: int = 200):
+        self._lock = threading.Lock()
+        # (finished at, method, seconds, rows) of the latest queries
+        self.recent_queries = deque(maxlen=recent)
+        # method -> [calls, total seconds, slowest]
+        self.query_totals: Dict[str, List[float]] = {}
+        # name -> object with hits and misses counters
+        self._caches: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+        # tab -> {'build': s, 'switches': n, 'last': s, 'max': s}
+        self.tab_loads: Dict[str, Dict[str, float]] = {}
+        self._managers = weakref.WeakSet()
+        self._main_manager = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self.profile_report = ""
+        self.profile_taken_at: Optional[datetime] = None
+
+    # Queries
+
+    def instrument(self, db_manager):
+        """Time every query method of a manager and of its clones"""
+        if self._main_manager is None:
+            self._main_manager = weakref.ref(db_manager)
+        self._managers.add(db_manager)
+        for name in QUERY_METHODS:
+            method = getattr(db_manager, name, None)
+            if method is not None:
+                setattr(db_manager, name, self._timed(name, method))
+
+        clone = db_manager.clone
+
+        @functools.wraps(clone)
+        def instrumented_clone(*args, **kwargs):
+            return self.instrument(clone(*args, **kwargs))
+
+        db_manager.clone = instrumented_clone
+        return db_manager
+
+    def _timed(self, name: str, method):
+        if name in STREAMED or inspect.isgeneratorfunction(method):
+            @functools.wraps(method)
+            def streamed(*args, **kwargs):
+                # Timed from the call until the stream is exhausted
+                started = time.perf_counter()
+                rows = 0
+                try:
+                    for batch in method(*args, **kwargs):
+                        rows += len(batch)
+                        yield batch
+                finally:
+                    self.record_query(name, time.perf_counter() - started, rows)
+            return streamed
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            result = method(*args, **kwargs)
+            self.record_query(name, time.perf_counter() - started,
+                              len(result) if isinstance(result, list) else None)
+            return result
+        return timed
+
+    def record_query(self, name: str, seconds: float, rows: Optional[int] = None):
+        with self._lock:
+            self.recent_queries.append((datetime.now(), name, seconds, rows))
+            totals = self.query_totals.setdefault(name, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+
+    # Caches and tabs
+
+    def watch_cache(self, name: str, cache):
+        """Report the hits and misses counters of a cache"""
+        self._caches[name] = cache
+
+    def _tab(self, tab: str) -> Dict[str, float]:
+        return self.tab_loads.setdefault(
+            tab, {'build': 0.0, 'switches': 0, 'last': 0.0, 'max': 0.0})
+
+    def record_tab_build(self, tab: str, seconds: float):
+        self._tab(tab)['build'] = seconds
+
+    def record_tab_switch(self, tab: str, seconds: float):
+        loads = self._tab(tab)
+        loads['switches'] += 1
+        loads['last'] = seconds
+        loads['max'] = max(loads['max'], seconds)
+
+    # Memory
+
+    @staticmethod
+    def rss_bytes() -> Optional[int]:
+        """Resident set size now, or the peak where only that is known"""
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError, AttributeError):
+            pass
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    @staticmethod
+    def start_tracing(frames: int = 1):
+        """Start tracking allocations; slows the app while on"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    @staticmethod
+    def stop_tracing():
+        tracemalloc.stop()
+
+    @staticmethod
+    def top_allocators(limit: int = 15) -> List[Tuple[str, int, int]]:
+        """(file:line, bytes, blocks) of the largest live allocation sites"""
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        return [(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 stat.size, stat.count)
+                for stat in snapshot.statistics('lineno')[:limit]]
+
+    # Profiling
+
+    def profile_start(self):
+        """Profile the calling thread until profile_stop()"""
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def profile_stop(self, limit: int = 30) -> str:
+        """Stop profiling and keep the top functions by cumulative time"""
+        if self._profiler is None:
+            return self.profile_report
+        self._profiler.disable()
+        out = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=out)
+        stats.strip_dirs().sort_stats('cumulative').print_stats(limit)
+        self._profiler = None
+        self.profile_report = out.getvalue().strip()
+        self.profile_taken_at = datetime.now()
+        return self.profile_report
+
+    @property
+    def profiling(self) -> bool:
+        return self._profiler is not None
+
+    # Report
+
+    def _connections(self) -> Dict[str, Any]:
+        manager = self._main_manager() if self._main_manager else None
+        state: Dict[str, Any] = {
+            'backend': type(manager).__name__ if manager else None,
+            'managers': len(self._managers),
+        }
+        if manager is None:
+            return state
+        connection = getattr(manager, 'connection', None)
+        if connection is not None:
+            state['connection_id'] = getattr(connection, 'connection_id', None)
+            state['connected'] = connection.is_connected()
+        elif hasattr(manager, 'url'):
+            state['url'] = manager.url
+            state['keep_alive'] = getattr(manager, '_http', None) is not None
+        audit_log = getattr(manager, 'audit_log', None)
+        if audit_log is not None:
+            state['audit_queue'] = audit_log.pending
+            state['audit_dropped'] = audit_log.dropped
+        return state
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything the report shows, as plain data"""
+        with self._lock:
+            recent = list(self.recent_queries)
+            totals = {name: list(values) for name, values in self.query_totals.items()}
+        caches = {}
+        for name, cache in list(self._caches.items()):
+            lookups = cache.hits + cache.misses
+            caches[name] = {'hits': cache.hits, 'misses': cache.misses,
+                            'hit_rate': cache.hits / lookups if lookups else None}
+        return {
+            'taken_at': datetime.now(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'recent_queries': recent,
+            'query_totals': totals,
+            'caches': caches,
+            'connections': self._connections(),
+            'tab_loads': {tab: dict(loads) for tab, loads in self.tab_loads.items()},
+            'rss_bytes': self.rss_bytes(),
+            'tracing': tracemalloc.is_tracing(),
+            'top_allocators': self.top_allocators(),
+            'profile_taken_at': self.profile_taken_at,
+            'profile': self.profile_report,
+        }
+
+    def report(self, recent: int = 25) -> str:
+        """The snapshot as text, slowest and most recent first"""
+        snap = self.snapshot()
+        lines = [f"CRM diagnostics {snap['taken_at']:%Y-%m-%d %H:%M:%S}  "
+                 f"Python {snap['python']}  {snap['platform']}"]
+        rss = snap['rss_bytes']
+        lines.append(f"RSS: {rss / 1048576:.1f} MB" if rss else "RSS: n/a")
+
+        lines += ["", "Queries (by total time)",
+                  f"  {'method':<26}{'calls':>7}{'total ms':>11}{'avg ms':>9}{'max ms':>9}"]
+        for name, (calls, total, slowest) in sorted(
+                snap['query_totals'].items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {name:<26}{calls:>7}{total * 1000:>11.1f}"
+                         f"{total / calls * 1000:>9.1f}{slowest * 1000:>9.1f}")
+
+        lines += ["", f"Recent queries (last {recent})"]
+        for finished, name, seconds, rows in reversed(snap['recent_queries'][-recent:]):
+            count = "" if rows is None else f"  {rows} rows"
+            lines.append(f"  {finished:%H:%M:%S}  {name:<26}{seconds * 1000:>9.1f} ms{count}")
+
+        lines += ["", "Caches"]
+        for name, cache in sorted(snap['caches'].items()):
+            rate = ("n/a" if cache['hit_rate'] is None
+                    else f"{cache['hit_rate']:.0%}")
+            lines.append(f"  {name:<26}{rate:>6} hit  "
+                         f"({cache['hits']} hits, {cache['misses']} misses)")
+
+        lines += ["", "Connections"]
+        for name, value in snap['connections'].items():
+            lines.append(f"  {name:<26}{value}")
+
+        lines += ["", "Tabs (ms)",
+                  f"  {'tab':<26}{'build':>9}{'switches':>10}{'last':>9}{'max':>9}"]
+        for tab, loads in snap['tab_loads'].items():
+            lines.append(f"  {tab:<26}{loads['build'] * 1000:>9.1f}{loads['switches']:>10}"
+                         f"{loads['last'] * 1000:>9.1f}{loads['max'] * 1000:>9.1f}")
+
+        lines += ["", "Top allocators" if snap['tracing']
+                  else "Top allocators (memory tracing is off)"]
+        for location, size, blocks in snap['top_allocators']:
+            lines.append(f"  {size / 1024:>10.1f} KB {blocks:>8} blocks  {location}")
+
+        if snap['profile']:
+            lines += ["", f"Profile of action at {snap['profile_taken_at']:%H:%M:%S}",
+                      snap['profile']]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> str:
+        """Write the report to a file; returns the path"""
+        with open(path, 'w', encoding='utf-8') as out:
+            out.write(self.report(recent=self.recent_queries.maxlen))
+        return path
+
+
+# The application's collector
+diagnostics = Diagnostics()
@@ -0,0 +1,208 @@
+"""Non-blocking logging shared by the desktop, the CLI and the API service
+
+Loggers only enqueue records; a QueueListener thread formats them and
+writes them out, so a log call on the GUI thread or in a query costs an
+enqueue and never waits on disk or the console. Output is:
+
+- a size-rotated log file of JSON records, one per line
+- plain text on stderr (optional)
+
+Repeated warnings and errors from the same line of code are rate
+limited, with a count of what was suppressed once the window passes.
+
+Settings come from a JSON file named by CRM_LOG_CONFIG, falling back
+to DEFAULTS, for example:
+
+    {"file": "/var/log/crm/{program}.log", "level": "INFO",
+     "levels": {"database": "WARNING", "api_server": "DEBUG"}}
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+DEFAULTS = {
+    # Log file, one per program so processes never rotate each other's
+    # files; None for console only
+    'file': os.path.join(os.path.expanduser('~'), '.crm', 'logs', '{program}.log'),
+    'max_bytes': 5 * 1024 * 1024,
+    'backups': 5,
+    'console': True,
+    # Root level, and levels per logger (module) name
+    'level': 'INFO',
+    'levels': {},
+    # At most `burst` records per call site in `window` seconds
+    'rate_limit': {'burst': 5, 'window': 60},
+    # Records queued beyond this are dropped rather than blocking
+    'max_queue': 10000,
+}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, for log shippers and grep alike"""
+
+    def __init__(self, program: str = ""):
+        super().__init__()
+        self.program = program
+
+    def format(self, record: logging.LogRecord) -> str:
+        created = datetime.fromtimestamp(record.created, timezone.utc)
+        entry = {
+            'time': created.isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'program': self.program,
+            'process': record.process,
+            'thread': record.threadName,
+            'where': f"{record.module}:{record.lineno}",
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        suppressed = getattr(record, 'suppressed', None)
+        if suppressed:
+            entry['suppressed'] = suppressed
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most `burst` warnings or errors per call site a window
+
+    Records are keyed by logger and line rather than message, since
+    messages embed ids and error text. The first record after a window in
+    which some were dropped carries the dropped count as `suppressed`.
+    """
+
+    def __init__(self, burst: int = 5, window: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        # (logger, path, line) -> [window start, passed, suppressed]
+        self._sites: Dict[tuple, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Every handler asks; only count each record once
+        decided = getattr(record, 'rate_limited', None)
+        if decided is None:
+            decided = record.rate_limited = not self._allow(record)
+        return not decided
+
+    def _allow(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        site = self._sites.get(key)
+        if site is None or now - site[0] > self.window:
+            suppressed = site[2] if site else 0
+            self._sites[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+                record.msg = f"{record.msg} (and {suppressed} more suppressed)"
+            return True
+        if site[1] < self.burst:
+            site[1] += 1
+            return True
+        site[2] += 1
+        return False
+
+
+class _EnqueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers formatting to the listener thread
+
+    The stock prepare() formats every record on the calling thread. The
+    queue is in-process, so the record can travel as is; only the message
+    is merged with its args, in case they change before the write.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Never block the caller; the backlog is already being written
+            pass
+
+
+def load_config(path: Optional[str] = None) -> Dict[str, Any]:
+    """DEFAULTS overridden by the JSON file at path or CRM_LOG_CONFIG"""
+    config = dict(DEFAULTS)
+    path = path or os.environ.get('CRM_LOG_CONFIG')
+    if path:
+        with open(path, encoding='utf-8') as config_file:
+            config.update(json.load(config_file))
+    return config
+
+
+def configure_logging(program: str, config: Optional[Dict[str, Any]] = None):
+    """Route all logging through a queue to the configured outputs
+
+    Safe to call more than once; the last call wins. The listener is
+    stopped, and the queue flushed, at exit.
+    """
+    global _listener
+    config = config if config is not None else load_config()
+    shutdown_logging()
+
+    handlers = []
+    limit = RateLimitFilter(**config['rate_limit'])
+    path = config.get('file') and config['file'].format(program=program)
+    if path:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=config['max_bytes'],
+                backupCount=config['backups'], encoding='utf-8'
+            )
+            file_handler.setFormatter(JsonFormatter(program))
+            handlers.append(file_handler)
+        except OSError as e:
+            print(f"Cannot write log file {path}: {e}", file=sys.stderr)
+    if config.get('console') or not handlers:
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        ))
+        handlers.append(console)
+    for handler in handlers:
+        handler.addFilter(limit)
+
+    log_queue = queue.Queue(config['max_queue'])
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_EnqueueHandler(log_queue))
+    root.setLevel(config['level'])
+    for name, level in config['levels'].items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Write out queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,192 @@
+import heapq
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+
+class ReminderScheduler(QObject):
+    """Fire a reminder shortly before each of the user's scheduled contacts
+
+    Pending reminders sit in a min-heap keyed on their due time and a single
+    single-shot timer is armed for the earliest one, so nothing runs between
+    reminders however many contacts are pending. Contact writes adjust the
+    heap incrementally; superseded heap entries are skipped lazily.
+
+    Recurring series have no end, so their occurrences are queued for the
+    next OCCURRENCE_HORIZON only, topped up every EXPAND_INTERVAL and
+    whenever a series is created or ended.
+    """
+
+    # Emitted with the contact row when its reminder is due
+    reminder_due = Signal(object)
+
+    # QTimer intervals are 32-bit milliseconds; far-off reminders re-arm
+    MAX_WAIT = timedelta(hours=24)
+    # Longer than the interval, so no occurrence falls between top-ups
+    OCCURRENCE_HORIZON = timedelta(days=2)
+    EXPAND_INTERVAL = timedelta(hours=12)
+
+    def __init__(self, db_manager, user_data, lead_time=timedelta(minutes=10),
+                 parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.user_data = user_data
+        self.lead_time = lead_time
+        self.contact_store = None
+        self._heap: List[Tuple[datetime, int, int]] = []  # (due, seq, contact id)
+        self._pending: Dict[int, Tuple[int, Dict[str, Any]]] = {}  # id -> (seq, row)
+        self._seq = 0
+        self._fired = set()  # (contact id, date/time) already reminded
+        # (series id, occurrence_at) -> id of the pending occurrence
+        self._occurrences: Dict[Tuple[int, datetime], int] = {}
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._fire_due)
+        self.expand_timer = QTimer(self)
+        self.expand_timer.setInterval(
+            int(self.EXPAND_INTERVAL.total_seconds() * 1000)
+        )
+        self.expand_timer.timeout.connect(self.expand_occurrences)
+
+    def load(self):
+        """Queue reminders for every upcoming scheduled contact of the user"""
+        contacts = self.db_manager.get_employee_contacts(
+            self.user_data['id'],
+            False,
+            datetime.now(),
+            None,
+            'Scheduled',
+            # Notes are fetched when a reminder is shown
+            columns=['employee_id', 'contact_datetime', 'contact_method',
+                     'status', 'client_name']
+        )
+        self._pending = {}
+        self._occurrences = {}
+        self._heap = [self._entry(contact) for contact in contacts]
+        heapq.heapify(self._heap)
+        self.expand_occurrences()
+        self.expand_timer.start()
+
+    @Slot()
+    def expand_occurrences(self):
+        """Queue the occurrences of the user's series due in the horizon"""
+        for contact_id in self._occurrences.values():
+            self._pending.pop(contact_id, None)
+        self._occurrences = {}
+        now = datetime.now()
+        contacts = self.db_manager.get_employee_contacts(
+            self.user_data['id'],
+            False,
+            now,
+            now + self.OCCURRENCE_HORIZON,
+            'Scheduled',
+            columns=['employee_id', 'contact_datetime', 'contact_method',
+                     'status', 'series_id', 'occurrence_at', 'client_name'],
+            occurrences=True
+        )
+        for contact in contacts:
+            # Stored contacts are already queued by load() and the store
+            if contact['id'] < 0 and self._wants_reminder(contact):
+                heapq.heappush(self._heap, self._entry(contact))
+                self._occurrences[(contact['series_id'],
+                                   contact['occurrence_at'])] = contact['id']
+        self._compact()
+        self._arm()
+
+    def follow(self, contact_store):
+        """Track contacts created, rescheduled or cancelled through the store"""
+        self.contact_store = contact_store
+        contact_store.row_inserted.connect(self._contact_changed)
+        contact_store.row_updated.connect(self._contact_changed)
+        contact_store.row_removed.connect(self._contact_removed)
+        contact_store.series_changed.connect(self.expand_occurrences)
+
+    def schedule(self, contact: Dict[str, Any]):
+        """Add, move or drop the reminder for one contact"""
+        self._pending.pop(contact['id'], None)
+        if contact.get('series_id') is not None:
+            # A stored occurrence replaces the one expanded from its series
+            occurrence_id = self._occurrences.pop(
+                (contact['series_id'], contact.get('occurrence_at')), None
+            )
+            if occurrence_id is not None:
+                self._pending.pop(occurrence_id, None)
+        if self._wants_reminder(contact):
+            heapq.heappush(self._heap, self._entry(contact))
+        self._compact()
+        self._arm()
+
+    def cancel(self, contact_id: int):
+        """Drop the reminder for one contact"""
+        if self._pending.pop(contact_id, None) is not None:
+            self._compact()
+            self._arm()
+
+    def next_due(self) -> Optional[datetime]:
+        """When the next reminder fires, if any"""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _wants_reminder(self, contact):
+        return (contact['employee_id'] == self.user_data['id']
+                and contact.get('status', 'Scheduled') == 'Scheduled'
+                and contact['contact_datetime'] > datetime.now()
+                and (contact['id'], contact['contact_datetime']) not in self._fired)
+
+    def _entry(self, contact):
+        """Record a contact as pending and return its heap entry"""
+        self._seq += 1
+        self._pending[contact['id']] = (self._seq, contact)
+        return (contact['contact_datetime'] - self.lead_time, self._seq,
+                contact['id'])
+
+    def _is_live(self, entry):
+        pending = self._pending.get(entry[2])
+        return pending is not None and pending[0] == entry[1]
+
+    def _drop_stale(self):
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def _compact(self):
+        # Superseded entries are normally skipped when they reach the top;
+        # rebuild once they outnumber the live ones to keep memory bounded
+        if len(self._heap) > 2 * len(self._pending) + 64:
+            self._heap = [e for e in self._heap if self._is_live(e)]
+            heapq.heapify(self._heap)
+
+    def _arm(self):
+        self._drop_stale()
+        if not self._heap:
+            self.timer.stop()
+            return
+        wait = self._heap[0][0] - datetime.now()
+        wait = max(timedelta(0), min(wait, self.MAX_WAIT))
+        self.timer.start(int(wait.total_seconds() * 1000))
+
+    @Slot()
+    def _fire_due(self):
+        now = datetime.now()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_live(entry):
+                continue
+            _, contact = self._pending.pop(entry[2])
+            self._fired.add((contact['id'], contact['contact_datetime']))
+            self.reminder_due.emit(contact)
+        self._arm()
+
+    @Slot(int, object)
+    def _contact_changed(self, position, contact):
+        self.schedule(contact)
+
+    @Slot(int, int)
+    def _contact_removed(self, position, contact_id):
+        # A contact that only moved position is still in the store
+        if self.contact_store.get(contact_id) is None:
+            self.cancel(contact_id)
@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# What the report table, its summary and ReportStore read; no notes
+REPORT_COLUMNS = ['client_id', 'employee_id', 'contact_datetime',
+                  'contact_method', 'conversion_rating', 'status', 'updated_at',
+                  'client_name', 'client_type', 'employee_name']
+
+
+class ReportCache:
+    """Memoized report rows keyed by filter set, stored per day
+
+    Each filter set (status, employee, scope) keeps the days it has fetched
+    and their rows. A request for a date range only queries the days that
+    are missing or expired, in as few contiguous range queries as
+    possible, so widening "This Week" to "This Month" fetches just the
+    extra days. Writes invalidate the days they touch. Recurring series
+    are expanded into the fetched days, so only the window is ever
+    materialized.
+    """
+
+    def __init__(self, db_manager, ttl: float = 300.0, max_filter_sets: int = 16):
+        self.db_manager = db_manager
+        self.ttl = ttl
+        self.max_filter_sets = max_filter_sets
+        # filter key -> {day: (fetched at, rows)}
+        self._entries: "OrderedDict[tuple, Dict[date, Tuple[float, List[Dict[str, Any]]]]]" = OrderedDict()
+        # contact id -> day it is cached under
+        self._contact_days: Dict[int, date] = {}
+        self.hits = 0
+        self.misses = 0
+        # Loads run on a worker thread while writes invalidate on the GUI
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a fetch that overlapped one may
+        # predate the write, so its rows are returned but not kept
+        self._generation = 0
+
+    def get(self, start_date: date, end_date: date, status: Optional[str],
+            employee_id: int, all_employees: bool, db_manager=None,
+            token=None) -> Optional[List[Dict[str, Any]]]:
+        """Rows between two dates (both inclusive) matching the filters
+
+        A worker thread passes its own db_manager; the database is queried
+        outside the cache lock, so the GUI thread can keep invalidating.
+        Returns None, caching nothing, if the token interrupts a fetch. Days
+        whose query fails come back empty and are not cached, so the next
+        request retries them.
+        """
+        db_manager = db_manager or self.db_manager
+        key = (status, employee_id, all_employees)
+        now = time.monotonic()
+        wanted = [start_date + timedelta(days=n)
+                  for n in range((end_date - start_date).days + 1)]
+        with self._lock:
+            days = self._entries.get(key)
+            if days is None:
+                days = self._entries[key] = {}
+                if len(self._entries) > self.max_filter_sets:
+                    self._evict_oldest()
+            self._entries.move_to_end(key)
+
+            missing = [day for day in wanted
+                       if day not in days or now - days[day][0] > self.ttl]
+
+            # An unfiltered set that is already cached can answer a
+            # status-filtered request without a query
+            if missing and status is not None \
+                    and self._fill_from_all(key, missing, now):
+                missing = []
+            if missing:
+                self.misses += 1
+            else:
+                self.hits += 1
+            # Copies, so a concurrent invalidation cannot lose rows
+            found = {day: days[day][1] for day in wanted if day in days}
+            generation = self._generation
+
+        with db_manager.running(token) as allowed:
+            if not allowed:
+                return None
+            for first, last in self._runs(missing):
+                fetched = self._fetch(db_manager, key, first, last)
+                if token is not None and token.interrupted:
+                    return None
+                keep = fetched is not None
+                with self._lock:
+                    found.update(self._store(
+                        key, first, last, fetched or [], now,
+                        keep=keep and generation == self._generation
+                    ))
+
+        rows = []
+        for day in wanted:
+            rows.extend(found.get(day, []))
+        return rows
+
+    def invalidate_day(self, day: date):
+        """Forget every cached filter set's rows for one day"""
+        with self._lock:
+            self._generation += 1
+            for days in self._entries.values():
+                days.pop(day, None)
+
+    def invalidate_contact(self, contact_id: int,
+                           when: Optional[datetime] = None):
+        """Forget the days a written contact was and now is on"""
+        with self._lock:
+            old_day = self._contact_days.pop(contact_id, None)
+        if old_day is not None:
+            self.invalidate_day(old_day)
+        if when is not None:
+            self.invalidate_day(when.date())
+
+    def clear(self):
+        """Forget everything"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._contact_days.clear()
+
+    @staticmethod
+    def _runs(days: List[date]):
+        """Group sorted days into (first, last) runs of consecutive days"""
+        runs = []
+        for day in days:
+            if runs and runs[-1][1] + timedelta(days=1) == day:
+                runs[-1][1] = day
+            else:
+                runs.append([day, day])
+        return runs
+
+    @staticmethod
+    def _fetch(db_manager, key, first: date,
+               last: date) -> Optional[List[Dict[str, Any]]]:
+        """The rows of a run of days, or None if the query failed"""
+        status, employee_id, all_employees = key
+        return db_manager.get_employee_contacts(
+            employee_id,
+            all_employees,
+            datetime.combine(first, datetime.min.time()),
+            datetime.combine(last + timedelta(days=1), datetime.min.time()),
+            status,
+            columns=REPORT_COLUMNS,
+            occurrences=True,
+            strict=True
+        )
+
+    def _fill_from_all(self, key, missing: List[date], now: float) -> bool:
+        all_key = (None,) + key[1:]
+        all_days = self._entries.get(all_key)
+        if not all_days or any(day not in all_days
+                               or now - all_days[day][0] > self.ttl
+                               for day in missing):
+            return False
+        days = self._entries[key]
+        for day in missing:
+            fetched_at, rows = all_days[day]
+            days[day] = (fetched_at, [r for r in rows if r['status'] == key[0]])
+        return True
+
+    def _store(self, key, first: date, last: date, contacts, now: float,
+               keep: bool = True) -> Dict[date, List[Dict[str, Any]]]:
+        """Split fetched rows per day, caching them if keep"""
+        by_day = {}
+        for contact in contacts:
+            by_day.setdefault(contact['contact_datetime'].date(), []).append(contact)
+        stored = {}
+        day = first
+        while day <= last:
+            stored[day] = by_day.get(day, [])
+            day += timedelta(days=1)
+        if keep:
+            # The filter set may have been evicted while the query ran
+            days = self._entries.setdefault(key, {})
+            for day, rows in stored.items():
+                days[day] = (now, rows)
+                for contact in rows:
+                    self._contact_days[contact['id']] = day
+        return stored
+
+    def _evict_oldest(self):
+        self._entries.popitem(last=False)
+        self._contact_days = {
+            row['id']: day
+            for days in self._entries.values()
+            for day, (_, rows) in days.items()
+            for row in rows
+        }
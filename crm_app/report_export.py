@@ -0,0 +1,107 @@
+import csv
+import gzip
+import logging
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('csv', 'csv.gz', 'xlsx')
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled part-way through"""
+
+
+def format_for_path(path: str) -> str:
+    """Guess the export format from a file name"""
+    lower = path.lower()
+    if lower.endswith('.xlsx'):
+        return 'xlsx'
+    if lower.endswith('.gz'):
+        return 'csv.gz'
+    return 'csv'
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M")
+    return "" if value is None else value
+
+
+def export_rows(batches: Iterable[List[tuple]], path: str, header: List[str],
+                fmt: Optional[str] = None,
+                progress: Optional[Callable[[int], None]] = None,
+                cancelled: Optional[Callable[[], bool]] = None) -> int:
+    """Write batches of rows to a CSV, gzipped CSV or XLSX file
+
+    Rows are written as they arrive, so memory use depends on the batch
+    size only. progress is called with the running row count after each
+    batch; when cancelled() turns true the export stops with
+    ExportCancelled and the partial file is left for the caller to remove.
+    Returns the number of rows written.
+    """
+    fmt = fmt or format_for_path(path)
+    if fmt == 'xlsx':
+        return _export_xlsx(batches, path, header, progress, cancelled)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    opener = gzip.open if fmt == 'csv.gz' else open
+    written = 0
+    with opener(path, 'wt', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        for batch in batches:
+            if cancelled and cancelled():
+                raise ExportCancelled()
+            writer.writerows([_csv_value(v) for v in row] for row in batch)
+            written += len(batch)
+            if progress:
+                progress(written)
+    return written
+
+
+def _export_xlsx(batches, path, header, progress, cancelled):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError(
+            "XLSX export requires openpyxl (pip install openpyxl)"
+        )
+
+    # Write-only workbooks stream rows to disk instead of keeping cells
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Report")
+    sheet.append(header)
+    written = 0
+    for batch in batches:
+        if cancelled and cancelled():
+            raise ExportCancelled()
+        for row in batch:
+            sheet.append(list(row))
+        written += len(batch)
+        if progress:
+            progress(written)
+    workbook.save(path)
+    return written
+
+
+def export_report(db_manager, path: str, start_date, end_date,
+                  status: Optional[str] = None,
+                  employee_id: Optional[int] = None,
+                  fmt: Optional[str] = None, batch_size: int = 1000,
+                  progress: Optional[Callable[[int], None]] = None,
+                  cancelled: Optional[Callable[[], bool]] = None) -> int:
+    """Stream a filtered contact report straight from the database to a file"""
+    batches = db_manager.iter_report_contacts(
+        start_date, end_date, status, employee_id, batch_size
+    )
+    try:
+        written = export_rows(
+            batches, path, db_manager.REPORT_COLUMNS, fmt, progress, cancelled
+        )
+    finally:
+        batches.close()
+    logger.info(f"Exported {written} report rows to {path}")
+    return written
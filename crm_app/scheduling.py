@@ -0,0 +1,206 @@
+from bisect import bisect_left, insort
+from calendar import monthrange
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_DURATION = 30
+# Longest contact the schedule allows, in minutes; bounds how far back an
+# overlapping contact can start, for the index and the database check
+MAX_DURATION = 480
+
+# Contacts in these states do not take up time
+FREE_STATUSES = {'Cancelled'}
+
+# contact_series.frequency values
+FREQUENCIES = ('weekly', 'monthly')
+# Occurrences per series that get distinct ids; see occurrence_id()
+SERIES_SLOTS = 10000
+
+
+def contact_interval(contact: Dict[str, Any]) -> Tuple[datetime, datetime]:
+    """[start, end) of a contact"""
+    start = contact['contact_datetime']
+    minutes = contact.get('duration_minutes') or DEFAULT_DURATION
+    return start, start + timedelta(minutes=minutes)
+
+
+class ScheduleIndex:
+    """Per-employee index of booked intervals for overlap checks
+
+    Each employee's contacts are kept as a list sorted by start. No
+    contact lasts longer than MAX_DURATION, so anything overlapping
+    [start, end) starts in [start - MAX_DURATION, end): two bisections
+    and a short scan, which stays well under a millisecond with
+    thousands of contacts per employee.
+    """
+
+    def __init__(self):
+        # employee id -> sorted [(start, end, contact id)]
+        self._intervals: Dict[int, List[Tuple[datetime, datetime, int]]] = {}
+        # contact id -> (employee id, entry)
+        self._entries: Dict[int, Tuple[int, Tuple[datetime, datetime, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, contact: Dict[str, Any]):
+        """Index a contact, replacing any earlier version of it"""
+        self.remove(contact['id'])
+        if contact.get('status') in FREE_STATUSES:
+            return
+        start, end = contact_interval(contact)
+        entry = (start, end, contact['id'])
+        insort(self._intervals.setdefault(contact['employee_id'], []), entry)
+        self._entries[contact['id']] = (contact['employee_id'], entry)
+
+    def remove(self, contact_id: int):
+        indexed = self._entries.pop(contact_id, None)
+        if indexed is None:
+            return
+        employee_id, entry = indexed
+        intervals = self._intervals[employee_id]
+        del intervals[bisect_left(intervals, entry)]
+
+    def conflicts(self, employee_id: int, start: datetime, end: datetime,
+                  exclude_id: Optional[int] = None) -> List[int]:
+        """Ids of the employee's contacts overlapping [start, end), by start"""
+        intervals = self._intervals.get(employee_id)
+        if not intervals:
+            return []
+        first = bisect_left(intervals, (start - timedelta(minutes=MAX_DURATION),))
+        last = bisect_left(intervals, (end,), first)
+        return [contact_id for booked_start, booked_end, contact_id
+                in intervals[first:last]
+                if booked_end > start and contact_id != exclude_id]
+
+    def next_free_slot(self, employee_id: int, start: datetime, minutes: int,
+                       exclude_id: Optional[int] = None,
+                       day_start: time = time(8), day_end: time = time(18),
+                       workdays: Iterable[int] = range(5),
+                       horizon_days: int = 90) -> Optional[datetime]:
+        """Earliest start from start on when the employee is free for minutes
+
+        Slots stay within working hours on workdays (Monday is 0). Returns
+        None if nothing is free within horizon_days.
+        """
+        workdays = set(workdays)
+        length = timedelta(minutes=minutes)
+        candidate = start
+        limit = start + timedelta(days=horizon_days)
+        while candidate < limit:
+            opens = datetime.combine(candidate.date(), day_start)
+            closes = datetime.combine(candidate.date(), day_end)
+            if candidate.weekday() not in workdays or candidate + length > closes:
+                candidate = datetime.combine(candidate.date() + timedelta(days=1),
+                                             day_start)
+                continue
+            if candidate < opens:
+                candidate = opens
+                continue
+            blocking = self.conflicts(employee_id, candidate, candidate + length,
+                                      exclude_id)
+            if not blocking:
+                return candidate
+            # Jump past the latest-ending contact in the way
+            candidate = max(self._entries[contact_id][1][1]
+                            for contact_id in blocking)
+        return None
+
+    def rebuild(self, contacts: Iterable[Dict[str, Any]]):
+        """Index many contacts at once, sorting each employee's list once"""
+        self._intervals = {}
+        self._entries = {}
+        for contact in contacts:
+            if contact.get('status') in FREE_STATUSES:
+                continue
+            start, end = contact_interval(contact)
+            entry = (start, end, contact['id'])
+            self._intervals.setdefault(contact['employee_id'], []).append(entry)
+            self._entries[contact['id']] = (contact['employee_id'], entry)
+        for intervals in self._intervals.values():
+            intervals.sort()
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    """moment moved by whole months, on the same day or the month's last"""
+    year, month = divmod(moment.month - 1 + months, 12)
+    year += moment.year
+    day = min(moment.day, monthrange(year, month + 1)[1])
+    return moment.replace(year=year, month=month + 1, day=day)
+
+
+def occurrence_times(series: Dict[str, Any], start: datetime,
+                     end: datetime) -> Iterator[Tuple[int, datetime]]:
+    """(index, date/time) of a series' occurrences in [start, end)
+
+    Index 0 is first_datetime. The first index in the window is computed
+    rather than stepped to, so the cost is the number of occurrences in
+    the window however long the series has been running.
+    """
+    first = series['first_datetime']
+    every = series.get('every') or 1
+    last_day = series.get('ends_on')
+    weekly = series['frequency'] == 'weekly'
+    period = timedelta(weeks=every)
+    if weekly:
+        index = max(0, -((first - start) // period))
+    else:
+        months = (start.year - first.year) * 12 + start.month - first.month
+        # One period early: a short month can pull an occurrence back
+        index = max(0, months // every - 1)
+    while index < SERIES_SLOTS:
+        when = (first + index * period if weekly
+                else add_months(first, index * every))
+        if when >= end or (last_day is not None and when.date() > last_day):
+            return
+        if when >= start:
+            yield index, when
+        index += 1
+
+
+def occurrence_id(series_id: int, index: int) -> int:
+    """Row id of an occurrence not stored as a contact
+
+    Negative, so it never clashes with a contact id, stable across
+    queries, and within the 32-bit ints Qt signals carry for the first
+    214,748 series.
+    """
+    return -(series_id * SERIES_SLOTS + index)
+
+
+def expand_series(series_list: Iterable[Dict[str, Any]],
+                  overridden: Set[Tuple[int, datetime]],
+                  start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """Contact rows for the series occurrences in [start, end), by date/time
+
+    overridden holds (series id, occurrence_at) of the occurrences that
+    have a contact row of their own, which are skipped. The rows carry
+    series_id and occurrence_at, so saving one stores it as an override.
+    """
+    rows = []
+    for series in series_list:
+        notes = series.get('notes')
+        for index, when in occurrence_times(series, start, end):
+            if (series['id'], when) in overridden:
+                continue
+            rows.append({
+                'id': occurrence_id(series['id'], index),
+                'client_id': series['client_id'],
+                'employee_id': series['employee_id'],
+                'contact_datetime': when,
+                'duration_minutes': series['duration_minutes'],
+                'contact_method': series['contact_method'],
+                'conversion_rating': None,
+                'notes': notes,
+                'notes_preview': (notes or "")[:100] or None,
+                'status': 'Scheduled',
+                'series_id': series['id'],
+                'occurrence_at': when,
+                'created_at': series.get('created_at'),
+                'updated_at': series.get('updated_at'),
+                'client_name': series.get('client_name'),
+                'client_type': series.get('client_type'),
+                'employee_name': series.get('employee_name'),
+            })
+    rows.sort(key=lambda row: row['contact_datetime'])
+    return rows
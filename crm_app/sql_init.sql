@@ -1,5 +1,11 @@
 -- Drop tables if they exist (for development purposes)
+DROP TABLE IF EXISTS import_checkpoints;
+DROP TABLE IF EXISTS audit_log;
+DROP TABLE IF EXISTS change_feed;
+DROP TABLE IF EXISTS client_contact_summary;
+DROP TABLE IF EXISTS contacts_archive;
 DROP TABLE IF EXISTS contacts;
+DROP TABLE IF EXISTS contact_series;
 DROP TABLE IF EXISTS clients;
 DROP TABLE IF EXISTS employees;
 DROP TABLE IF EXISTS state_codes;
@@ -17,5 +23,154 @@ CREATE TABLE employees (
     login_id VARCHAR(50) NOT NULL UNIQUE,
     password_hash VARCHAR(255) NOT NULL,
     role ENUM('employee', 'manager') NOT NULL,
+    -- State whose clients automatic assignment prefers to give this employee
+    territory VARCHAR(2),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (territory) REFERENCES state_codes(code)
+);
+
+-- Create clients table
+CREATE TABLE clients (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    email VARCHAR(100),
+    phone VARCHAR(20),
+    address TEXT,
+    state_code VARCHAR(2),
+    client_type ENUM('client', 'potential') NOT NULL,
+    -- Set when a potential client is turned into a client
+    converted_at DATETIME NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (state_code) REFERENCES state_codes(code),
+    INDEX idx_clients_name (name)
+);
+
+-- Recurring contacts: the rule is stored once and its occurrences are
+-- computed for the window being viewed. An occurrence only gets a row in
+-- contacts once it differs from the rule (completed, cancelled, moved).
+CREATE TABLE contact_series (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    client_id INT NOT NULL,
+    employee_id INT NOT NULL,
+    first_datetime DATETIME NOT NULL,
+    duration_minutes SMALLINT NOT NULL DEFAULT 30,
+    contact_method ENUM('phone', 'email', 'in-person', 'other') NOT NULL,
+    notes TEXT,
+    frequency ENUM('weekly', 'monthly') NOT NULL,
+    -- Every n weeks or months
+    every TINYINT NOT NULL DEFAULT 1,
+    -- Last day with an occurrence; NULL repeats indefinitely
+    ends_on DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (client_id) REFERENCES clients(id) ON DELETE CASCADE,
+    FOREIGN KEY (employee_id) REFERENCES employees(id),
+    INDEX idx_series_employee (employee_id, first_datetime)
+);
+
+-- Create contacts table
+CREATE TABLE contacts (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    client_id INT NOT NULL,
+    employee_id INT NOT NULL,
+    contact_datetime DATETIME NOT NULL,
+    -- Booked length; overlaps per employee are checked against it
+    duration_minutes SMALLINT NOT NULL DEFAULT 30,
+    contact_method ENUM('phone', 'email', 'in-person', 'other') NOT NULL,
+    conversion_rating TINYINT,
+    notes TEXT,
+    status ENUM('Scheduled', 'Completed', 'Cancelled') NOT NULL DEFAULT 'Scheduled',
+    -- Set on a series occurrence stored as an override: its series, and
+    -- the date/time the rule gave it before any rescheduling
+    series_id INT,
+    occurrence_at DATETIME,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (client_id) REFERENCES clients(id) ON DELETE CASCADE,
+    FOREIGN KEY (employee_id) REFERENCES employees(id),
+    FOREIGN KEY (series_id) REFERENCES contact_series(id) ON DELETE SET NULL,
+    UNIQUE KEY uq_contacts_occurrence (series_id, occurrence_at),
+    -- Time-window queries: per employee, and across all employees for managers
+    INDEX idx_contacts_employee_time (employee_id, contact_datetime),
+    INDEX idx_contacts_time (contact_datetime),
+    -- Notes search (DatabaseManager.search_contact_notes)
+    FULLTEXT INDEX ft_contacts_notes (notes)
+);
+
+-- Cold tier for old completed/cancelled contacts, filled by
+-- DatabaseManager.archive_contacts(). Same columns and ids as contacts,
+-- but no foreign keys, so the hot table stays small while history grows.
+CREATE TABLE contacts_archive (
+    id INT PRIMARY KEY,
+    client_id INT NOT NULL,
+    employee_id INT NOT NULL,
+    contact_datetime DATETIME NOT NULL,
+    duration_minutes SMALLINT NOT NULL DEFAULT 30,
+    contact_method ENUM('phone', 'email', 'in-person', 'other') NOT NULL,
+    conversion_rating TINYINT,
+    notes TEXT,
+    status ENUM('Scheduled', 'Completed', 'Cancelled') NOT NULL,
+    series_id INT,
+    occurrence_at DATETIME,
+    created_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NULL,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_archive_employee_time (employee_id, contact_datetime),
+    INDEX idx_archive_occurrence (series_id, occurrence_at),
+    INDEX idx_archive_time (contact_datetime),
+    INDEX idx_archive_client (client_id),
+    FULLTEXT INDEX ft_archive_notes (notes)
+);
+
+-- Precomputed per-client contact summary used by the analytics module;
+-- rebuilt by AnalyticsEngine.rebuild_client_summary()
+CREATE TABLE client_contact_summary (
+    client_id INT PRIMARY KEY,
+    first_contact_at DATETIME NOT NULL,
+    last_contact_at DATETIME NOT NULL,
+    contact_count INT NOT NULL,
+    completed_count INT NOT NULL,
+    max_rating TINYINT,
+    converted_at DATETIME NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (client_id) REFERENCES clients(id) ON DELETE CASCADE,
+    INDEX idx_summary_first_contact (first_contact_at)
+);
+
+-- Change history written in batches by audit.AuditLog; changes holds
+-- {field: [before, after]} for the fields a write touched
+CREATE TABLE audit_log (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(32) NOT NULL,
+    row_id INT NULL,
+    action ENUM('create', 'update', 'delete', 'import') NOT NULL,
+    user_id INT NULL,
+    changed_at DATETIME(6) NOT NULL,
+    changes JSON NOT NULL,
+    INDEX idx_audit_row (table_name, row_id),
+    INDEX idx_audit_time (changed_at)
+);
+
+-- One row per write, inserted in the write's own transaction; desktops
+-- poll it from their last seq (change_feed.ChangeFeedSubscriber)
+CREATE TABLE change_feed (
+    seq BIGINT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(32) NOT NULL,
+    row_id INT NULL,
+    action ENUM('create', 'update', 'delete', 'reset') NOT NULL,
+    origin CHAR(16) NOT NULL,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_feed_time (changed_at)
+);
+
+-- Progress of a bulk client import, saved in each chunk's transaction
+-- (client_import.ClientImporter), so a resumed import never repeats rows
+CREATE TABLE import_checkpoints (
+    source VARCHAR(512) PRIMARY KEY,
+    file_size BIGINT NOT NULL,
+    file_mtime DOUBLE NOT NULL,
+    rows_done INT NOT NULL,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
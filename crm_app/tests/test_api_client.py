@@ -0,0 +1,34 @@
+from api_client import HttpDatabaseManager
+from api_protocol import EXPOSED
+
+
+def unreachable(monkeypatch):
+    manager = HttpDatabaseManager('http://localhost:1')
+
+    def fail(*args, **kwargs):
+        raise OSError("connection refused")
+    monkeypatch.setattr(manager, '_request', fail)
+    return manager
+
+
+def test_failed_calls_return_fresh_defaults(monkeypatch):
+    manager = unreachable(monkeypatch)
+    contacts = manager.get_employee_contacts(1, False)
+    assert contacts == EXPOSED['get_employee_contacts']
+    contacts.append({'id': 1})
+    assert manager.get_employee_contacts(1, False) == []
+    assert EXPOSED['get_employee_contacts'] == []
+
+
+def test_failed_batch_returns_fresh_defaults(monkeypatch):
+    manager = unreachable(monkeypatch)
+    results = manager.batch([('get_clients', (), {}),
+                             ('get_clients', (), {})])
+    assert results == [[], []]
+    results[0].append({'id': 1})
+    assert results[1] == [] and EXPOSED['get_clients'] == []
+
+
+def test_strict_calls_return_none_on_failure(monkeypatch):
+    manager = unreachable(monkeypatch)
+    assert manager.get_employee_contacts(1, False, strict=True) is None
@@ -0,0 +1,33 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from api_protocol import (EMPLOYEE_OWNED, EMPLOYEE_RECORD, EMPLOYEE_SCOPED,
+                          EXPOSED, MANAGER_ONLY, STREAMED, dumps, loads)
+
+
+def test_round_trip_keeps_dates_typed():
+    value = {'when': datetime(2026, 3, 2, 9, 30, 15), 'day': date(2026, 3, 2),
+             'rows': [{'id': 1, 'notes': None}], 'name': "Zoë"}
+    assert loads(dumps(value)) == value
+
+
+def test_other_types_are_flattened():
+    assert loads(dumps({'rating': Decimal('3.5'), 'ids': {1},
+                        'raw': b'abc'})) == {'rating': 3.5, 'ids': [1],
+                                             'raw': "abc"}
+    with pytest.raises(TypeError):
+        dumps(object())
+
+
+def test_lookalike_objects_are_left_alone():
+    value = {'$datetime': "2026-03-02T09:30:00", 'other': 1}
+    assert loads(dumps(value)) == value
+
+
+def test_access_tables_name_exposed_methods():
+    callable_methods = set(EXPOSED) | STREAMED
+    for table in (MANAGER_ONLY, EMPLOYEE_SCOPED, set(EMPLOYEE_OWNED),
+                  set(EMPLOYEE_RECORD)):
+        assert table <= callable_methods
@@ -0,0 +1,184 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+from mysql.connector import Error
+
+from api_protocol import dumps, loads
+from api_server import ApiError, ApiServer
+
+EMPLOYEE = {'id': 7, 'role': 'employee'}
+MANAGER = {'id': 1, 'role': 'manager'}
+
+
+class FakeManager:
+    """Pooled DatabaseManager stand-in; contacts and series by owner"""
+
+    def __init__(self):
+        self.owners = {('contacts', 10): 7, ('contacts', 11): 8,
+                       ('contact_series', 3): 8}
+        self.calls = []
+        self.audit_user_id = None
+        self.connected = True
+        self.reconnects = 0
+        self.reachable = True
+
+    def ensure_connected(self):
+        if not self.connected:
+            self.reconnects += 1
+            self.connected = self.reachable
+        return self.connected
+
+    def get_owner(self, table, row_id):
+        return self.owners.get((table, row_id))
+
+    def __getattr__(self, name):
+        def method(**arguments):
+            self.calls.append((name, arguments))
+            if name == 'get_contact':
+                raise Error("Lost connection to MySQL server")
+            return True
+        return method
+
+
+@pytest.fixture
+def server():
+    server = ApiServer(FakeManager(), pool_size=1, audit=False)
+    for token, user in (('employee', EMPLOYEE), ('manager', MANAGER)):
+        server.sessions[token] = {'user': user, 'expires': time.time() + 60}
+    return server
+
+
+def headers(token):
+    return {'authorization': f"Bearer {token}"}
+
+
+def test_scoped_reads_are_forced_to_own_employee(server):
+    _, _, arguments = server._prepare(headers('employee'), {
+        'method': 'get_employee_contacts', 'args': [3, True]
+    }, {'get_employee_contacts'})
+    assert arguments['employee_id'] == 7
+    assert arguments['is_manager'] is False
+
+
+def test_creates_and_updates_are_kept_as_own(server):
+    for method, record in (('create_contact', 'contact_data'),
+                           ('create_series', 'series_data'),
+                           ('update_contact', 'contact_data')):
+        _, _, arguments = server._prepare(headers('employee'), {
+            'method': method, 'args': [{'id': 10, 'employee_id': 8}]
+        }, {method})
+        assert arguments[record]['employee_id'] == 7
+    _, _, arguments = server._prepare(headers('manager'), {
+        'method': 'create_contact', 'args': [{'employee_id': 8}]
+    }, {'create_contact'})
+    assert arguments['contact_data']['employee_id'] == 8
+
+
+def test_manager_only_methods_refused(server):
+    with pytest.raises(ApiError) as raised:
+        server._prepare(headers('employee'), {'method': 'insert_contacts',
+                                              'args': [[]]},
+                        {'insert_contacts'})
+    assert raised.value.status == 403
+
+
+@pytest.mark.parametrize('method, args, allowed', [
+    ('delete_contact', [10], True),
+    ('delete_contact', [11], False),
+    ('get_contact_notes', [99], False),
+    ('update_contact', [{'id': 11, 'client_id': 1}], False),
+    ('get_series', [3], False),
+    ('end_series', [3, datetime(2026, 1, 1).date()], False),
+])
+def test_employees_only_reach_own_rows(server, method, args, allowed):
+    manager = FakeManager()
+    prepared = server._prepare(headers('employee'),
+                               {'method': method, 'args': args}, {method})
+    if allowed:
+        assert server._run(manager, *prepared) is True
+    else:
+        with pytest.raises(ApiError):
+            server._run(manager, *prepared)
+        assert manager.calls == []
+
+
+def test_managers_reach_every_row(server):
+    manager = FakeManager()
+    prepared = server._prepare(headers('manager'),
+                               {'method': 'end_series', 'args': [3, None]},
+                               {'end_series'})
+    assert server._run(manager, *prepared) is True
+
+
+class FakeWriter:
+    def __init__(self):
+        self.data = b''
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+
+def test_database_errors_become_error_responses(server):
+    async def dispatch():
+        server._pool = asyncio.Queue()
+        server._pool.put_nowait(FakeManager())
+        writer = FakeWriter()
+        await server._dispatch(writer, 'POST', '/rpc', headers('employee'),
+                               dumps({'method': 'get_contact', 'args': [10]}))
+        return writer.data
+
+    data = asyncio.run(dispatch())
+    status, _, body = data.partition(b'\r\n')
+    assert status == b'HTTP/1.1 500 Error'
+    assert loads(body.split(b'\r\n\r\n', 1)[1]) == {'error': "Internal error"}
+
+
+def rpc(server, manager, call):
+    async def dispatch():
+        server._pool = asyncio.Queue()
+        server._pool.put_nowait(manager)
+        writer = FakeWriter()
+        await server._dispatch(writer, 'POST', '/rpc', headers('employee'),
+                               dumps(call))
+        return writer.data
+    status, _, rest = asyncio.run(dispatch()).partition(b'\r\n')
+    return status, loads(rest.split(b'\r\n\r\n', 1)[1])
+
+
+def test_dropped_connections_reconnect_before_use(server):
+    manager = FakeManager()
+    manager.connected = False
+    status, body = rpc(server, manager,
+                       {'method': 'delete_contact', 'args': [10]})
+    assert status == b'HTTP/1.1 200 OK' and body == {'result': True}
+    assert manager.reconnects == 1
+
+
+def test_unreachable_database_answers_503(server):
+    manager = FakeManager()
+    manager.connected = manager.reachable = False
+    status, body = rpc(server, manager,
+                       {'method': 'delete_contact', 'args': [10]})
+    assert status == b'HTTP/1.1 503 Error'
+    assert manager.calls == []
+    # The manager went back to the pool for the next call
+    assert server._pool.qsize() == 1
+
+
+@pytest.mark.parametrize('length', [b'abc', b'-5'])
+def test_bad_content_length_answers_400(server, length):
+    async def handle():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"POST /rpc HTTP/1.1\r\nContent-Length: " + length
+                         + b"\r\n\r\n")
+        reader.feed_eof()
+        writer = FakeWriter()
+        writer.close = lambda: None
+        await server._handle_connection(reader, writer)
+        return writer.data
+    assert asyncio.run(handle()).startswith(b'HTTP/1.1 400 Error')
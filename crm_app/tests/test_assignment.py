@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+from assignment import plan_assignments, plan_followups
+from scheduling import ScheduleIndex
+
+MONDAY = datetime(2026, 3, 2, 8)
+
+
+def clients(count, state_code=None):
+    return [{'id': i, 'state_code': state_code} for i in range(1, count + 1)]
+
+
+def employees(*territories):
+    return [{'id': i, 'territory': territory, 'role': 'employee'}
+            for i, territory in enumerate(territories, 1)]
+
+
+def per_employee(contacts):
+    counts = {}
+    for contact in contacts:
+        counts[contact['employee_id']] = counts.get(contact['employee_id'], 0) + 1
+    return counts
+
+
+def test_load_is_spread_evenly():
+    contacts, unassigned = plan_assignments(clients(90), employees(None, None, None),
+                                            [], MONDAY)
+    assert not unassigned
+    assert per_employee(contacts) == {1: 30, 2: 30, 3: 30}
+
+
+def test_existing_bookings_count_and_are_never_overlapped():
+    booked = [{'id': 100 + i, 'employee_id': 1,
+               'contact_datetime': MONDAY + timedelta(minutes=30 * i),
+               'duration_minutes': 30, 'status': 'Scheduled'}
+              for i in range(10)]
+    contacts, _ = plan_assignments(clients(20), employees(None, None), booked,
+                                   MONDAY)
+    # Employee 1 starts 300 minutes behind
+    assert per_employee(contacts) == {1: 5, 2: 15}
+
+    index = ScheduleIndex()
+    index.rebuild(booked)
+    for number, contact in enumerate(contacts):
+        contact = dict(contact, id=number)
+        start = contact['contact_datetime']
+        assert not index.conflicts(contact['employee_id'], start,
+                                   start + timedelta(minutes=30))
+        assert 8 <= start.hour < 18 and start.weekday() < 5
+        index.add(contact)
+
+
+def test_territories_keep_clients_local():
+    contacts, _ = plan_assignments(
+        clients(4, 'TX') + [{'id': 9, 'state_code': 'NY'}],
+        employees('TX', 'CA', None), [], MONDAY
+    )
+    owners = {c['client_id']: c['employee_id'] for c in contacts}
+    assert {owners[i] for i in range(1, 5)} == {1}
+    # Nobody covers NY, so it goes to the employee without a territory
+    assert owners[9] == 3
+
+    contacts, _ = plan_assignments(clients(4, 'TX'), employees('TX', 'CA', None),
+                                   [], MONDAY, use_territories=False)
+    assert len(per_employee(contacts)) == 3
+
+
+def test_fully_booked_employees_leave_clients_over():
+    contacts, unassigned = plan_assignments(clients(25), employees(None), [],
+                                            MONDAY, minutes=480, horizon_days=21)
+    # 15 workdays with one 8-hour slot each
+    assert len(contacts) == 15
+    assert [c['id'] for c in unassigned] == list(range(16, 26))
+
+
+def test_part_day_left_in_the_horizon_is_still_searched():
+    # After the first slot less than a whole day of the horizon is left
+    contacts, unassigned = plan_assignments(clients(12), employees(None), [],
+                                            MONDAY, minutes=60, horizon_days=1)
+    assert len(contacts) == 10
+    assert all(c['contact_datetime'] < MONDAY + timedelta(days=1)
+               for c in contacts)
+    assert [c['id'] for c in unassigned] == [11, 12]
+
+
+class FakeManager:
+    def __init__(self):
+        self.booked_window = None
+
+    def get_clients_needing_contact(self, client_type, state_code):
+        return clients(3)
+
+    def get_employees(self):
+        return employees(None, None) + [{'id': 3, 'territory': None,
+                                         'role': 'manager'}]
+
+    def get_employee_contacts(self, employee_id, is_manager, start, end,
+                              status, columns, occurrences):
+        self.booked_window = (start, end, occurrences)
+        return []
+
+
+def test_plan_followups_defaults_to_employees_and_reads_occurrences():
+    manager = FakeManager()
+    contacts, _ = plan_followups(manager, MONDAY, horizon_days=30)
+    assert set(per_employee(contacts)) == {1, 2}
+    assert manager.booked_window == (MONDAY, MONDAY + timedelta(days=30), True)
+
+    contacts, _ = plan_followups(manager, MONDAY, employee_ids=[3])
+    assert set(per_employee(contacts)) == {3}
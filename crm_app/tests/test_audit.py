@@ -0,0 +1,86 @@
+from mysql.connector import Error
+
+from audit import AuditLog
+
+
+class FakeConnection:
+    def __init__(self, manager):
+        self.manager = manager
+
+    def cursor(self):
+        return self
+
+    def executemany(self, query, rows):
+        if self.manager.failures:
+            self.manager.failures -= 1
+            raise Error("Lost connection to MySQL server during query")
+        self.manager.inserted.extend(rows)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeManager:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.inserted = []
+        self.reconnects = 0
+        self.connection = FakeConnection(self)
+
+    def clone(self):
+        return self
+
+    def connect(self):
+        return True
+
+    def ensure_connected(self):
+        self.reconnects += 1
+        return True
+
+    def close(self):
+        pass
+
+
+def event(row_id):
+    return ('clients', 'update', row_id, 1, None, {'name': 'a'}, {'name': 'b'})
+
+
+def test_failed_batch_is_retried_once():
+    manager = FakeManager(failures=1)
+    log = AuditLog(manager)
+    log._write([event(1), event(2)])
+    assert len(manager.inserted) == 2
+    assert (log.written, log.dropped) == (2, 0)
+    assert manager.reconnects == 2
+
+
+def test_batch_failing_twice_is_dropped():
+    manager = FakeManager(failures=2)
+    log = AuditLog(manager)
+    log._write([event(1)])
+    assert (log.written, log.dropped) == (0, 1)
+
+
+def test_close_flushes_and_stops():
+    manager = FakeManager()
+    log = AuditLog(manager)
+    assert log.start()
+    log.record('clients', 'update', 1, {'name': 'a'}, {'name': 'b'})
+    log.close(timeout=5)
+    assert not log.running
+    assert len(manager.inserted) == 1
+
+
+def test_close_gives_up_when_the_queue_stays_full():
+    log = AuditLog(FakeManager(), max_queue=1)
+    # A writer that never drains, so the stop marker cannot be queued
+    log._thread = type('Stuck', (), {'is_alive': lambda self: True})()
+    log._queue.put(event(1))
+    log.close(timeout=0.05)
+    assert log.pending == 1
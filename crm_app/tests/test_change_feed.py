@@ -0,0 +1,137 @@
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+import change_feed
+from change_feed import ChangeFeedSubscriber
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+class FakeFeed:
+    """The change feed queries of DatabaseManager over a list of events"""
+
+    origin = 'self'
+
+    def __init__(self):
+        self.events = []
+        self.forward_reads = []
+
+    def add(self, seq, row_id, action='update', origin='other'):
+        self.events.append({'seq': seq, 'table_name': 'contacts',
+                            'row_id': row_id, 'action': action,
+                            'origin': origin})
+        self.events.sort(key=lambda change: change['seq'])
+
+    def latest_change(self):
+        return max((change['seq'] for change in self.events), default=0)
+
+    def get_changes(self, after_seq, limit=500):
+        self.forward_reads.append(after_seq)
+        return [c for c in self.events if c['seq'] > after_seq][:limit]
+
+    def get_changes_by_seq(self, seqs):
+        return [c for c in self.events if c['seq'] in set(seqs)]
+
+
+class FakeStore:
+    def __init__(self):
+        self.applied = []
+        self.refreshes = 0
+
+    def apply_change(self, row_id, deleted=False):
+        self.applied.append((row_id, deleted))
+
+    def refresh(self):
+        self.refreshes += 1
+
+
+def subscriber(feed):
+    store = FakeStore()
+    return ChangeFeedSubscriber(feed, {'contacts': store}), store
+
+
+def test_gap_followed_by_full_pages_keeps_moving_forward():
+    feed = FakeFeed()
+    feed.add(1, 1)
+    # seq 2 belongs to a transaction that has not committed yet
+    for seq in range(3, 3 + 2 * ChangeFeedSubscriber.BATCH):
+        feed.add(seq, seq)
+    sub, store = subscriber(feed)
+
+    sub.poll()
+    assert sub.last_seq == ChangeFeedSubscriber.BATCH + 1
+    assert set(sub._gaps) == {2}
+    sub.poll()
+    sub.poll()
+    assert sub.last_seq == 2 + 2 * ChangeFeedSubscriber.BATCH
+    # Each read starts past the previous page, never back at the gap
+    assert feed.forward_reads == [0, 501, 1001]
+    assert len(store.applied) == 1 + 2 * ChangeFeedSubscriber.BATCH
+
+    feed.add(2, 2)
+    sub.poll()
+    assert not sub._gaps
+    assert store.applied.count((2, False)) == 1
+    assert len(store.applied) == len(set(store.applied))
+
+
+def test_gap_is_written_off_after_timeout(monkeypatch):
+    feed = FakeFeed()
+    feed.add(1, 1)
+    feed.add(3, 3)
+    sub, store = subscriber(feed)
+    clock = [100.0]
+    monkeypatch.setattr(change_feed.time, 'monotonic', lambda: clock[0])
+
+    sub.poll()
+    assert set(sub._gaps) == {2}
+    clock[0] += ChangeFeedSubscriber.GAP_TIMEOUT + 1
+    sub.poll()
+    assert not sub._gaps
+    # A late commit below last_seq is no longer picked up
+    feed.add(2, 2)
+    sub.poll()
+    assert (2, False) not in store.applied
+
+
+def test_own_writes_skipped_and_resets_refresh():
+    feed = FakeFeed()
+    feed.add(1, 1, origin='self')
+    feed.add(2, 2)
+    feed.add(3, 2, action='delete')
+    sub, store = subscriber(feed)
+    sub.poll()
+    assert store.applied == [(2, True)]
+
+    feed.add(4, 0, action='reset')
+    feed.add(5, 5)
+    sub.poll()
+    assert store.refreshes == 1
+    assert store.applied == [(2, True)]
+
+
+class FakeSignal:
+    def __init__(self):
+        self.emitted = 0
+
+    def emit(self):
+        self.emitted += 1
+
+
+def test_signal_tables_emit_once_per_poll():
+    feed = FakeFeed()
+    feed.add(1, 1)
+    for seq in (2, 3):
+        feed.events.append({'seq': seq, 'table_name': 'contact_series',
+                            'row_id': seq, 'action': 'create',
+                            'origin': 'other'})
+    series_changed = FakeSignal()
+    store = FakeStore()
+    sub = ChangeFeedSubscriber(feed, {'contacts': store},
+                               signals={'contact_series': series_changed})
+    sub.poll()
+    assert series_changed.emitted == 1
+    assert store.applied == [(1, False)]
@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+from client_import import ClientImporter, normalize_client, read_rows
+
+STATES = {'TX', 'CA'}
+
+
+def test_normalize_client_cleans_fields():
+    client = normalize_client({'name': "  Acme  ", 'client_type': "Client",
+                               'email': "Info@Acme.com ", 'phone': "+1 (555) 123-4567",
+                               'state_code': "tx", 'address': ""}, STATES)
+    assert client == {'name': "Acme", 'client_type': 'client',
+                      'email': "info@acme.com", 'phone': "+15551234567",
+                      'address': None, 'state_code': 'TX'}
+    assert normalize_client({'name': "Bob"}, STATES)['client_type'] == 'potential'
+
+
+@pytest.mark.parametrize('row, reason', [
+    ({'name': ""}, "name is required"),
+    ({'name': "x" * 101}, "longer than 100"),
+    ({'name': "A", 'client_type': "lead"}, "unknown client type"),
+    ({'name': "A", 'email': "nope"}, "invalid email"),
+    ({'name': "A", 'phone': "12"}, "invalid phone"),
+    ({'name': "A", 'state_code': "ZZ"}, "unknown state code"),
+    ({'_raw': "{broken"}, "unreadable row"),
+])
+def test_normalize_client_rejects(row, reason):
+    with pytest.raises(ValueError, match=reason):
+        normalize_client(row, STATES)
+
+
+def test_read_rows_numbers_csv_and_jsonl_lines(tmp_path):
+    csv_path = tmp_path / "clients.csv"
+    csv_path.write_text("name,email\nAcme,a@acme.com\nGlobex,\n", encoding='utf-8')
+    assert [line for line, _ in read_rows(str(csv_path))] == [2, 3]
+
+    jsonl_path = tmp_path / "clients.jsonl"
+    jsonl_path.write_text('{"name": "Acme"}\n\n{broken\n', encoding='utf-8')
+    assert list(read_rows(str(jsonl_path))) == [
+        (1, {'name': "Acme"}), (3, {'_raw': "{broken"})
+    ]
+
+
+class FakeManager:
+    """Keeps clients and checkpoints in memory; a failing insert commits nothing"""
+
+    def __init__(self, fail_on_call=None, checkpoints=None):
+        self.inserted = []
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+        self.checkpoints = {} if checkpoints is None else checkpoints
+        self.ended = []
+
+    def get_state_codes(self):
+        return [{'code': code} for code in STATES]
+
+    def insert_clients(self, clients, checkpoint=None, record_change=True):
+        assert not record_change
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("connection lost")
+        self.inserted.extend(clients)
+        self.checkpoints[checkpoint['source']] = dict(checkpoint)
+        return len(clients)
+
+    def get_import_checkpoint(self, source):
+        return self.checkpoints.get(source)
+
+    def end_import(self, source, finished=True):
+        self.ended.append(finished)
+        if finished:
+            self.checkpoints.pop(source, None)
+        return True
+
+
+def write_clients(path, count):
+    with open(path, 'w', encoding='utf-8') as handle:
+        for number in range(count):
+            row = {'name': f"Client {number}"}
+            if number % 10 == 9:
+                row['email'] = "bad"
+            handle.write(json.dumps(row) + "\n")
+
+
+def test_import_writes_rejects_and_clears_checkpoint(tmp_path):
+    path = tmp_path / "clients.jsonl"
+    write_clients(path, 25)
+    manager = FakeManager()
+    result = ClientImporter(manager, chunk_size=10, workers=0).run(str(path))
+    assert (result['imported'], result['rejected'], result['skipped']) == (23, 2, 0)
+    errors = (tmp_path / "clients.jsonl.errors.csv").read_text().splitlines()
+    assert errors[0] == "line,reason,row" and len(errors) == 3
+    assert errors[1].startswith("10,invalid email")
+    assert not manager.checkpoints
+    # One change event for the whole import, not one per chunk
+    assert manager.ended == [True]
+
+
+def test_interrupted_import_resumes_after_last_chunk(tmp_path):
+    path = tmp_path / "clients.jsonl"
+    write_clients(path, 25)
+    checkpoints = {}
+    failing = FakeManager(fail_on_call=2, checkpoints=checkpoints)
+    with pytest.raises(RuntimeError):
+        ClientImporter(failing, chunk_size=10, workers=0).run(str(path))
+    # Only the committed chunk counts, and its clients are announced
+    assert checkpoints[str(path)]['rows_done'] == 10
+    assert failing.ended == [False]
+
+    manager = FakeManager(checkpoints=checkpoints)
+    result = ClientImporter(manager, chunk_size=10, workers=0).run(str(path))
+    assert result['skipped'] == 10
+    assert [c['name'] for c in failing.inserted + manager.inserted] == [
+        f"Client {n}" for n in range(25) if n % 10 != 9
+    ]
+    assert not checkpoints
+    errors = (tmp_path / "clients.jsonl.errors.csv").read_text().splitlines()
+    # The header survives the resume, which appends; the failed chunk's
+    # reject was written before its insert and is written again
+    assert errors[0] == "line,reason,row"
+    assert [line.split(",")[0] for line in errors[1:]] == ["10", "20", "20"]
+
+
+def test_changed_file_ignores_checkpoint(tmp_path):
+    path = tmp_path / "clients.jsonl"
+    write_clients(path, 25)
+    checkpoints = {}
+    with pytest.raises(RuntimeError):
+        ClientImporter(FakeManager(fail_on_call=2, checkpoints=checkpoints),
+                       chunk_size=10, workers=0).run(str(path))
+    write_clients(path, 30)
+    result = ClientImporter(FakeManager(checkpoints=checkpoints), chunk_size=10,
+                            workers=0).run(str(path))
+    assert result['skipped'] == 0 and result['imported'] == 27
@@ -0,0 +1,87 @@
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from data_store import EntityStore
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+class MemoryStore(EntityStore):
+    """EntityStore over a dict standing in for a table"""
+
+    def __init__(self, rows=()):
+        super().__init__(db_manager=None)
+        self.table = {row['id']: dict(row) for row in rows}
+        self.next_id = max(self.table, default=0) + 1
+
+    def sort_key(self, row):
+        return row['name']
+
+    def fetch_all(self):
+        return [dict(row) for row in self.table.values()]
+
+    def fetch_one(self, row_id):
+        row = self.table.get(row_id)
+        return dict(row) if row is not None else None
+
+    def write_create(self, data):
+        row_id, self.next_id = self.next_id, self.next_id + 1
+        self.table[row_id] = dict(data, id=row_id, updated_at=1)
+        return row_id
+
+    def write_update(self, data, previous=None):
+        if data['id'] not in self.table:
+            return False
+        self.table[data['id']].update(data, updated_at=2)
+        return True
+
+    def write_delete(self, row_id, previous=None):
+        return self.table.pop(row_id, None) is not None
+
+
+def test_hooks_are_abstract():
+    with pytest.raises(TypeError, match='fetch_all'):
+        EntityStore(None)
+
+    class Unsorted(EntityStore):
+        fetch_all = fetch_one = write_create = MemoryStore.fetch_all
+        write_update = write_delete = MemoryStore.write_update
+    with pytest.raises(TypeError, match='sort_key'):
+        Unsorted(None)
+    assert MemoryStore().fetch_all() == []
+
+
+def test_writes_keep_rows_ordered():
+    store = MemoryStore([{'id': 1, 'name': 'b', 'updated_at': 1}])
+    store.load()
+    store.create({'name': 'a'})
+    store.create({'name': 'c'})
+    assert [row['name'] for row in store.rows()] == ['a', 'b', 'c']
+    store.update({'id': 1, 'name': 'd'})
+    assert [row['name'] for row in store.rows()] == ['a', 'c', 'd']
+    store.delete(1)
+    assert [row['name'] for row in store.rows()] == ['a', 'c']
+
+
+def test_failed_update_restores_the_row():
+    store = MemoryStore([{'id': 1, 'name': 'a', 'updated_at': 1}])
+    store.load()
+    store.write_update = lambda data, previous=None: False
+    assert not store.update({'id': 1, 'name': 'z'})
+    assert store.get(1)['name'] == 'a'
+
+
+def test_update_of_row_deleted_elsewhere_drops_it():
+    store = MemoryStore([{'id': 1, 'name': 'a', 'updated_at': 1},
+                         {'id': 2, 'name': 'b', 'updated_at': 1}])
+    store.load()
+    removed = []
+    store.row_removed.connect(lambda position, row_id: removed.append(row_id))
+    del store.table[1]
+    assert not store.update({'id': 1, 'name': 'c'})
+    assert store.get(1) is None
+    assert [row['id'] for row in store.rows()] == [2]
+    assert removed[-1] == 1
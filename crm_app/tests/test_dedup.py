@@ -0,0 +1,58 @@
+from dedup import (DedupIndex, find_duplicate_pairs, normalize_email,
+                   normalize_name, normalize_phone)
+
+
+def test_normalizers():
+    assert normalize_name("The Acme Corp.") == "acme"
+    assert normalize_name("Inc") == "inc"
+    assert normalize_email(" Jane+crm@Example.COM ") == "jane@example.com"
+    assert normalize_email("not an email") == ""
+    assert normalize_phone("+1 (555) 123-4567") == "5551234567"
+    assert normalize_phone("12-34") == ""
+
+
+def test_similar_names_match():
+    index = DedupIndex()
+    index.add({'id': 1, 'name': "Acme Widgets Inc."})
+    index.add({'id': 2, 'name': "Globex Corporation"})
+    matches = index.matches({'name': "ACME Widgets, LLC"})
+    assert [other['id'] for _, other in matches] == [1]
+
+
+def test_shared_email_matches_and_phone_needs_a_name():
+    index = DedupIndex()
+    index.add({'id': 1, 'name': "Jane Doe", 'email': "jane@example.com",
+               'phone': "555 123 4567"})
+    assert index.matches({'name': "J. Doe Consulting",
+                          'email': "Jane+x@example.com"})
+    assert not index.matches({'name': "Initech", 'phone': "5551234567"})
+
+
+def test_remove_and_self_match():
+    index = DedupIndex()
+    index.add({'id': 1, 'name': "Acme Widgets"})
+    assert not index.matches({'id': 1, 'name': "Acme Widgets"})
+    index.remove(1)
+    assert len(index) == 0
+    assert not index.matches({'name': "Acme Widgets"})
+
+
+def test_pairs_reported_once_earlier_first():
+    pairs = list(find_duplicate_pairs([
+        {'id': 1, 'name': "Acme Widgets"},
+        {'id': 2, 'name': "Umbrella"},
+        {'id': 3, 'name': "Acme Widgets Inc"},
+        {'id': 4, 'name': "ACME widgets"},
+    ]))
+    assert sorted((a, b) for a, b, _ in pairs) == [(1, 3), (1, 4), (3, 4)]
+    assert all(0.6 <= score <= 1.0 for _, _, score in pairs)
+
+
+def test_oversized_email_and_phone_buckets_are_skipped(monkeypatch):
+    monkeypatch.setattr('dedup.MAX_BUCKET_SIZE', 3)
+    index = DedupIndex()
+    for i in range(1, 5):
+        index.add({'id': i, 'name': f"Branch {i * 1000}",
+                   'email': "info@example.com", 'phone': "555 000 1111"})
+    assert not index.matches({'name': "Unrelated", 'email': "info@example.com"})
+    assert not index.matches({'name': "Unrelated", 'phone': "5550001111"})
@@ -0,0 +1,73 @@
+from datetime import date, datetime, timedelta
+
+from scheduling import (SERIES_SLOTS, add_months, expand_series, occurrence_id,
+                        occurrence_times)
+
+MONDAY = datetime(2026, 3, 2, 9)
+
+
+def series(series_id=1, first=MONDAY, frequency='weekly', every=1,
+           ends_on=None):
+    return {'id': series_id, 'client_id': 5, 'employee_id': 1,
+            'first_datetime': first, 'duration_minutes': 30,
+            'contact_method': 'phone', 'notes': "Weekly call",
+            'frequency': frequency, 'every': every, 'ends_on': ends_on}
+
+
+def test_add_months_clamps_to_month_end():
+    assert add_months(datetime(2026, 1, 31, 9), 1) == datetime(2026, 2, 28, 9)
+    assert add_months(datetime(2028, 1, 31, 9), 1) == datetime(2028, 2, 29, 9)
+    assert add_months(datetime(2026, 11, 30), 3) == datetime(2027, 2, 28)
+
+
+def test_weekly_occurrences_in_window():
+    window = (datetime(2026, 3, 10), datetime(2026, 3, 31))
+    assert list(occurrence_times(series(), *window)) == [
+        (2, datetime(2026, 3, 16, 9)), (3, datetime(2026, 3, 23, 9)),
+        (4, datetime(2026, 3, 30, 9)),
+    ]
+    assert [when.day for _, when in occurrence_times(series(every=2), *window)] \
+        == [16, 30]
+
+
+def test_window_far_from_start_is_computed_not_stepped():
+    start = datetime(2030, 3, 4)
+    times = list(occurrence_times(series(), start, start + timedelta(days=7)))
+    assert times == [(209, datetime(2030, 3, 4, 9))]
+
+
+def test_monthly_occurrences_follow_month_ends():
+    first = datetime(2026, 1, 31, 10)
+    times = list(occurrence_times(series(first=first, frequency='monthly'),
+                                  datetime(2026, 2, 1), datetime(2026, 5, 1)))
+    assert [when.date() for _, when in times] == [
+        date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30)
+    ]
+
+
+def test_occurrences_run_from_first_to_ends_on():
+    ended = series(ends_on=date(2026, 3, 16))
+    times = list(occurrence_times(ended, datetime(2026, 1, 1),
+                                  datetime(2026, 6, 1)))
+    assert [when.day for _, when in times] == [2, 9, 16]
+
+
+def test_expand_series_skips_overridden_occurrences():
+    weekly = series(series_id=3)
+    monthly = series(series_id=4, first=datetime(2026, 3, 5, 14),
+                     frequency='monthly')
+    overridden = {(3, datetime(2026, 3, 9, 9))}
+    rows = expand_series([weekly, monthly], overridden,
+                         datetime(2026, 3, 1), datetime(2026, 3, 17))
+    assert [(row['series_id'], row['contact_datetime'].day) for row in rows] \
+        == [(3, 2), (4, 5), (3, 16)]
+    assert rows[0]['id'] == occurrence_id(3, 0)
+    assert rows[2]['id'] == occurrence_id(3, 2)
+    assert all(row['status'] == 'Scheduled' and row['id'] < 0
+               and row['occurrence_at'] == row['contact_datetime']
+               for row in rows)
+
+
+def test_occurrence_ids_are_distinct_per_series():
+    assert occurrence_id(1, SERIES_SLOTS - 1) != occurrence_id(2, 0)
+    assert occurrence_id(1, 0) < 0
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from report_cache import ReportCache
+
+
+class FakeManager:
+    """Answers get_employee_contacts from a list, or fails while down"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.down = False
+        self.queries = 0
+
+    @contextmanager
+    def running(self, token):
+        yield True
+
+    def get_employee_contacts(self, employee_id, is_manager, start, end,
+                              status, columns=None, occurrences=False,
+                              strict=False):
+        self.queries += 1
+        if self.down:
+            return None if strict else []
+        return [row for row in self.rows
+                if start <= row['contact_datetime'] < end]
+
+
+ROWS = [{'id': 1, 'contact_datetime': datetime(2024, 3, 4, 9), 'status': 'Scheduled'},
+        {'id': 2, 'contact_datetime': datetime(2024, 3, 6, 9), 'status': 'Completed'}]
+
+
+def test_missing_days_are_fetched_once():
+    manager = FakeManager(ROWS)
+    cache = ReportCache(manager)
+    week = (date(2024, 3, 4), date(2024, 3, 10), None, 1, True)
+    assert [row['id'] for row in cache.get(*week)] == [1, 2]
+    assert [row['id'] for row in cache.get(*week)] == [1, 2]
+    assert manager.queries == 1
+
+
+def test_failed_fetch_is_not_cached():
+    manager = FakeManager(ROWS)
+    cache = ReportCache(manager)
+    week = (date(2024, 3, 4), date(2024, 3, 10), None, 1, True)
+    manager.down = True
+    assert cache.get(*week) == []
+    manager.down = False
+    assert [row['id'] for row in cache.get(*week)] == [1, 2]
+    assert manager.queries == 2
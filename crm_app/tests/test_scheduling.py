@@ -0,0 +1,110 @@
+from datetime import datetime, time, timedelta
+
+from scheduling import MAX_DURATION, ScheduleIndex
+
+MONDAY = datetime(2026, 3, 2, 9)
+
+
+def contact(contact_id, start, minutes=30, employee_id=1, status='Scheduled'):
+    return {'id': contact_id, 'employee_id': employee_id,
+            'contact_datetime': start, 'duration_minutes': minutes,
+            'status': status}
+
+
+def index_of(*contacts):
+    index = ScheduleIndex()
+    index.rebuild(contacts)
+    return index
+
+
+# Conflicts
+
+def test_overlapping_contacts_conflict():
+    index = index_of(contact(1, MONDAY), contact(2, MONDAY + timedelta(hours=1)))
+    assert index.conflicts(1, MONDAY + timedelta(minutes=15),
+                           MONDAY + timedelta(minutes=75)) == [1, 2]
+
+
+def test_touching_contacts_do_not_conflict():
+    index = index_of(contact(1, MONDAY))
+    assert index.conflicts(1, MONDAY + timedelta(minutes=30),
+                           MONDAY + timedelta(hours=1)) == []
+    assert index.conflicts(1, MONDAY - timedelta(minutes=30), MONDAY) == []
+
+
+def test_long_contact_found_from_far_back():
+    index = index_of(contact(1, MONDAY, minutes=MAX_DURATION))
+    late = MONDAY + timedelta(minutes=MAX_DURATION - 5)
+    assert index.conflicts(1, late, late + timedelta(minutes=30)) == [1]
+
+
+def test_conflicts_skip_cancelled_other_employees_and_excluded():
+    index = index_of(contact(1, MONDAY, status='Cancelled'),
+                     contact(2, MONDAY, employee_id=2),
+                     contact(3, MONDAY))
+    end = MONDAY + timedelta(minutes=30)
+    assert index.conflicts(1, MONDAY, end) == [3]
+    assert index.conflicts(1, MONDAY, end, exclude_id=3) == []
+
+
+def test_add_replaces_and_remove_forgets():
+    index = index_of(contact(1, MONDAY))
+    index.add(contact(1, MONDAY + timedelta(hours=2)))
+    assert len(index) == 1
+    assert index.conflicts(1, MONDAY, MONDAY + timedelta(minutes=30)) == []
+    index.add(contact(1, MONDAY, status='Cancelled'))
+    assert len(index) == 0
+    index.add(contact(2, MONDAY))
+    index.remove(2)
+    assert index.conflicts(1, MONDAY, MONDAY + timedelta(hours=3)) == []
+
+
+def test_index_matches_brute_force():
+    contacts = [contact(i, MONDAY + timedelta(minutes=17 * i),
+                        minutes=15 + (i * 7) % 60, employee_id=i % 3)
+                for i in range(300)]
+    index = index_of(*contacts)
+    for offset in range(0, 17 * 300, 37):
+        start = MONDAY + timedelta(minutes=offset)
+        end = start + timedelta(minutes=45)
+        expected = sorted(
+            (c['contact_datetime'], c['id']) for c in contacts
+            if c['employee_id'] == 1 and c['contact_datetime'] < end
+            and c['contact_datetime']
+            + timedelta(minutes=c['duration_minutes']) > start
+        )
+        assert index.conflicts(1, start, end) == [i for _, i in expected]
+
+
+# Free slots
+
+def test_next_free_slot_jumps_past_bookings():
+    index = index_of(contact(1, MONDAY, minutes=60),
+                     contact(2, MONDAY + timedelta(minutes=60), minutes=45))
+    assert index.next_free_slot(1, MONDAY, 30) == \
+        MONDAY + timedelta(minutes=105)
+
+
+def test_next_free_slot_keeps_to_working_hours():
+    index = ScheduleIndex()
+    evening = datetime(2026, 3, 2, 17, 45)
+    assert index.next_free_slot(1, evening, 30) == datetime(2026, 3, 3, 8)
+    early = datetime(2026, 3, 3, 6)
+    assert index.next_free_slot(1, early, 30) == datetime(2026, 3, 3, 8)
+    friday = datetime(2026, 3, 6, 17, 50)
+    assert index.next_free_slot(1, friday, 30) == datetime(2026, 3, 9, 8)
+    assert index.next_free_slot(1, friday, 30, day_end=time(19)) == friday
+    assert index.next_free_slot(1, friday, 30, workdays=range(4)) == \
+        datetime(2026, 3, 9, 8)
+
+
+def test_next_free_slot_excludes_the_contact_being_moved():
+    index = index_of(contact(1, MONDAY))
+    assert index.next_free_slot(1, MONDAY, 30, exclude_id=1) == MONDAY
+
+
+def test_next_free_slot_gives_up_at_horizon():
+    index = index_of(contact(1, datetime(2026, 3, 2, 8), minutes=MAX_DURATION),
+                     contact(2, datetime(2026, 3, 2, 16), minutes=120))
+    assert index.next_free_slot(1, datetime(2026, 3, 2, 8), 30,
+                                horizon_days=1) is None
@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+# Bucket widths in days, from finest to coarsest
+BUCKET_SIZES = [1, 7, 14, 30, 91, 182, 365]
+
+METHODS = ['phone', 'email', 'in_person', 'other']
+
+
+def bucket_days_for(start_date: date, end_date: date, width_px: int,
+                    min_px_per_bucket: int = 4) -> int:
+    """Finest bucket width that gives each bucket at least a few pixels"""
+    span = (end_date - start_date).days + 1
+    max_buckets = max(1, width_px // min_px_per_bucket)
+    for size in BUCKET_SIZES:
+        if span / size <= max_buckets:
+            return size
+    # Longer than the coarsest size allows; stretch the buckets instead
+    return -(-span // max_buckets)
+
+
+def load_trends(db_manager, start_date: date, end_date: date, width_px: int,
+                employee_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Per-bucket contact statistics downsampled to a chart's pixel width
+
+    Returns one dict per bucket, including empty ones, with the bucket's
+    first day, total count, average rating (None when unrated) and the
+    count per contact method.
+    """
+    bucket_days = bucket_days_for(start_date, end_date, width_px)
+    rows = db_manager.get_contact_trends(
+        start_date, end_date, bucket_days, employee_id
+    )
+    by_bucket = {int(row['bucket']): row for row in rows}
+
+    buckets = []
+    count = (end_date - start_date).days // bucket_days + 1
+    for index in range(count):
+        row = by_bucket.get(index, {})
+        buckets.append({
+            'start': start_date + timedelta(days=index * bucket_days),
+            'days': bucket_days,
+            'total': int(row.get('total') or 0),
+            'avg_rating': float(row['avg_rating']) if row.get('avg_rating') is not None else None,
+            **{method: int(row.get(method) or 0) for method in METHODS}
+        })
+    return buckets
@@ -0,0 +1,148 @@
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                              QTableWidget, QTableWidgetItem, QLabel,
+                              QComboBox, QHeaderView, QMessageBox)
+from PySide6.QtCore import Slot
+
+class AnalyticsView(QWidget):
+    """Lead conversion funnel, cohort and per-employee/method analytics"""
+
+    COHORT_MONTHS = 6
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.engine = db_manager.analytics()
+        self.date_range = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Initialize the user interface"""
+        layout = QVBoxLayout(self)
+
+        # Time to conversion
+        self.conversion_label = QLabel()
+        layout.addWidget(self.conversion_label)
+        self.histogram_table = QTableWidget()
+        self.histogram_table.setRowCount(1)
+        self.histogram_table.setMaximumHeight(70)
+        self.histogram_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.Stretch
+        )
+        self.histogram_table.verticalHeader().hide()
+        layout.addWidget(self.histogram_table)
+
+        # Cohorts by first-contact month
+        layout.addWidget(QLabel("Cohorts by first contact month (cumulative conversion)"))
+        self.cohort_table = QTableWidget()
+        self.cohort_table.setColumnCount(2 + self.COHORT_MONTHS)
+        self.cohort_table.setHorizontalHeaderLabels(
+            ["Cohort", "Clients"]
+            + [f"Month {m}" for m in range(self.COHORT_MONTHS)]
+        )
+        self.cohort_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.Stretch
+        )
+        layout.addWidget(self.cohort_table)
+
+        # Conversion rate by employee or method
+        rate_layout = QHBoxLayout()
+        rate_layout.addWidget(QLabel("Conversion rate by"))
+        self.dimension_combo = QComboBox()
+        self.dimension_combo.addItem("Employee", "employee")
+        self.dimension_combo.addItem("Contact Method", "method")
+        self.dimension_combo.currentIndexChanged.connect(self.load_rates)
+        rate_layout.addWidget(self.dimension_combo)
+        rate_layout.addStretch()
+
+        self.rebuild_button = QPushButton("Rebuild Summary")
+        self.rebuild_button.setToolTip(
+            "Recompute the per-client contact summary the analyses read"
+        )
+        self.rebuild_button.clicked.connect(self.rebuild_summary)
+        rate_layout.addWidget(self.rebuild_button)
+        layout.addLayout(rate_layout)
+
+        self.rate_table = QTableWidget()
+        self.rate_table.setColumnCount(4)
+        self.rate_table.setHorizontalHeaderLabels(
+            ["Name", "Leads", "Conversions", "Rate"]
+        )
+        self.rate_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.Stretch
+        )
+        layout.addWidget(self.rate_table)
+
+    def load(self, start_date, end_date):
+        """Run every analysis over a date range"""
+        self.date_range = (start_date, end_date)
+        self.load_time_to_conversion()
+        self.load_cohorts()
+        self.load_rates()
+
+    def load_time_to_conversion(self):
+        """Show how long converted clients took to convert"""
+        result = self.engine.time_to_conversion(*self.date_range)
+        if result['count']:
+            self.conversion_label.setText(
+                f"Converted clients: {result['count']}   "
+                f"Mean: {result['mean_days']:.1f} days   "
+                f"Median: {result['median_days']:.1f} days"
+            )
+        else:
+            self.conversion_label.setText("No conversions in this period")
+
+        histogram = result['histogram']
+        self.histogram_table.setColumnCount(len(histogram))
+        self.histogram_table.setHorizontalHeaderLabels([
+            f"{b['from']}-{b['to']} days" if b['to'] is not None
+            else f"{b['from']}+ days"
+            for b in histogram
+        ])
+        for column, bucket in enumerate(histogram):
+            self.histogram_table.setItem(
+                0, column, QTableWidgetItem(str(bucket['count']))
+            )
+
+    def load_cohorts(self):
+        """Show cumulative conversion per first-contact month"""
+        cohorts = self.engine.cohorts(*self.date_range, months=self.COHORT_MONTHS)
+        self.cohort_table.setRowCount(len(cohorts))
+        for row, cohort in enumerate(cohorts):
+            self.cohort_table.setItem(row, 0, QTableWidgetItem(cohort['cohort']))
+            self.cohort_table.setItem(row, 1, QTableWidgetItem(str(cohort['size'])))
+            for month, rate in enumerate(cohort['conversion_rates']):
+                self.cohort_table.setItem(
+                    row, 2 + month, QTableWidgetItem(f"{rate * 100:.1f}%")
+                )
+
+    @Slot()
+    def load_rates(self):
+        """Show conversion rates for the chosen dimension"""
+        if self.date_range is None:
+            return
+        rates = self.engine.conversion_rates(
+            self.dimension_combo.currentData(), *self.date_range
+        )
+        self.rate_table.setRowCount(len(rates))
+        for row, rate in enumerate(rates):
+            self.rate_table.setItem(row, 0, QTableWidgetItem(rate['label']))
+            self.rate_table.setItem(row, 1, QTableWidgetItem(str(rate['leads'])))
+            self.rate_table.setItem(
+                row, 2, QTableWidgetItem(str(rate['conversions']))
+            )
+            self.rate_table.setItem(
+                row, 3, QTableWidgetItem(f"{rate['rate'] * 100:.1f}%")
+            )
+
+    @Slot()
+    def rebuild_summary(self):
+        """Recompute the per-client summary and reload"""
+        refreshed = self.engine.rebuild_client_summary()
+        if refreshed < 0:
+            QMessageBox.critical(
+                self,
+                "Error",
+                "Failed to rebuild the client summary."
+            )
+            return
+        if self.date_range is not None:
+            self.load(*self.date_range)
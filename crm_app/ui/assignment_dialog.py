@@ -0,0 +1,191 @@
+from datetime import datetime
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
+                              QComboBox, QDateEdit, QSpinBox, QCheckBox,
+                              QListWidget, QListWidgetItem, QPushButton,
+                              QTableWidget, QTableWidgetItem, QHeaderView,
+                              QLabel, QMessageBox, QApplication)
+from PySide6.QtCore import Qt, Slot, QDate
+from assignment import plan_followups
+from scheduling import DEFAULT_DURATION, MAX_DURATION
+
+class AssignmentDialog(QDialog):
+    """Managers' preview-then-save of automatic follow-up assignment"""
+
+    def __init__(self, db_manager, contact_store, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.contact_store = contact_store
+        self.employees = db_manager.get_employees()
+        # Planned contacts, saved by Assign
+        self.contacts = []
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Initialize the user interface"""
+        self.setWindowTitle("Assign Follow-ups")
+        self.resize(700, 600)
+        layout = QVBoxLayout(self)
+
+        form_layout = QFormLayout()
+        self.client_type_combo = QComboBox()
+        self.client_type_combo.addItem("All clients", None)
+        self.client_type_combo.addItem("Potential clients", 'potential')
+        self.client_type_combo.addItem("Clients", 'client')
+        form_layout.addRow("Clients:", self.client_type_combo)
+
+        self.state_combo = QComboBox()
+        self.state_combo.addItem("Any state", None)
+        for state in self.db_manager.get_state_codes():
+            self.state_combo.addItem(
+                f"{state['code']} - {state['description']}", state['code']
+            )
+        form_layout.addRow("State:", self.state_combo)
+
+        self.start_edit = QDateEdit(QDate.currentDate().addDays(1))
+        self.start_edit.setCalendarPopup(True)
+        form_layout.addRow("Book From:", self.start_edit)
+
+        self.duration_spin = QSpinBox()
+        self.duration_spin.setRange(5, MAX_DURATION)
+        self.duration_spin.setSingleStep(5)
+        self.duration_spin.setValue(DEFAULT_DURATION)
+        self.duration_spin.setSuffix(" min")
+        form_layout.addRow("Duration:", self.duration_spin)
+
+        self.method_combo = QComboBox()
+        self.method_combo.addItems(["phone", "email", "in-person", "other"])
+        form_layout.addRow("Contact Method:", self.method_combo)
+
+        self.territory_check = QCheckBox("Keep clients within employee territories")
+        self.territory_check.setChecked(True)
+        form_layout.addRow("", self.territory_check)
+
+        # Who can take follow-ups; employees are ticked by default
+        self.employee_list = QListWidget()
+        self.employee_list.setMaximumHeight(120)
+        for employee in self.employees:
+            label = employee['name']
+            if employee.get('territory'):
+                label += f" ({employee['territory']})"
+            item = QListWidgetItem(label)
+            item.setData(Qt.UserRole, employee['id'])
+            item.setCheckState(
+                Qt.Checked if employee['role'] == 'employee' else Qt.Unchecked
+            )
+            self.employee_list.addItem(item)
+        form_layout.addRow("Employees:", self.employee_list)
+        layout.addLayout(form_layout)
+
+        # Planned contacts per employee
+        self.plan_table = QTableWidget()
+        self.plan_table.setColumnCount(3)
+        self.plan_table.setHorizontalHeaderLabels([
+            "Employee", "Contacts", "First - Last"
+        ])
+        self.plan_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.Stretch
+        )
+        self.plan_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.plan_table)
+
+        self.summary_label = QLabel("Preview the plan before assigning.")
+        layout.addWidget(self.summary_label)
+
+        button_layout = QHBoxLayout()
+        self.preview_button = QPushButton("Preview")
+        self.preview_button.clicked.connect(self.preview)
+        button_layout.addWidget(self.preview_button)
+        button_layout.addStretch()
+
+        self.assign_button = QPushButton("Assign")
+        self.assign_button.setEnabled(False)
+        self.assign_button.clicked.connect(self.assign)
+        button_layout.addWidget(self.assign_button)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.reject)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        # A plan only holds for the options it was made with
+        for signal in (self.client_type_combo.currentIndexChanged,
+                       self.state_combo.currentIndexChanged,
+                       self.start_edit.dateChanged,
+                       self.duration_spin.valueChanged,
+                       self.method_combo.currentIndexChanged,
+                       self.territory_check.toggled,
+                       self.employee_list.itemChanged):
+            signal.connect(self.discard_plan)
+
+    def selected_employee_ids(self):
+        return [
+            self.employee_list.item(row).data(Qt.UserRole)
+            for row in range(self.employee_list.count())
+            if self.employee_list.item(row).checkState() == Qt.Checked
+        ]
+
+    @Slot()
+    def discard_plan(self):
+        self.contacts = []
+        self.assign_button.setEnabled(False)
+
+    @Slot()
+    def preview(self):
+        """Plan the assignment and show how it spreads"""
+        employee_ids = self.selected_employee_ids()
+        if not employee_ids:
+            QMessageBox.warning(self, "Validation Error",
+                                "Please select at least one employee.")
+            return
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            self.contacts, unassigned = plan_followups(
+                self.db_manager,
+                datetime.combine(self.start_edit.date().toPython(),
+                                 datetime.min.time()),
+                self.client_type_combo.currentData(),
+                self.state_combo.currentData(),
+                employee_ids,
+                minutes=self.duration_spin.value(),
+                contact_method=self.method_combo.currentText(),
+                use_territories=self.territory_check.isChecked()
+            )
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        per_employee = {}
+        for contact in self.contacts:
+            per_employee.setdefault(contact['employee_id'], []).append(
+                contact['contact_datetime']
+            )
+        names = {e['id']: e['name'] for e in self.employees}
+        self.plan_table.setRowCount(len(per_employee))
+        for row, (employee_id, times) in enumerate(sorted(
+                per_employee.items(), key=lambda item: names[item[0]])):
+            self.plan_table.setItem(row, 0, QTableWidgetItem(names[employee_id]))
+            self.plan_table.setItem(row, 1, QTableWidgetItem(str(len(times))))
+            self.plan_table.setItem(row, 2, QTableWidgetItem(
+                f"{min(times):%Y-%m-%d %H:%M} - {max(times):%Y-%m-%d %H:%M}"
+            ))
+
+        summary = f"{len(self.contacts)} follow-ups planned"
+        if unassigned:
+            summary += (f"; {len(unassigned)} clients left over, with no "
+                        "selected employee free to take them")
+        self.summary_label.setText(summary + ".")
+        self.assign_button.setEnabled(bool(self.contacts))
+
+    @Slot()
+    def assign(self):
+        """Save the previewed plan in one transaction"""
+        if self.db_manager.insert_contacts(self.contacts) < 0:
+            QMessageBox.critical(
+                self, "Error", "Failed to save the assignments; nothing was saved."
+            )
+            return
+        QMessageBox.information(
+            self, "Success", f"{len(self.contacts)} follow-ups assigned."
+        )
+        self.contact_store.refresh()
+        self.accept()
@@ -0,0 +1,313 @@
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                              QTableWidget, QTableWidgetItem, QComboBox,
+                              QLabel, QHeaderView)
+from PySide6.QtCore import Qt, Slot, Signal, QTimer
+from diagnostics import diagnostics
+
+DAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+# How long the user must stay on a window before its neighbours are fetched
+PREFETCH_DELAY_MS = 1500
+
+
+def window_for(mode, day):
+    """Return the [start, end) datetimes of the day/week/month holding day"""
+    if mode == "Day":
+        start = day
+        end = day + timedelta(days=1)
+    elif mode == "Week":
+        start = day - timedelta(days=day.weekday())
+        end = start + timedelta(days=7)
+    else:
+        start = day.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+    return (datetime.combine(start, datetime.min.time()),
+            datetime.combine(end, datetime.min.time()))
+
+
+def step(mode, day, direction):
+    """Move day one window forwards (1) or backwards (-1)"""
+    if mode == "Day":
+        return day + timedelta(days=direction)
+    if mode == "Week":
+        return day + timedelta(days=7 * direction)
+    month = day.month - 1 + direction
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+class ContactRangeCache:
+    """LRU cache of contacts per time window
+
+    Only windows that have been viewed or prefetched are held, and at most
+    `capacity` of them, so memory stays bounded however long the history.
+    A window whose query failed is shown empty but not held, so the next
+    visit retries it.
+    """
+
+    # What the calendar cells show, and which series occurrence an entry is
+    COLUMNS = ['contact_datetime', 'client_name', 'status', 'series_id',
+               'occurrence_at']
+
+    def __init__(self, db_manager, user_data, capacity=12):
+        self.db_manager = db_manager
+        self.user_data = user_data
+        self.capacity = capacity
+        self._windows = OrderedDict()  # (start, end) -> rows
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, start, end):
+        """Contacts in [start, end), from cache when possible"""
+        key = (start, end)
+        if key in self._windows:
+            self.hits += 1
+            self._windows.move_to_end(key)
+            return self._windows[key]
+
+        self.misses += 1
+
+        rows = self.db_manager.get_employee_contacts(
+            self.user_data['id'],
+            self.user_data['role'] == 'manager',
+            start,
+            end,
+            columns=self.COLUMNS,
+            occurrences=True,
+            strict=True
+        )
+        if rows is None:
+            return []
+        self._windows[key] = rows
+        if len(self._windows) > self.capacity:
+            self._windows.popitem(last=False)
+        return rows
+
+    def contains(self, start, end):
+        return (start, end) in self._windows
+
+    def clear(self):
+        self._windows.clear()
+
+    def invalidate(self, when=None, row_id=None):
+        """Drop windows covering a datetime or holding a contact id"""
+        for key in list(self._windows):
+            start, end = key
+            if when is not None and start <= when < end:
+                del self._windows[key]
+            elif row_id is not None and any(r['id'] == row_id
+                                            for r in self._windows[key]):
+                del self._windows[key]
+
+
+class ContactCalendar(QWidget):
+    """Day, week or month calendar of the contact schedule"""
+
+    # Emitted with the contact id when an entry is double-clicked
+    contact_activated = Signal(int)
+    # Emitted with (series id, occurrence_at) for a series occurrence that
+    # is not stored as a contact yet
+    occurrence_activated = Signal(int, object)
+
+    def __init__(self, db_manager, user_data, contact_store, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.user_data = user_data
+        self.cache = ContactRangeCache(db_manager, user_data)
+        diagnostics.watch_cache('Calendar windows', self.cache)
+        self.current_day = date.today()
+        # id -> row of the entries on screen
+        self.shown = {}
+        self.setup_ui()
+
+        # Writes made through the store invalidate the windows they touch
+        contact_store.row_inserted.connect(self._contact_changed)
+        contact_store.row_updated.connect(self._contact_changed)
+        contact_store.row_removed.connect(self._contact_removed)
+        contact_store.series_changed.connect(self.series_changed)
+
+        # Repaint once per burst of changes rather than once per row
+        self.redraw_timer = QTimer(self)
+        self.redraw_timer.setSingleShot(True)
+        self.redraw_timer.timeout.connect(self.load_window)
+
+        # Prefetching queries on the GUI thread, so it waits until the
+        # user stops navigating; every load_window() restarts the wait
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self._prefetch)
+
+    def setup_ui(self):
+        """Initialize the user interface"""
+        layout = QVBoxLayout(self)
+
+        # Navigation
+        nav_layout = QHBoxLayout()
+        self.prev_button = QPushButton("<")
+        self.prev_button.clicked.connect(lambda: self.move_window(-1))
+        nav_layout.addWidget(self.prev_button)
+
+        self.today_button = QPushButton("Today")
+        self.today_button.clicked.connect(self.go_today)
+        nav_layout.addWidget(self.today_button)
+
+        self.next_button = QPushButton(">")
+        self.next_button.clicked.connect(lambda: self.move_window(1))
+        nav_layout.addWidget(self.next_button)
+
+        self.period_label = QLabel()
+        nav_layout.addWidget(self.period_label)
+        nav_layout.addStretch()
+
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(["Day", "Week", "Month"])
+        self.mode_combo.setCurrentText("Week")
+        self.mode_combo.currentTextChanged.connect(self.load_window)
+        nav_layout.addWidget(self.mode_combo)
+        layout.addLayout(nav_layout)
+
+        # Calendar grid
+        self.grid = QTableWidget()
+        self.grid.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.grid.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.grid.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.grid.setWordWrap(True)
+        self.grid.cellDoubleClicked.connect(self._cell_activated)
+        layout.addWidget(self.grid)
+
+    def showEvent(self, event):
+        """Query the first window only once the calendar is actually shown"""
+        super().showEvent(event)
+        self.load_window()
+
+    @Slot()
+    def load_window(self):
+        """Show the window around the current day"""
+        if not self.isVisible():
+            return
+        mode = self.mode_combo.currentText()
+        start, end = window_for(mode, self.current_day)
+        contacts = self.cache.get(start, end)
+
+        if mode == "Day":
+            self.period_label.setText(start.strftime("%A, %Y-%m-%d"))
+            self._show_day(contacts)
+        elif mode == "Week":
+            last = end - timedelta(days=1)
+            self.period_label.setText(
+                f"{start.strftime('%Y-%m-%d')} - {last.strftime('%Y-%m-%d')}"
+            )
+            self._show_days(start, 7, 1, contacts)
+        else:
+            self.period_label.setText(start.strftime("%B %Y"))
+            grid_start = start - timedelta(days=start.weekday())
+            weeks = ((end - grid_start).days + 6) // 7
+            self._show_days(grid_start, 7, weeks, contacts, start, end)
+
+        # Make the neighbouring windows instant once the user is idle
+        self.prefetch_timer.start()
+
+    @Slot()
+    def go_today(self):
+        self.current_day = date.today()
+        self.load_window()
+
+    def move_window(self, direction):
+        self.current_day = step(
+            self.mode_combo.currentText(), self.current_day, direction
+        )
+        self.load_window()
+
+    @Slot()
+    def _prefetch(self):
+        """Fetch one missing neighbouring window, then wait again for the next"""
+        if not self.isVisible():
+            return
+        mode = self.mode_combo.currentText()
+        for direction in (1, -1):
+            start, end = window_for(mode, step(mode, self.current_day, direction))
+            if not self.cache.contains(start, end):
+                self.cache.get(start, end)
+                # A failed window is left for the next navigation
+                if self.cache.contains(start, end):
+                    self.prefetch_timer.start()
+                return
+
+    def _entry_text(self, contact):
+        self.shown[contact['id']] = contact
+        # Recurring entries are marked with a circular arrow
+        repeat = " \u21bb" if contact.get('series_id') else ""
+        return (f"{contact['contact_datetime'].strftime('%H:%M')} "
+                f"{contact['client_name']} ({contact['status']}){repeat}")
+
+    def _show_day(self, contacts):
+        self.shown = {}
+        self.grid.clear()
+        self.grid.setColumnCount(1)
+        self.grid.setHorizontalHeaderLabels(["Contacts"])
+        self.grid.setRowCount(len(contacts))
+        self.grid.verticalHeader().setSectionResizeMode(
+            QHeaderView.ResizeToContents
+        )
+        for row, contact in enumerate(contacts):
+            item = QTableWidgetItem(self._entry_text(contact))
+            item.setData(Qt.UserRole, [contact['id']])
+            self.grid.setItem(row, 0, item)
+
+    def _show_days(self, grid_start, columns, rows, contacts,
+                   in_start=None, in_end=None):
+        by_day = {}
+        for contact in contacts:
+            by_day.setdefault(contact['contact_datetime'].date(), []).append(contact)
+
+        self.shown = {}
+        self.grid.clear()
+        self.grid.setColumnCount(columns)
+        self.grid.setRowCount(rows)
+        self.grid.setHorizontalHeaderLabels(DAY_NAMES)
+        self.grid.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        for index in range(columns * rows):
+            day = (grid_start + timedelta(days=index)).date()
+            entries = by_day.get(day, [])
+            lines = [day.strftime("%d")] + [self._entry_text(c) for c in entries]
+            item = QTableWidgetItem("\n".join(lines))
+            item.setTextAlignment(Qt.AlignTop | Qt.AlignLeft)
+            item.setData(Qt.UserRole, [c['id'] for c in entries])
+            if in_start is not None and not in_start.date() <= day < in_end.date():
+                item.setForeground(Qt.gray)
+            self.grid.setItem(index // columns, index % columns, item)
+
+    @Slot(int, int)
+    def _cell_activated(self, row, column):
+        item = self.grid.item(row, column)
+        ids = item.data(Qt.UserRole) if item else None
+        if not ids:
+            return
+        if ids[0] < 0:
+            occurrence = self.shown[ids[0]]
+            self.occurrence_activated.emit(
+                occurrence['series_id'], occurrence['occurrence_at']
+            )
+        else:
+            self.contact_activated.emit(ids[0])
+
+    @Slot()
+    def series_changed(self):
+        """Re-expand the windows once a recurring series was added or ended"""
+        self.cache.clear()
+        self.redraw_timer.start(0)
+
+    @Slot(int, object)
+    def _contact_changed(self, position, contact):
+        # The old date/time of a rescheduled contact is covered by row_id
+        self.cache.invalidate(contact['contact_datetime'], contact['id'])
+        # A stored series occurrence replaces the one expanded in its window
+        if contact.get('occurrence_at'):
+            self.cache.invalidate(contact['occurrence_at'])
+        self.redraw_timer.start(0)
+
+    @Slot(int, int)
+    def _contact_removed(self, position, contact_id):
+        self.cache.invalidate(row_id=contact_id)
+        self.redraw_timer.start(0)
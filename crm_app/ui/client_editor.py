@@ -2,14 +2,18 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                               QTableWidget, QTableWidgetItem, QFormLayout,
                               QLineEdit, QComboBox, QTextEdit, QLabel,
                               QMessageBox, QHeaderView)
-from PySide6.QtCore import Qt, Slot
+from PySide6.QtCore import Qt, Slot, QTimer
+from data_store import TableBinding
+from dedup import DedupIndex
 
 class ClientEditor(QWidget):
     """Widget for managing client information"""
 
-    def __init__(self, db_manager, parent=None):
+    def __init__(self, db_manager, client_store, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self.client_store = client_store
+        self.dedup_index = None
         self.setup_ui()
         self.load_state_codes()
         self.load_clients()
@@ -26,7 +30,7 @@ class ClientEditor(QWidget):
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search clients...")
-        self.search_input.textChanged.connect(self.load_clients)
+        self.search_input.textChanged.connect(self.filter_clients)
         search_layout.addWidget(self.search_input)
         left_layout.addLayout(search_layout)
 
@@ -44,6 +48,15 @@ class ClientEditor(QWidget):
         self.client_table.itemSelectionChanged.connect(self.load_selected_client)
         left_layout.addWidget(self.client_table)
 
+        # Keep the table in step with the shared client store
+        self.client_binding = TableBinding(self.client_store, self.client_table, [
+            lambda c: c['name'],
+            lambda c: c['client_type'],
+            lambda c: c['email'] or "",
+            lambda c: c['phone'] or "",
+            lambda c: c['state_name'] or ""
+        ])
+
         # Add client button
         self.add_button = QPushButton("Add New Client")
         self.add_button.clicked.connect(self.clear_form)
@@ -87,6 +100,20 @@ class ClientEditor(QWidget):
         self.state_combo = QComboBox()
         self.form_layout.addRow("State:", self.state_combo)
 
+        # Possible duplicates of what is being typed
+        self.duplicate_label = QLabel()
+        self.duplicate_label.setWordWrap(True)
+        self.duplicate_label.setStyleSheet("color: #b02a37;")
+        self.duplicate_label.hide()
+        self.form_layout.addRow("", self.duplicate_label)
+
+        self.duplicate_timer = QTimer(self)
+        self.duplicate_timer.setSingleShot(True)
+        self.duplicate_timer.setInterval(250)
+        self.duplicate_timer.timeout.connect(self.check_duplicates)
+        for edit in (self.name_edit, self.email_edit, self.phone_edit):
+            edit.textEdited.connect(self.duplicate_timer.start)
+
         # Address
         self.address_edit = QTextEdit()
         self.address_edit.setMaximumHeight(100)
@@ -175,30 +202,63 @@ class ClientEditor(QWidget):
 
     def load_clients(self):
         """Load clients into table"""
-        search_term = self.search_input.text()
-        clients = self.db_manager.get_clients(search_term)
-        
-        self.client_table.setRowCount(len(clients))
-        
-        for row, client in enumerate(clients):
-            self.client_table.setItem(
-                row, 0, QTableWidgetItem(client['name'])
-            )
-            self.client_table.setItem(
-                row, 1, QTableWidgetItem(client['client_type'])
-            )
-            self.client_table.setItem(
-                row, 2, QTableWidgetItem(client['email'] or "")
-            )
-            self.client_table.setItem(
-                row, 3, QTableWidgetItem(client['phone'] or "")
-            )
-            self.client_table.setItem(
-                row, 4, QTableWidgetItem(client['state_name'] or "")
-            )
-            
-            # Store client ID in the first cell
-            self.client_table.item(row, 0).setData(Qt.UserRole, client['id'])
+        self.client_store.ensure_loaded()
+        self.filter_clients()
+
+    def _ensure_dedup_index(self):
+        """Index the loaded clients for duplicate checks on first use"""
+        if self.dedup_index is not None:
+            return
+        self.dedup_index = DedupIndex()
+        self._rebuild_dedup_index()
+        self.client_store.rows_reset.connect(self._rebuild_dedup_index)
+        self.client_store.row_inserted.connect(
+            lambda position, client: self.dedup_index.add(client)
+        )
+        self.client_store.row_updated.connect(
+            lambda position, client: self.dedup_index.add(client)
+        )
+        self.client_store.row_removed.connect(self._dedup_client_removed)
+
+    def _rebuild_dedup_index(self):
+        self.dedup_index = DedupIndex()
+        for client in self.client_store.rows():
+            self.dedup_index.add(client)
+
+    def _dedup_client_removed(self, position, client_id):
+        # A client that only moved position is re-added by row_inserted
+        if self.client_store.get(client_id) is None:
+            self.dedup_index.remove(client_id)
+
+    @Slot()
+    def check_duplicates(self):
+        """Warn about existing clients that look like the one being edited"""
+        self._ensure_dedup_index()
+        matches = self.dedup_index.matches({
+            'id': self.current_client_id,
+            'name': self.name_edit.text(),
+            'email': self.email_edit.text(),
+            'phone': self.phone_edit.text()
+        }, limit=3)
+        if not matches:
+            self.duplicate_label.hide()
+            return
+        self.duplicate_label.setText("Possible duplicate of: " + "; ".join(
+            match['name'] for score, match in matches
+        ))
+        self.duplicate_label.show()
+
+    @Slot()
+    def filter_clients(self):
+        """Show only clients whose name or email matches the search box"""
+        search_term = self.search_input.text().strip().lower()
+        if not search_term:
+            self.client_binding.set_filter(None)
+            return
+        self.client_binding.set_filter(
+            lambda c: search_term in (c['name'] or "").lower()
+            or search_term in (c['email'] or "").lower()
+        )
 
     @Slot()
     def load_selected_client(self):
@@ -213,11 +273,7 @@ class ClientEditor(QWidget):
         ).data(Qt.UserRole)
 
         # Get client data
-        clients = self.db_manager.get_clients()
-        client = next(
-            (c for c in clients if c['id'] == self.current_client_id), 
-            None
-        )
+        client = self.client_store.full_row(self.current_client_id)
         
         if client:
             # Update form fields
@@ -230,6 +286,7 @@ class ClientEditor(QWidget):
             # Find and set the correct state in combo box
             state_index = self.state_combo.findData(client['state_code'])
             self.state_combo.setCurrentIndex(state_index)
+            self.duplicate_label.hide()
 
     @Slot()
     def clear_form(self):
@@ -241,6 +298,7 @@ class ClientEditor(QWidget):
         self.phone_edit.clear()
         self.address_edit.clear()
         self.state_combo.setCurrentIndex(0)
+        self.duplicate_label.hide()
         self.client_table.clearSelection()
 
     @Slot()
@@ -269,25 +327,37 @@ class ClientEditor(QWidget):
 
         if self.current_client_id is None:
             # Create new client
-            client_id = self.db_manager.create_client(client_data)
+            client_id = self.client_store.create(client_data)
             if client_id:
                 QMessageBox.information(
                     self,
                     "Success",
                     "Client created successfully."
                 )
+            else:
+                QMessageBox.critical(
+                    self,
+                    "Error",
+                    "Failed to save client."
+                )
+                return
         else:
             # Update existing client
             client_data['id'] = self.current_client_id
-            if self.db_manager.update_client(client_data):
+            if self.client_store.update(client_data):
                 QMessageBox.information(
                     self,
                     "Success",
                     "Client updated successfully."
                 )
+            else:
+                QMessageBox.critical(
+                    self,
+                    "Error",
+                    "Failed to save client."
+                )
+                return
 
-        # Refresh client list
-        self.load_clients()
         self.clear_form()
 
     @Slot()
@@ -305,13 +375,12 @@ class ClientEditor(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            if self.db_manager.delete_client(self.current_client_id):
+            if self.client_store.delete(self.current_client_id):
                 QMessageBox.information(
                     self,
                     "Success",
                     "Client deleted successfully."
                 )
-                self.load_clients()
                 self.clear_form()
             else:
                 QMessageBox.critical(
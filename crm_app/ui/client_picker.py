@@ -0,0 +1,171 @@
+from collections import OrderedDict
+from PySide6.QtWidgets import QLineEdit, QCompleter
+from PySide6.QtGui import QStandardItemModel, QStandardItem
+from PySide6.QtCore import Qt, Slot, Signal, QTimer, QModelIndex
+
+class ClientPicker(QLineEdit):
+    """Type-ahead client field that queries a ranked, limited set of matches
+
+    Nothing is loaded up front: matches are fetched through the regular
+    client search as the user types, so opening the contact form costs the
+    same no matter how many clients exist.
+    """
+
+    # Emitted with the client id once a client has been picked
+    client_picked = Signal(int)
+
+    MATCH_LIMIT = 20
+    TYPING_DELAY_MS = 200
+    RECENT_PICKS = 10
+    CACHED_SEARCHES = 50
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.setPlaceholderText("Type to search clients...")
+
+        self._client_id = None
+        self._label = ""
+        self._recent = OrderedDict()    # client id -> label, most recent last
+        self._searches = OrderedDict()  # search term -> [(id, label)]
+
+        self.match_model = QStandardItemModel(self)
+        self.completer = QCompleter(self.match_model, self)
+        # Matching already happened in the database, show every row as-is
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.completer.activated[QModelIndex].connect(self._match_activated)
+        self.setCompleter(self.completer)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.TYPING_DELAY_MS)
+        self.search_timer.timeout.connect(self._search)
+        self.textEdited.connect(self._text_edited)
+
+    def follow(self, client_store):
+        """Keep cached matches and recent picks in step with client writes"""
+        self.client_store = client_store
+        client_store.row_inserted.connect(self._client_changed)
+        client_store.row_updated.connect(self._client_changed)
+        client_store.row_removed.connect(self._client_removed)
+
+    def client_id(self):
+        """Id of the selected client, resolving typed text if needed"""
+        if self._client_id is None and self.text().strip():
+            self._client_id = self._resolve(self.text().strip())
+        return self._client_id
+
+    def set_client(self, client_id, label):
+        """Show a known client without querying the database"""
+        self._client_id = client_id
+        self._label = label
+        self.setText(label)
+
+    def clear_selection(self):
+        """Clear the field for a new entry"""
+        self._client_id = None
+        self._label = ""
+        self.clear()
+
+    @staticmethod
+    def client_label(client):
+        """Display text used for a client row"""
+        return f"{client['name']} ({client['client_type']})"
+
+    def focusInEvent(self, event):
+        """Offer recent picks when entering an empty field"""
+        super().focusInEvent(event)
+        if not self.text() and self._recent:
+            self._show(list(reversed(self._recent.items())))
+
+    @Slot(str)
+    def _text_edited(self, text):
+        # Any edit invalidates the previous pick until it is resolved again
+        if text != self._label:
+            self._client_id = None
+        self.search_timer.start()
+
+    @Slot()
+    def _search(self):
+        term = self.text().strip()
+        if term:
+            matches = self._matches(term)
+        else:
+            matches = list(reversed(self._recent.items()))
+        self._show(matches)
+
+    def _matches(self, term):
+        key = term.lower()
+        if key in self._searches:
+            self._searches.move_to_end(key)
+            return self._searches[key]
+
+        clients = self.db_manager.get_clients(term, limit=self.MATCH_LIMIT,
+                                              columns=['name', 'client_type'])
+        matches = [(c['id'], self.client_label(c)) for c in clients]
+        self._searches[key] = matches
+        if len(self._searches) > self.CACHED_SEARCHES:
+            self._searches.popitem(last=False)
+        return matches
+
+    def _show(self, matches):
+        self.match_model.clear()
+        for client_id, label in matches:
+            item = QStandardItem(label)
+            item.setData(client_id, Qt.UserRole)
+            self.match_model.appendRow(item)
+        if matches and self.hasFocus():
+            self.completer.complete()
+
+    @Slot(QModelIndex)
+    def _match_activated(self, index):
+        client_id = index.data(Qt.UserRole)
+        label = index.data(Qt.DisplayRole)
+        self.set_client(client_id, label)
+        self._remember(client_id, label)
+        self.client_picked.emit(client_id)
+
+    def _remember(self, client_id, label):
+        self._recent[client_id] = label
+        self._recent.move_to_end(client_id)
+        if len(self._recent) > self.RECENT_PICKS:
+            self._recent.popitem(last=False)
+
+    def _resolve(self, text):
+        """Find the client for text typed without picking from the list"""
+        for client_id, label in self._recent.items():
+            if label == text:
+                return client_id
+        for row in range(self.match_model.rowCount()):
+            item = self.match_model.item(row)
+            if item.text() == text:
+                return item.data(Qt.UserRole)
+
+        # Fall back to an exact name match, refusing ambiguous names
+        clients = self.db_manager.get_clients(text, limit=2,
+                                              columns=['name', 'client_type'])
+        exact = [c for c in clients if c['name'].lower() == text.lower()]
+        if len(exact) == 1:
+            self._remember(exact[0]['id'], self.client_label(exact[0]))
+            return exact[0]['id']
+        return None
+
+    @Slot(int, object)
+    def _client_changed(self, position, client):
+        self._searches.clear()
+        label = self.client_label(client)
+        if client['id'] in self._recent:
+            self._recent[client['id']] = label
+        if client['id'] == self._client_id:
+            self.set_client(client['id'], label)
+
+    @Slot(int, int)
+    def _client_removed(self, position, client_id):
+        self._searches.clear()
+        # A client that only moved position is still known by id
+        if self.client_store.get(client_id) is not None:
+            return
+        self._recent.pop(client_id, None)
+        if self._client_id == client_id:
+            self.clear_selection()
@@ -0,0 +1,138 @@
+from datetime import datetime
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+                              QPlainTextEdit, QFileDialog, QMessageBox,
+                              QApplication)
+from PySide6.QtCore import QEvent, QTimer, Slot
+from PySide6.QtGui import QFontDatabase
+from diagnostics import diagnostics
+
+class DiagnosticsPanel(QDialog):
+    """Hidden support view of diagnostics.report(), opened with Ctrl+Shift+D"""
+
+    # How long after the profiled click or key press profiling continues,
+    # so debounced timers and queued slots it starts are captured too
+    PROFILE_TAIL_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._profile_armed = False
+        self.setup_ui()
+
+        # Refresh while shown
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(2000)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def setup_ui(self):
+        """Initialize the user interface"""
+        self.setWindowTitle("Diagnostics")
+        self.resize(900, 700)
+        layout = QVBoxLayout(self)
+
+        self.report_view = QPlainTextEdit()
+        self.report_view.setReadOnly(True)
+        self.report_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.report_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        layout.addWidget(self.report_view)
+
+        button_layout = QHBoxLayout()
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(self.refresh)
+        button_layout.addWidget(self.refresh_button)
+
+        self.trace_button = QPushButton("Trace Memory")
+        self.trace_button.setCheckable(True)
+        self.trace_button.setToolTip(
+            "Track allocations to list the top allocators; slows the app while on"
+        )
+        self.trace_button.toggled.connect(self.toggle_tracing)
+        button_layout.addWidget(self.trace_button)
+
+        self.profile_button = QPushButton("Profile Next Action")
+        self.profile_button.setToolTip(
+            "Profile the next click or key press in the main window"
+        )
+        self.profile_button.clicked.connect(self.arm_profile)
+        button_layout.addWidget(self.profile_button)
+
+        button_layout.addStretch()
+
+        self.save_button = QPushButton("Save to File...")
+        self.save_button.clicked.connect(self.save_report)
+        button_layout.addWidget(self.save_button)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    @Slot()
+    def refresh(self):
+        """Re-render the report, keeping the scroll position"""
+        scroll_bar = self.report_view.verticalScrollBar()
+        position = scroll_bar.value()
+        self.report_view.setPlainText(diagnostics.report())
+        scroll_bar.setValue(position)
+
+    @Slot(bool)
+    def toggle_tracing(self, enabled):
+        if enabled:
+            diagnostics.start_tracing()
+        else:
+            diagnostics.stop_tracing()
+        self.refresh()
+
+    @Slot()
+    def arm_profile(self):
+        """Start profiling at the next user input outside this panel"""
+        if self._profile_armed or diagnostics.profiling:
+            return
+        self._profile_armed = True
+        self.profile_button.setText("Waiting for Action...")
+        QApplication.instance().installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if (self._profile_armed
+                and event.type() in (QEvent.MouseButtonPress, QEvent.KeyPress)
+                and hasattr(watched, 'window') and watched.window() is not self):
+            self._profile_armed = False
+            QApplication.instance().removeEventFilter(self)
+            self.profile_button.setText("Profiling...")
+            diagnostics.profile_start()
+            QTimer.singleShot(self.PROFILE_TAIL_MS, self._finish_profile)
+        return super().eventFilter(watched, event)
+
+    @Slot()
+    def _finish_profile(self):
+        diagnostics.profile_stop()
+        self.profile_button.setText("Profile Next Action")
+        self.refresh()
+        # Scroll to the profile, at the end of the report
+        self.report_view.verticalScrollBar().setValue(
+            self.report_view.verticalScrollBar().maximum()
+        )
+        self.raise_()
+
+    @Slot()
+    def save_report(self):
+        """Write the full report to a file for support"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Diagnostics",
+            f"crm-diagnostics-{datetime.now():%Y%m%d-%H%M%S}.txt",
+            "Text Files (*.txt)"
+        )
+        if not path:
+            return
+        try:
+            diagnostics.dump(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Could not save diagnostics: {e}")
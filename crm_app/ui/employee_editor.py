@@ -3,14 +3,15 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                               QLineEdit, QComboBox, QLabel, QMessageBox,
                               QHeaderView)
 from PySide6.QtCore import Qt, Slot
-import bcrypt
+from data_store import TableBinding
 
 class EmployeeEditor(QWidget):
     """Widget for managing employee information"""
 
-    def __init__(self, db_manager, parent=None):
+    def __init__(self, db_manager, employee_store, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self.employee_store = employee_store
         self.setup_ui()
         self.load_employees()
 
@@ -24,9 +25,9 @@ class EmployeeEditor(QWidget):
 
         # Employee table
         self.employee_table = QTableWidget()
-        self.employee_table.setColumnCount(3)
+        self.employee_table.setColumnCount(4)
         self.employee_table.setHorizontalHeaderLabels([
-            "Name", "Login ID", "Role"
+            "Name", "Login ID", "Role", "Territory"
         ])
         self.employee_table.horizontalHeader().setSectionResizeMode(
             QHeaderView.Stretch
@@ -36,6 +37,16 @@ class EmployeeEditor(QWidget):
         self.employee_table.itemSelectionChanged.connect(self.load_selected_employee)
         left_layout.addWidget(self.employee_table)
 
+        # Keep the table in step with the shared employee store
+        self.employee_binding = TableBinding(
+            self.employee_store, self.employee_table, [
+                lambda e: e['name'],
+                lambda e: e['login_id'],
+                lambda e: e['role'],
+                lambda e: e.get('territory') or ""
+            ]
+        )
+
         # Add employee button
         self.add_button = QPushButton("Add New Employee")
         self.add_button.clicked.connect(self.clear_form)
@@ -81,6 +92,16 @@ class EmployeeEditor(QWidget):
         self.role_combo.addItems(["employee", "manager"])
         self.form_layout.addRow("Role:", self.role_combo)
 
+        # Territory, for automatic contact assignment
+        self.territory_combo = QComboBox()
+        self.territory_combo.addItem("", "")  # No territory
+        for state in self.db_manager.get_state_codes():
+            self.territory_combo.addItem(
+                f"{state['code']} - {state['description']}",
+                state['code']
+            )
+        self.form_layout.addRow("Territory:", self.territory_combo)
+
         # Password note
         password_note = QLabel(
             "Note: Leave password fields empty to keep existing password"
@@ -160,23 +181,7 @@ class EmployeeEditor(QWidget):
 
     def load_employees(self):
         """Load employees into table"""
-        employees = self.db_manager.get_employees()
-        
-        self.employee_table.setRowCount(len(employees))
-        
-        for row, employee in enumerate(employees):
-            self.employee_table.setItem(
-                row, 0, QTableWidgetItem(employee['name'])
-            )
-            self.employee_table.setItem(
-                row, 1, QTableWidgetItem(employee['login_id'])
-            )
-            self.employee_table.setItem(
-                row, 2, QTableWidgetItem(employee['role'])
-            )
-            
-            # Store employee ID in the first cell
-            self.employee_table.item(row, 0).setData(Qt.UserRole, employee['id'])
+        self.employee_store.ensure_loaded()
 
     @Slot()
     def load_selected_employee(self):
@@ -191,17 +196,16 @@ class EmployeeEditor(QWidget):
         ).data(Qt.UserRole)
 
         # Get employee data
-        employees = self.db_manager.get_employees()
-        employee = next(
-            (e for e in employees if e['id'] == self.current_employee_id), 
-            None
-        )
+        employee = self.employee_store.get(self.current_employee_id)
         
         if employee:
             # Update form fields
             self.name_edit.setText(employee['name'])
             self.login_id_edit.setText(employee['login_id'])
             self.role_combo.setCurrentText(employee['role'])
+            self.territory_combo.setCurrentIndex(
+                max(0, self.territory_combo.findData(employee.get('territory') or ""))
+            )
             
             # Clear password fields
             self.password_edit.clear()
@@ -216,6 +220,7 @@ class EmployeeEditor(QWidget):
         self.password_edit.clear()
         self.confirm_password_edit.clear()
         self.role_combo.setCurrentIndex(0)
+        self.territory_combo.setCurrentIndex(0)
         self.employee_table.clearSelection()
 
     @Slot()
@@ -259,7 +264,8 @@ class EmployeeEditor(QWidget):
         employee_data = {
             'name': name,
             'login_id': login_id,
-            'role': role
+            'role': role,
+            'territory': self.territory_combo.currentData() or None
         }
 
         if password:
@@ -267,25 +273,37 @@ class EmployeeEditor(QWidget):
 
         if self.current_employee_id is None:
             # Create new employee
-            employee_id = self.db_manager.create_employee(employee_data)
+            employee_id = self.employee_store.create(employee_data)
             if employee_id:
                 QMessageBox.information(
                     self,
                     "Success",
                     "Employee created successfully."
                 )
+            else:
+                QMessageBox.critical(
+                    self,
+                    "Error",
+                    "Failed to save employee."
+                )
+                return
         else:
             # Update existing employee
             employee_data['id'] = self.current_employee_id
-            if self.db_manager.update_employee(employee_data):
+            if self.employee_store.update(employee_data):
                 QMessageBox.information(
                     self,
                     "Success",
                     "Employee updated successfully."
                 )
+            else:
+                QMessageBox.critical(
+                    self,
+                    "Error",
+                    "Failed to save employee."
+                )
+                return
 
-        # Refresh employee list
-        self.load_employees()
         self.clear_form()
 
     @Slot()
@@ -303,13 +321,12 @@ class EmployeeEditor(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            if self.db_manager.delete_employee(self.current_employee_id):
+            if self.employee_store.delete(self.current_employee_id):
                 QMessageBox.information(
                     self,
                     "Success",
                     "Employee deleted successfully."
                 )
-                self.load_employees()
                 self.clear_form()
             else:
                 QMessageBox.critical(
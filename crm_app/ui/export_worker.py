@@ -0,0 +1,51 @@
+import os
+from PySide6.QtCore import QThread, Signal
+from report_export import ExportCancelled, export_report
+
+class ReportExportWorker(QThread):
+    """Export a report in the background over a connection of its own"""
+
+    # Emitted with (rows written, total rows)
+    progress = Signal(int, int)
+    # Emitted with the number of rows written once the file is complete
+    completed = Signal(int)
+    # Emitted with an error message; cancellation reports no error
+    failed = Signal(str)
+
+    def __init__(self, db_manager, path, filters, total, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager.clone()
+        self.path = path
+        self.filters = filters
+        self.total = total
+        self._cancelled = False
+
+    def cancel(self):
+        """Ask the export to stop after the current batch"""
+        self._cancelled = True
+
+    def run(self):
+        """Stream the report to file"""
+        if not self.db_manager.connect():
+            self.failed.emit("Could not connect to the database.")
+            return
+        try:
+            written = export_report(
+                self.db_manager, self.path,
+                progress=lambda n: self.progress.emit(n, self.total),
+                cancelled=lambda: self._cancelled,
+                **self.filters
+            )
+            self.completed.emit(written)
+        except ExportCancelled:
+            self._remove_partial_file()
+            self.failed.emit("")
+        except Exception as e:
+            self._remove_partial_file()
+            self.failed.emit(str(e))
+        finally:
+            self.db_manager.close()
+
+    def _remove_partial_file(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,7 +1,9 @@
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                               QPushButton, QLabel, QStackedWidget, QMessageBox)
-from PySide6.QtCore import Qt, Slot
-from PySide6.QtGui import QIcon, QFont
+from PySide6.QtCore import Qt, Slot, QTimer
+from PySide6.QtGui import QIcon, QFont, QKeySequence, QShortcut
+import time
+from diagnostics import diagnostics
 
 class MainWindow(QMainWindow):
     """Main window of the CRM application"""
@@ -10,8 +12,12 @@ class MainWindow(QMainWindow):
         super().__init__(parent)
         self.db_manager = db_manager
         self.user_data = user_data  # Contains user id, name, role, etc.
+        self.diagnostics_panel = None
         self.setup_ui()
 
+        # Hidden support view; see diagnostics.py
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.show_diagnostics)
+
     def setup_ui(self):
         """Initialize the user interface"""
         self.setWindowTitle("Business CRM")
@@ -151,14 +157,49 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             self.close()
 
+    @Slot(object)
+    def show_reminder(self, contact):
+        """Show a non-blocking reminder for an upcoming contact"""
+        reminder = QMessageBox(self)
+        reminder.setWindowTitle("Upcoming Contact")
+        reminder.setIcon(QMessageBox.Information)
+        reminder.setText(
+            f"{contact['contact_datetime'].strftime('%H:%M')} - "
+            f"{contact['client_name']} ({contact['contact_method']})"
+        )
+        # Contact lists carry a notes preview at most
+        notes = self.db_manager.get_contact_notes(contact['id'])
+        if notes:
+            reminder.setInformativeText(notes)
+        reminder.setAttribute(Qt.WA_DeleteOnClose)
+        reminder.setModal(False)
+        reminder.show()
+
+    @Slot()
+    def show_diagnostics(self):
+        """Open the diagnostics panel"""
+        if self.diagnostics_panel is None:
+            from ui.diagnostics_panel import DiagnosticsPanel
+            self.diagnostics_panel = DiagnosticsPanel(self)
+        self.diagnostics_panel.show()
+        self.diagnostics_panel.raise_()
+
     def add_widget(self, name, widget):
         """Add a widget to the content stack"""
         self.content_stack.addWidget(widget)
         if name in self.nav_buttons:
             self.nav_buttons[name].clicked.connect(
-                lambda: self.content_stack.setCurrentWidget(widget)
+                lambda: self.switch_to(name, widget)
             )
 
+    def switch_to(self, name, widget):
+        """Show a tab, timing it until the event loop is idle again"""
+        started = time.perf_counter()
+        self.content_stack.setCurrentWidget(widget)
+        QTimer.singleShot(0, lambda: diagnostics.record_tab_switch(
+            name, time.perf_counter() - started
+        ))
+
     def closeEvent(self, event):
         """Handle window close event"""
         self.db_manager.close()
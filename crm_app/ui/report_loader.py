@@ -0,0 +1,47 @@
+from PySide6.QtCore import QThread, Signal
+from database import CancelToken
+
+class ReportLoadWorker(QThread):
+    """Fetch report data in the background so a slow query can be cancelled
+
+    Runs on a manager of its own, re-used by every load of the viewer and
+    reconnected before each one if the server dropped it while idle; only
+    one load runs on it at a time. fetch(db_manager, token) does the
+    querying and returns the result, or None if the token interrupted it.
+    """
+
+    # Emitted with the fetched result
+    loaded = Signal(object)
+    # Emitted with an error message; cancellation reports no error
+    failed = Signal(str)
+
+    # Loads taking longer than this are stopped and reported
+    TIMEOUT = 30.0
+
+    def __init__(self, db_manager, fetch, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.fetch = fetch
+        self.token = CancelToken(self.TIMEOUT)
+
+    def cancel(self):
+        """Stop the load, killing its query on the server"""
+        self.token.cancel()
+
+    def run(self):
+        try:
+            if not self.db_manager.ensure_connected():
+                self.failed.emit("Could not connect to the database.")
+                return
+            result = self.fetch(self.db_manager, self.token)
+            if self.token.timed_out:
+                self.failed.emit(
+                    f"The report took longer than {self.TIMEOUT:.0f} seconds "
+                    "and was stopped. Try a shorter date range."
+                )
+            elif result is None or self.token.cancelled:
+                self.failed.emit("")
+            else:
+                self.loaded.emit(result)
+        finally:
+            self.token.finish()
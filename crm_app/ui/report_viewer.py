@@ -1,17 +1,55 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                               QTableWidget, QTableWidgetItem, QLabel,
-                              QDateEdit, QComboBox, QHeaderView)
-from PySide6.QtCore import Qt, Slot, QDate
+                              QDateEdit, QComboBox, QHeaderView, QFileDialog,
+                              QProgressDialog, QMessageBox, QTabWidget)
+from PySide6.QtCore import Qt, Slot, QDate, QTimer
 from datetime import datetime, timedelta
+from data_store import ComboBinding, ReportStore, TableBinding
+from report_cache import ReportCache
+from diagnostics import diagnostics
+from trends import load_trends
+from ui.trend_chart import TrendCharts
+from ui.analytics_view import AnalyticsView
+from ui.export_worker import ReportExportWorker
+from ui.report_loader import ReportLoadWorker
 
 class ReportViewer(QWidget):
     """Widget for viewing contact reports with role-based filtering"""
 
-    def __init__(self, db_manager, user_data, parent=None):
+    def __init__(self, db_manager, user_data, employee_store, contact_store,
+                 parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
         self.user_data = user_data  # Contains user id, role, etc.
+        self.employee_store = employee_store
+        self.report_cache = ReportCache(db_manager)
+        diagnostics.watch_cache('Report cache', self.report_cache)
+        self.report_store = ReportStore(
+            db_manager, user_data, self.report_cache, self
+        )
+        # Reports load on a worker thread over this manager's connection
+        self.load_manager = db_manager.clone()
+        self.load_worker = None
+        self.reload_pending = False
+        # Trends load alongside, over a connection of their own
+        self.trend_manager = db_manager.clone()
+        self.trend_worker = None
+        self.trends_pending = False
+        # Set when cached rows were dropped while the viewer was hidden
+        self.report_stale = False
         self.setup_ui()
+
+        # Contact writes, ours or other users' applied by the change feed,
+        # invalidate only the cached days they touch; the report on screen
+        # is reloaded once per burst of them
+        self.invalidated_timer = QTimer(self)
+        self.invalidated_timer.setSingleShot(True)
+        self.invalidated_timer.setInterval(250)
+        self.invalidated_timer.timeout.connect(self._reload_invalidated)
+        contact_store.row_inserted.connect(self._contact_changed)
+        contact_store.row_updated.connect(self._contact_changed)
+        contact_store.row_removed.connect(self._contact_removed)
+        contact_store.series_changed.connect(self.series_changed)
         self.load_reports()
 
     def setup_ui(self):
@@ -51,6 +89,10 @@ class ReportViewer(QWidget):
         if self.user_data['role'] == 'manager':
             self.employee_combo = QComboBox()
             self.employee_combo.addItem("All Employees")
+            self.employee_binding = ComboBinding(
+                self.employee_store, self.employee_combo,
+                lambda e: e['name'], leading=1
+            )
             self.load_employees()
             filter_layout.addWidget(self.employee_combo)
 
@@ -70,6 +112,29 @@ class ReportViewer(QWidget):
         """)
         filter_layout.addWidget(self.refresh_button)
 
+        # Shown while a report is loading
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setToolTip("Stop the report query")
+        self.cancel_button.clicked.connect(self.cancel_load)
+        self.cancel_button.hide()
+        filter_layout.addWidget(self.cancel_button)
+
+        # Export button
+        self.export_button = QPushButton("Export...")
+        self.export_button.clicked.connect(self.export_reports)
+        self.export_button.setStyleSheet("""
+            QPushButton {
+                background-color: #198754;
+                color: white;
+                padding: 8px 16px;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #157347;
+            }
+        """)
+        filter_layout.addWidget(self.export_button)
+
         layout.addLayout(filter_layout)
 
         # Reports table
@@ -82,7 +147,35 @@ class ReportViewer(QWidget):
         self.report_table.horizontalHeader().setSectionResizeMode(
             QHeaderView.Stretch
         )
-        layout.addWidget(self.report_table)
+
+        # Table and trend charts of the same filters
+        self.view_tabs = QTabWidget()
+        self.view_tabs.addTab(self.report_table, "Table")
+        self.trend_charts = TrendCharts()
+        self.trend_charts.width_changed.connect(self.load_trends)
+        self.view_tabs.addTab(self.trend_charts, "Trends")
+        self.view_tabs.currentChanged.connect(self.load_trends)
+
+        # Conversion analytics span every employee, so managers only
+        self.analytics_view = None
+        if self.user_data['role'] == 'manager':
+            self.analytics_view = AnalyticsView(self.db_manager)
+            self.view_tabs.addTab(self.analytics_view, "Analytics")
+            self.view_tabs.currentChanged.connect(self.load_analytics)
+        layout.addWidget(self.view_tabs)
+
+        # Refreshes only touch the rows that changed
+        self.report_binding = TableBinding(
+            self.report_store, self.report_table, [
+                lambda c: c['contact_datetime'].strftime("%Y-%m-%d %H:%M"),
+                lambda c: c['client_name'],
+                lambda c: c['client_type'],
+                lambda c: c['employee_name'],
+                lambda c: c['contact_method'],
+                lambda c: str(c['conversion_rating']) if c['conversion_rating'] else "",
+                lambda c: c['status']
+            ]
+        )
 
         # Summary section
         summary_layout = QHBoxLayout()
@@ -135,12 +228,7 @@ class ReportViewer(QWidget):
 
     def load_employees(self):
         """Load employees into combo box (manager only)"""
-        employees = self.db_manager.get_employees()
-        for employee in employees:
-            self.employee_combo.addItem(
-                employee['name'],
-                employee['id']
-            )
+        self.employee_store.ensure_loaded()
 
     @Slot(str)
     def update_date_range(self, period):
@@ -163,73 +251,136 @@ class ReportViewer(QWidget):
             self.start_date.setDate(today.addDays(-30))
             self.end_date.setDate(today)
 
-    def load_reports(self):
-        """Load reports into table based on filters"""
-        # Get filter values
-        start_date = self.start_date.date().toPython()
-        end_date = self.end_date.date().toPython()
+        # Quick periods are usually cached, so show them right away
+        if period != "Custom Range":
+            self.load_reports()
+
+    @Slot(int, object)
+    def _contact_changed(self, position, contact):
+        self.report_cache.invalidate_contact(
+            contact['id'], contact['contact_datetime']
+        )
+        # A stored series occurrence replaces the one expanded on its day
+        if contact.get('occurrence_at'):
+            self.report_cache.invalidate_day(contact['occurrence_at'].date())
+        self.invalidated_timer.start()
+
+    @Slot(int, int)
+    def _contact_removed(self, position, contact_id):
+        self.report_cache.invalidate_contact(contact_id)
+        self.invalidated_timer.start()
+
+    @Slot()
+    def series_changed(self):
+        """Forget cached rows once a recurring series was added or ended"""
+        self.report_cache.clear()
+        self.invalidated_timer.start()
+
+    @Slot()
+    def _reload_invalidated(self):
+        if self.isVisible():
+            self.load_reports()
+        else:
+            self.report_stale = True
+
+    def showEvent(self, event):
+        """Catch up on writes made while another tab was shown"""
+        super().showEvent(event)
+        if self.report_stale:
+            self.load_reports()
+
+    def current_filters(self):
+        """Filter values as keyword arguments for the report queries"""
         status = self.status_combo.currentText()
-        
+
         # Get employee ID filter (managers only)
         employee_id = None
         if self.user_data['role'] == 'manager' and \
            self.employee_combo.currentText() != "All Employees":
             employee_id = self.employee_combo.currentData()
-        
+
         # If not manager, always filter by current employee
         if self.user_data['role'] != 'manager':
             employee_id = self.user_data['id']
 
-        # Get contacts
-        contacts = self.db_manager.get_employee_contacts(
-            employee_id if employee_id else self.user_data['id'],
-            self.user_data['role'] == 'manager',
-            start_date
+        return {
+            'start_date': self.start_date.date().toPython(),
+            'end_date': self.end_date.date().toPython(),
+            'status': None if status == "All Status" else status,
+            'employee_id': employee_id
+        }
+
+    def load_reports(self):
+        """Load reports into table based on filters, in the background"""
+        self.report_stale = False
+        filters = self.current_filters()
+        self.report_store.set_filters(
+            filters['start_date'], filters['end_date'],
+            filters['status'], filters['employee_id']
         )
 
-        # Filter contacts
-        filtered_contacts = [
-            c for c in contacts
-            if start_date <= c['contact_datetime'].date() <= end_date
-            and (status == "All Status" or c['status'] == status)
-        ]
+        # One load at a time on the worker connection; a newer request
+        # stops the running one and starts when it is gone
+        if self.load_worker is not None:
+            self.reload_pending = True
+            self.load_worker.cancel()
+            return
 
-        # Update table
-        self.report_table.setRowCount(len(filtered_contacts))
-        
-        for row, contact in enumerate(filtered_contacts):
-            # Date/Time
-            dt = contact['contact_datetime'].strftime("%Y-%m-%d %H:%M")
-            self.report_table.setItem(row, 0, QTableWidgetItem(dt))
-            
-            # Client Name
-            self.report_table.setItem(
-                row, 1, QTableWidgetItem(contact['client_name'])
-            )
-            
-            # Client Type
-            self.report_table.setItem(
-                row, 2, QTableWidgetItem(contact['client_type'])
-            )
-            
-            # Employee
-            self.report_table.setItem(
-                row, 3, QTableWidgetItem(contact['employee_name'])
-            )
-            
-            # Method
-            self.report_table.setItem(
-                row, 4, QTableWidgetItem(contact['contact_method'])
-            )
-            
-            # Rating
-            rating = str(contact['conversion_rating']) if contact['conversion_rating'] else ""
-            self.report_table.setItem(row, 5, QTableWidgetItem(rating))
-            
-            # Status
-            self.report_table.setItem(
-                row, 6, QTableWidgetItem(contact['status'])
-            )
+        query = self.report_store.cache_query()
+        self.load_worker = ReportLoadWorker(
+            self.load_manager,
+            lambda db_manager, token: self.report_cache.get(
+                *query, db_manager=db_manager, token=token
+            ),
+            parent=self
+        )
+        self.load_worker.loaded.connect(self._report_loaded)
+        self.load_worker.failed.connect(self._report_failed)
+        self.load_worker.finished.connect(self._load_finished)
+        self.total_label.setText("Loading...")
+        self.cancel_button.show()
+        self.load_worker.start()
+
+    @Slot()
+    def cancel_load(self):
+        """Stop the running loads, killing their queries on the server"""
+        self.reload_pending = False
+        self.trends_pending = False
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+        if self.trend_worker is not None:
+            self.trend_worker.cancel()
+
+    @Slot(object)
+    def _report_loaded(self, rows):
+        if self.reload_pending:
+            # Superseded by newer filters before the cancel took effect
+            return
+        # Apply the rows; only rows that changed are redrawn
+        self.report_store.refresh(rows)
+        self.show_summary()
+        self.load_trends()
+        self.load_analytics()
+
+    @Slot(str)
+    def _report_failed(self, message):
+        # The table keeps the last rows that did load
+        self.show_summary()
+        if message and not self.reload_pending:
+            QMessageBox.warning(self, "Report Not Loaded", message)
+
+    @Slot()
+    def _load_finished(self):
+        self.load_worker.deleteLater()
+        self.load_worker = None
+        self.cancel_button.hide()
+        if self.reload_pending:
+            self.reload_pending = False
+            self.load_reports()
+
+    def show_summary(self):
+        """Update the totals below the table from the loaded rows"""
+        filtered_contacts = self.report_store.rows()
 
         # Update summary
         total_contacts = len(filtered_contacts)
@@ -250,3 +401,135 @@ class ReportViewer(QWidget):
         self.completion_label.setText(
             f"Completion Rate: {completion_rate:.1f}%"
         )
+
+    @Slot()
+    def load_trends(self, *args):
+        """Load bucketed trends for the current filters, if they are shown
+
+        Like reports, trends load in the background and a newer request
+        stops the running one.
+        """
+        if self.view_tabs.currentWidget() is not self.trend_charts:
+            return
+        if self.trend_worker is not None:
+            self.trends_pending = True
+            self.trend_worker.cancel()
+            return
+
+        filters = self.current_filters()
+        width = self.trend_charts.plot_width()
+        self.trend_worker = ReportLoadWorker(
+            self.trend_manager,
+            lambda db_manager, token: self._fetch_trends(
+                db_manager, token, filters, width
+            ),
+            parent=self
+        )
+        self.trend_worker.loaded.connect(self._trends_loaded)
+        self.trend_worker.failed.connect(self._trends_failed)
+        self.trend_worker.finished.connect(self._trends_finished)
+        self.trend_worker.start()
+
+    @staticmethod
+    def _fetch_trends(db_manager, token, filters, width):
+        """Runs on the trend worker; None if the token interrupted it"""
+        with db_manager.running(token) as allowed:
+            if not allowed:
+                return None
+            buckets = load_trends(
+                db_manager,
+                filters['start_date'],
+                filters['end_date'],
+                width,
+                filters['employee_id']
+            )
+        return None if token.interrupted else buckets
+
+    @Slot(object)
+    def _trends_loaded(self, buckets):
+        if not self.trends_pending:
+            self.trend_charts.set_buckets(buckets)
+
+    @Slot(str)
+    def _trends_failed(self, message):
+        # The charts keep the last trends that did load
+        if message and not self.trends_pending:
+            QMessageBox.warning(self, "Trends Not Loaded", message)
+
+    @Slot()
+    def _trends_finished(self):
+        self.trend_worker.deleteLater()
+        self.trend_worker = None
+        if self.trends_pending:
+            self.trends_pending = False
+            self.load_trends()
+
+    @Slot()
+    def load_analytics(self, *args):
+        """Run the conversion analyses for the current dates, if shown"""
+        if self.analytics_view is None or \
+           self.view_tabs.currentWidget() is not self.analytics_view:
+            return
+        filters = self.current_filters()
+        self.analytics_view.load(filters['start_date'], filters['end_date'])
+
+    @Slot()
+    def export_reports(self):
+        """Stream the filtered report to a file in the background"""
+        path, selected = QFileDialog.getSaveFileName(
+            self,
+            "Export Report",
+            "contact_report.csv",
+            "CSV (*.csv);;Compressed CSV (*.csv.gz);;Excel (*.xlsx)"
+        )
+        if not path:
+            return
+
+        # The format follows the extension; add the one for the chosen filter
+        extensions = (".csv.gz", ".xlsx", ".csv")
+        if not path.lower().endswith(extensions):
+            path += next(e for e in extensions if e[1:] in selected)
+
+        filters = self.current_filters()
+        total = self.db_manager.count_report_contacts(**filters)
+
+        self.export_progress = QProgressDialog(
+            "Exporting report...", "Cancel", 0, max(total, 1), self
+        )
+        self.export_progress.setWindowTitle("Export")
+        self.export_progress.setMinimumDuration(500)
+
+        self.export_worker = ReportExportWorker(
+            self.db_manager, path, filters, total, self
+        )
+        self.export_worker.progress.connect(
+            lambda written, total: self.export_progress.setValue(
+                min(written, max(total, 1))
+            )
+        )
+        self.export_worker.completed.connect(self._export_completed)
+        self.export_worker.failed.connect(self._export_failed)
+        self.export_progress.canceled.connect(self.export_worker.cancel)
+        self.export_button.setEnabled(False)
+        self.export_worker.start()
+
+    @Slot(int)
+    def _export_completed(self, written):
+        self.export_progress.reset()
+        self.export_button.setEnabled(True)
+        QMessageBox.information(
+            self,
+            "Export Complete",
+            f"Exported {written} contacts."
+        )
+
+    @Slot(str)
+    def _export_failed(self, message):
+        self.export_progress.reset()
+        self.export_button.setEnabled(True)
+        if message:
+            QMessageBox.critical(
+                self,
+                "Export Failed",
+                message
+            )
@@ -1,17 +1,48 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                               QTableWidget, QTableWidgetItem, QFormLayout,
                               QLineEdit, QComboBox, QTextEdit, QLabel,
-                              QMessageBox, QHeaderView, QDateTimeEdit)
-from PySide6.QtCore import Qt, Slot, QDateTime
-from datetime import datetime
+                              QMessageBox, QHeaderView, QDateTimeEdit,
+                              QTabWidget, QSpinBox, QDateEdit, QCheckBox)
+from PySide6.QtCore import Qt, Slot, QDate, QDateTime, QTimer
+from datetime import datetime, timedelta
+from data_store import TableBinding
+from scheduling import (DEFAULT_DURATION, MAX_DURATION, ScheduleIndex,
+                        occurrence_id, occurrence_times)
+from ui.client_picker import ClientPicker
+from ui.calendar_view import ContactCalendar
+from ui.assignment_dialog import AssignmentDialog
+
+# Repeat choices for a new contact: label and (frequency, every), or None
+REPEAT_CHOICES = [
+    ("Does not repeat", None),
+    ("Weekly", ('weekly', 1)),
+    ("Every 2 weeks", ('weekly', 2)),
+    ("Monthly", ('monthly', 1)),
+    ("Every 3 months", ('monthly', 3)),
+]
+
+# How far ahead the list shows series occurrences
+UPCOMING_DAYS = 28
+# Series occurrences indexed for conflict checks: from the day before the
+# booking over next_free_slot's default 90-day horizon, re-read once the
+# booking moves more than a week on
+OCCURRENCE_INDEX_DAYS = 98
 
 class ScheduleManager(QWidget):
     """Widget for managing client contact schedules"""
 
-    def __init__(self, db_manager, user_data, parent=None):
+    def __init__(self, db_manager, user_data, contact_store, client_store,
+                 parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
         self.user_data = user_data  # Contains user id, role, etc.
+        self.contact_store = contact_store
+        self.client_store = client_store
+        # Built on the first conflict check
+        self.schedule_index = None
+        # Series occurrences in the index: id -> row, and their window
+        self.indexed_occurrences = {}
+        self.occurrence_window = None
         self.setup_ui()
         self.load_contacts()
 
@@ -35,7 +66,55 @@ class ScheduleManager(QWidget):
         self.contact_table.setSelectionBehavior(QTableWidget.SelectRows)
         self.contact_table.setSelectionMode(QTableWidget.SingleSelection)
         self.contact_table.itemSelectionChanged.connect(self.load_selected_contact)
-        left_layout.addWidget(self.contact_table)
+
+        # Series occurrences are not store rows; the coming ones are
+        # listed under the contacts, expanded like the calendar's window
+        self.occurrence_table = QTableWidget()
+        self.occurrence_table.setColumnCount(4)
+        self.occurrence_table.setHorizontalHeaderLabels([
+            "Client Name", "Date/Time", "Method", "Notes"
+        ])
+        self.occurrence_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.Stretch
+        )
+        self.occurrence_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.occurrence_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.occurrence_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.occurrence_table.itemSelectionChanged.connect(
+            self.load_selected_occurrence
+        )
+        self.upcoming = []
+
+        self.list_widget = QWidget()
+        list_layout = QVBoxLayout(self.list_widget)
+        list_layout.setContentsMargins(0, 0, 0, 0)
+        list_layout.addWidget(self.contact_table, 3)
+        list_layout.addWidget(QLabel(f"Recurring, next {UPCOMING_DAYS} days:"))
+        list_layout.addWidget(self.occurrence_table, 1)
+
+        # List and calendar views of the same schedule
+        self.view_tabs = QTabWidget()
+        self.view_tabs.addTab(self.list_widget, "List")
+        self.calendar = ContactCalendar(
+            self.db_manager, self.user_data, self.contact_store
+        )
+        self.calendar.contact_activated.connect(self.select_contact)
+        self.calendar.occurrence_activated.connect(self.load_occurrence)
+        self.view_tabs.addTab(self.calendar, "Calendar")
+        self.view_tabs.addTab(self.create_search_tab(), "Search Notes")
+        left_layout.addWidget(self.view_tabs)
+
+        # Keep the table in step with the shared contact store
+        self.contact_binding = TableBinding(
+            self.contact_store, self.contact_table, [
+                lambda c: c['client_name'],
+                lambda c: c['contact_datetime'].strftime("%Y-%m-%d %H:%M"),
+                lambda c: c['contact_method'],
+                lambda c: str(c['conversion_rating']) if c['conversion_rating'] else "",
+                lambda c: c['notes_preview'] or "",
+                lambda c: c['status']
+            ]
+        )
 
         # Add contact button
         self.add_button = QPushButton("Schedule New Contact")
@@ -53,6 +132,17 @@ class ScheduleManager(QWidget):
         """)
         left_layout.addWidget(self.add_button)
 
+        # Spreading follow-ups across the team (managers only)
+        if self.user_data['role'] == 'manager':
+            self.assign_button = QPushButton("Assign Follow-ups...")
+            self.assign_button.clicked.connect(self.assign_followups)
+            left_layout.addWidget(self.assign_button)
+
+        # Refresh button
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(self.refresh_contacts)
+        left_layout.addWidget(self.refresh_button)
+
         layout.addWidget(left_widget)
 
         # Right side - Contact details form
@@ -60,14 +150,39 @@ class ScheduleManager(QWidget):
         self.form_layout = QFormLayout(right_widget)
 
         # Client selection
-        self.client_combo = QComboBox()
-        self.form_layout.addRow("Client:", self.client_combo)
+        self.client_picker = ClientPicker(self.db_manager)
+        self.client_picker.follow(self.client_store)
+        self.form_layout.addRow("Client:", self.client_picker)
 
         # Date and time
         self.datetime_edit = QDateTimeEdit(QDateTime.currentDateTime())
         self.datetime_edit.setCalendarPopup(True)
         self.form_layout.addRow("Date/Time:", self.datetime_edit)
 
+        # Duration
+        self.duration_spin = QSpinBox()
+        self.duration_spin.setRange(5, MAX_DURATION)
+        self.duration_spin.setSingleStep(5)
+        self.duration_spin.setValue(DEFAULT_DURATION)
+        self.duration_spin.setSuffix(" min")
+        self.form_layout.addRow("Duration:", self.duration_spin)
+
+        # Double-booking warning, with the next free slot
+        conflict_layout = QHBoxLayout()
+        self.conflict_label = QLabel()
+        self.conflict_label.setWordWrap(True)
+        self.conflict_label.setStyleSheet("color: #b02a37;")
+        conflict_layout.addWidget(self.conflict_label, 1)
+        self.free_slot_button = QPushButton()
+        self.free_slot_button.clicked.connect(self.use_free_slot)
+        conflict_layout.addWidget(self.free_slot_button)
+        self.form_layout.addRow("", conflict_layout)
+        self.free_slot = None
+        self.show_conflicts([])
+
+        self.datetime_edit.dateTimeChanged.connect(self.check_conflicts)
+        self.duration_spin.valueChanged.connect(self.check_conflicts)
+
         # Contact method
         self.method_combo = QComboBox()
         self.method_combo.addItems(["phone", "email", "in-person", "other"])
@@ -86,8 +201,26 @@ class ScheduleManager(QWidget):
         # Status
         self.status_combo = QComboBox()
         self.status_combo.addItems(["Scheduled", "Completed", "Cancelled"])
+        self.status_combo.currentTextChanged.connect(self.check_conflicts)
         self.form_layout.addRow("Status:", self.status_combo)
 
+        # Recurrence; a series is stored once and shown in the calendar
+        # and reports, expanded for the window on screen
+        self.repeat_combo = QComboBox()
+        self.repeat_combo.addItems([label for label, rule in REPEAT_CHOICES])
+        self.form_layout.addRow("Repeat:", self.repeat_combo)
+
+        ends_layout = QHBoxLayout()
+        self.ends_check = QCheckBox("Until")
+        ends_layout.addWidget(self.ends_check)
+        self.ends_on_edit = QDateEdit(QDate.currentDate().addYears(1))
+        self.ends_on_edit.setCalendarPopup(True)
+        self.ends_on_edit.setEnabled(False)
+        self.ends_check.toggled.connect(self.ends_on_edit.setEnabled)
+        ends_layout.addWidget(self.ends_on_edit, 1)
+        self.form_layout.addRow("", ends_layout)
+        self.repeat_combo.currentIndexChanged.connect(self.update_repeat_controls)
+
         # Buttons
         button_layout = QHBoxLayout()
         
@@ -155,51 +288,150 @@ class ScheduleManager(QWidget):
             }
         """)
 
-        # Initialize current contact id and load clients
+        # Initialize current contact id
         self.current_contact_id = None
-        self.load_clients()
-
-    def load_clients(self):
-        """Load clients into combo box"""
-        clients = self.db_manager.get_clients()
-        self.client_combo.clear()
-        for client in clients:
-            self.client_combo.addItem(
-                f"{client['name']} ({client['client_type']})",
-                client['id']
-            )
+        # (series, occurrence_at) when the form shows a series occurrence
+        self.current_occurrence = None
+        self.update_repeat_controls()
+
+    def create_search_tab(self):
+        """Full-text search over contact notes"""
+        search_widget = QWidget()
+        search_layout = QVBoxLayout(search_widget)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText(
+            'Search notes... ("exact phrase", prefix*)'
+        )
+        self.search_input.returnPressed.connect(self.search_notes)
+        search_layout.addWidget(self.search_input)
+
+        # Search as the user pauses typing
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.search_notes)
+        self.search_input.textEdited.connect(self.search_timer.start)
+
+        self.search_table = QTableWidget()
+        self.search_table.setColumnCount(4)
+        self.search_table.setHorizontalHeaderLabels([
+            "Client Name", "Date/Time", "Employee", "Notes"
+        ])
+        self.search_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.Stretch
+        )
+        self.search_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.search_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.search_table.cellDoubleClicked.connect(self.open_search_result)
+        search_layout.addWidget(self.search_table)
 
-    def load_contacts(self):
-        """Load contacts into table"""
-        # Get contacts based on user role
-        contacts = self.db_manager.get_employee_contacts(
-            self.user_data['id'],
-            self.user_data['role'] == 'manager'
+        return search_widget
+
+    @Slot()
+    def search_notes(self):
+        """Show the contacts whose notes best match the search box"""
+        self.search_timer.stop()
+        # Employees search their own contacts, like the list shows them
+        employee_id = (None if self.user_data['role'] == 'manager'
+                       else self.user_data['id'])
+        results = self.db_manager.search_contact_notes(
+            self.search_input.text(), employee_id=employee_id
         )
-        
-        self.contact_table.setRowCount(len(contacts))
-        
-        for row, contact in enumerate(contacts):
-            self.contact_table.setItem(
-                row, 0, QTableWidgetItem(contact['client_name'])
-            )
-            # Format datetime
-            dt = contact['contact_datetime'].strftime("%Y-%m-%d %H:%M")
-            self.contact_table.setItem(row, 1, QTableWidgetItem(dt))
-            self.contact_table.setItem(
-                row, 2, QTableWidgetItem(contact['contact_method'])
+        self.search_table.setRowCount(len(results))
+        for row, result in enumerate(results):
+            name_item = QTableWidgetItem(result['client_name'])
+            name_item.setData(Qt.UserRole, result['id'])
+            self.search_table.setItem(row, 0, name_item)
+            self.search_table.setItem(row, 1, QTableWidgetItem(
+                result['contact_datetime'].strftime("%Y-%m-%d %H:%M")
+            ))
+            self.search_table.setItem(
+                row, 2, QTableWidgetItem(result['employee_name'])
             )
-            rating = str(contact['conversion_rating']) if contact['conversion_rating'] else ""
-            self.contact_table.setItem(row, 3, QTableWidgetItem(rating))
-            self.contact_table.setItem(
-                row, 4, QTableWidgetItem(contact['notes'] or "")
+            notes_item = QTableWidgetItem(
+                " ".join((result['notes'] or "").split())
             )
-            self.contact_table.setItem(
-                row, 5, QTableWidgetItem(contact['status'])
+            notes_item.setToolTip(result['notes'] or "")
+            self.search_table.setItem(row, 3, notes_item)
+
+    @Slot(int, int)
+    def open_search_result(self, row, column):
+        """Show a search result in the list and form"""
+        contact_id = self.search_table.item(row, 0).data(Qt.UserRole)
+        if self.contact_store.position(contact_id) >= 0:
+            self.view_tabs.setCurrentWidget(self.list_widget)
+            self.select_contact(contact_id)
+
+    def load_contacts(self):
+        """Load contacts into table"""
+        self.contact_store.ensure_loaded()
+        self.load_upcoming_occurrences()
+        self.contact_store.series_changed.connect(self.load_upcoming_occurrences)
+        self.contact_store.rows_reset.connect(self.load_upcoming_occurrences)
+        self.contact_store.row_inserted.connect(self._contact_stored)
+
+    @Slot()
+    def load_upcoming_occurrences(self):
+        """List the series occurrences of the next UPCOMING_DAYS"""
+        now = datetime.now()
+        self.upcoming = [
+            row for row in self.db_manager.get_employee_contacts(
+                self.user_data['id'],
+                self.user_data['role'] == 'manager',
+                now,
+                now + timedelta(days=UPCOMING_DAYS),
+                'Scheduled',
+                columns=['contact_datetime', 'contact_method', 'notes_preview',
+                         'series_id', 'occurrence_at', 'client_name'],
+                occurrences=True
             )
-            
-            # Store contact ID in the first cell
-            self.contact_table.item(row, 0).setData(Qt.UserRole, contact['id'])
+            # Stored contacts are in the list above
+            if row['id'] < 0
+        ]
+        self.occurrence_table.blockSignals(True)
+        self.occurrence_table.setRowCount(len(self.upcoming))
+        for row, occurrence in enumerate(self.upcoming):
+            for column, text in enumerate((
+                    occurrence['client_name'],
+                    occurrence['contact_datetime'].strftime("%Y-%m-%d %H:%M"),
+                    occurrence['contact_method'],
+                    occurrence['notes_preview'] or "")):
+                self.occurrence_table.setItem(row, column, QTableWidgetItem(text))
+        self.occurrence_table.blockSignals(False)
+
+    @Slot(int, object)
+    def _contact_stored(self, position, contact):
+        # A stored occurrence leaves the series' list
+        if contact.get('series_id') is not None:
+            self.load_upcoming_occurrences()
+
+    @Slot()
+    def load_selected_occurrence(self):
+        """Load the selected upcoming occurrence into the form"""
+        selected_items = self.occurrence_table.selectedItems()
+        if not selected_items:
+            return
+        occurrence = self.upcoming[selected_items[0].row()]
+        self.load_occurrence(occurrence['series_id'], occurrence['occurrence_at'])
+
+    @Slot()
+    def assign_followups(self):
+        """Let a manager assign follow-ups for clients with nothing scheduled"""
+        AssignmentDialog(self.db_manager, self.contact_store, self).exec()
+
+    @Slot()
+    def refresh_contacts(self):
+        """Pick up changes made elsewhere, redrawing only changed rows"""
+        self.contact_store.refresh()
+        self.load_upcoming_occurrences()
+
+    @Slot(int)
+    def select_contact(self, contact_id):
+        """Select a contact in the list, loading it into the form"""
+        position = self.contact_store.position(contact_id)
+        if position >= 0:
+            self.contact_table.selectRow(position)
 
     @Slot()
     def load_selected_contact(self):
@@ -208,28 +440,39 @@ class ScheduleManager(QWidget):
         if not selected_items:
             return
 
+        self.occurrence_table.clearSelection()
+
         # Get contact ID from the first cell of selected row
         self.current_contact_id = self.contact_table.item(
             selected_items[0].row(), 0
         ).data(Qt.UserRole)
 
         # Get contact data
-        contacts = self.db_manager.get_employee_contacts(
-            self.user_data['id'],
-            self.user_data['role'] == 'manager'
-        )
-        contact = next(
-            (c for c in contacts if c['id'] == self.current_contact_id), 
-            None
-        )
+        contact = self.contact_store.full_row(self.current_contact_id)
+        self.current_occurrence = None
         
         if contact:
-            # Find and set client in combo box
-            client_index = self.client_combo.findData(contact['client_id'])
-            self.client_combo.setCurrentIndex(client_index)
+            # A stored occurrence still belongs to its series
+            if contact['series_id']:
+                series = self.db_manager.get_series(contact['series_id'])
+                if series is not None:
+                    self.current_occurrence = (series, contact['occurrence_at'])
+            self.update_repeat_controls()
+
+            # Show the client without looking it up
+            self.client_picker.set_client(
+                contact['client_id'],
+                ClientPicker.client_label({
+                    'name': contact['client_name'],
+                    'client_type': contact['client_type']
+                })
+            )
             
             # Set datetime
             self.datetime_edit.setDateTime(contact['contact_datetime'])
+            self.duration_spin.setValue(
+                contact['duration_minutes'] or DEFAULT_DURATION
+            )
             
             # Set method
             self.method_combo.setCurrentText(contact['contact_method'])
@@ -244,36 +487,237 @@ class ScheduleManager(QWidget):
             
             # Set status
             self.status_combo.setCurrentText(contact['status'])
+            self.check_conflicts()
+
+    @Slot(int, object)
+    def load_occurrence(self, series_id, occurrence_at):
+        """Load a series occurrence with no contact row yet into the form
+
+        Saving it stores it as an override of the series.
+        """
+        series = self.db_manager.get_series(series_id)
+        if series is None:
+            QMessageBox.warning(self, "Error", "Failed to load the series.")
+            return
+        self.contact_table.clearSelection()
+        self.current_contact_id = None
+        self.current_occurrence = (series, occurrence_at)
+        self.client_picker.set_client(
+            series['client_id'], ClientPicker.client_label({
+                'name': series['client_name'],
+                'client_type': series['client_type']
+            })
+        )
+        self.datetime_edit.setDateTime(occurrence_at)
+        self.duration_spin.setValue(series['duration_minutes'])
+        self.method_combo.setCurrentText(series['contact_method'])
+        self.rating_combo.setCurrentIndex(0)
+        self.notes_edit.setText(series['notes'] or "")
+        self.status_combo.setCurrentText("Scheduled")
+        self.update_repeat_controls()
+        self.check_conflicts()
+
+    @Slot()
+    def update_repeat_controls(self):
+        """Offer repeating only for new contacts; show an occurrence's rule"""
+        if self.current_occurrence is not None:
+            series = self.current_occurrence[0]
+            rule = (series['frequency'], series['every'])
+            self.repeat_combo.blockSignals(True)
+            self.repeat_combo.setCurrentIndex(next(
+                (index for index, (label, choice) in enumerate(REPEAT_CHOICES)
+                 if choice == rule), 0
+            ))
+            self.repeat_combo.blockSignals(False)
+            self.repeat_combo.setEnabled(False)
+            self.ends_check.setEnabled(False)
+            self.ends_on_edit.setEnabled(False)
+            return
+        new = self.current_contact_id is None
+        if not new:
+            self.repeat_combo.setCurrentIndex(0)
+        self.repeat_combo.setEnabled(new)
+        repeats = new and self.repeat_combo.currentIndex() > 0
+        self.ends_check.setEnabled(repeats)
+        self.ends_on_edit.setEnabled(repeats and self.ends_check.isChecked())
 
     @Slot()
     def clear_form(self):
         """Clear the form for new contact entry"""
         self.current_contact_id = None
-        self.client_combo.setCurrentIndex(0)
+        self.current_occurrence = None
+        self.repeat_combo.setCurrentIndex(0)
+        self.ends_check.setChecked(False)
+        self.update_repeat_controls()
+        self.client_picker.clear_selection()
         self.datetime_edit.setDateTime(QDateTime.currentDateTime())
+        self.duration_spin.setValue(DEFAULT_DURATION)
         self.method_combo.setCurrentIndex(0)
         self.rating_combo.setCurrentIndex(0)
         self.notes_edit.clear()
         self.status_combo.setCurrentIndex(0)
         self.contact_table.clearSelection()
+        self.occurrence_table.clearSelection()
+        self.check_conflicts()
+
+    def _ensure_schedule_index(self):
+        """Index the loaded contacts for overlap checks on first use"""
+        if self.schedule_index is not None:
+            return
+        self.schedule_index = ScheduleIndex()
+        self._rebuild_schedule_index()
+        self.contact_store.rows_reset.connect(self._rebuild_schedule_index)
+        self.contact_store.row_inserted.connect(self._schedule_contact_changed)
+        self.contact_store.row_updated.connect(self._schedule_contact_changed)
+        self.contact_store.row_removed.connect(self._schedule_contact_removed)
+        self.contact_store.series_changed.connect(self._forget_occurrences)
+
+    def _rebuild_schedule_index(self):
+        self.schedule_index.rebuild(self.contact_store.rows())
+        self.indexed_occurrences = {}
+        self.occurrence_window = None
+
+    def _schedule_contact_changed(self, position, contact):
+        self.schedule_index.add(contact)
+        if contact.get('series_id') is not None:
+            # A stored occurrence replaces the expanded one
+            self._forget_occurrences()
+
+    @Slot()
+    def _forget_occurrences(self):
+        for contact_id in self.indexed_occurrences:
+            self.schedule_index.remove(contact_id)
+        self.indexed_occurrences = {}
+        self.occurrence_window = None
+
+    def _index_occurrences(self, start):
+        """Make sure the index holds the series occurrences around start"""
+        window = self.occurrence_window
+        if window is not None and window[0] + timedelta(days=1) <= start \
+                and start + timedelta(days=OCCURRENCE_INDEX_DAYS - 8) <= window[1]:
+            return
+        self._forget_occurrences()
+        first = datetime.combine(start.date() - timedelta(days=1),
+                                 datetime.min.time())
+        self.occurrence_window = (
+            first, first + timedelta(days=OCCURRENCE_INDEX_DAYS)
+        )
+        for row in self.db_manager.get_employee_contacts(
+                self.user_data['id'],
+                self.user_data['role'] == 'manager',
+                *self.occurrence_window,
+                'Scheduled',
+                columns=['employee_id', 'contact_datetime', 'duration_minutes',
+                         'status', 'client_name'],
+                occurrences=True):
+            # Stored contacts are indexed from the store
+            if row['id'] < 0:
+                self.indexed_occurrences[row['id']] = row
+                self.schedule_index.add(row)
+
+    def _editing_id(self):
+        """Id of the contact in the form, negative for an unstored occurrence"""
+        if self.current_contact_id is not None or self.current_occurrence is None:
+            return self.current_contact_id
+        series, occurrence_at = self.current_occurrence
+        for index, _ in occurrence_times(series, occurrence_at,
+                                         occurrence_at + timedelta(seconds=1)):
+            return occurrence_id(series['id'], index)
+        return None
+
+    def _schedule_contact_removed(self, position, contact_id):
+        # A contact that only moved position is re-added by row_inserted
+        if self.contact_store.get(contact_id) is None:
+            self.schedule_index.remove(contact_id)
+
+    def _employee_id(self):
+        """Whose contact the form holds; new contacts are the user's own"""
+        if self.current_contact_id is not None:
+            contact = self.contact_store.get(self.current_contact_id)
+            if contact is not None:
+                return contact['employee_id']
+        if self.current_occurrence is not None:
+            return self.current_occurrence[0]['employee_id']
+        return self.user_data['id']
+
+    def _booking(self):
+        """(start, end) of the contact in the form"""
+        start = self.datetime_edit.dateTime().toPython()
+        return start, start + timedelta(minutes=self.duration_spin.value())
+
+    @Slot()
+    def check_conflicts(self):
+        """Flag the employee's contacts overlapping the one being edited"""
+        if self.status_combo.currentText() == "Cancelled":
+            self.show_conflicts([])
+            return
+        self._ensure_schedule_index()
+        start, end = self._booking()
+        self._index_occurrences(start)
+        conflicts = [
+            self.contact_store.get(contact_id)
+            or self.indexed_occurrences[contact_id]
+            for contact_id in self.schedule_index.conflicts(
+                self._employee_id(), start, end, self._editing_id()
+            )
+        ]
+        self.show_conflicts(conflicts)
+
+    def show_conflicts(self, conflicts):
+        """Show overlapping contacts and offer the next free slot"""
+        if not conflicts:
+            self.free_slot = None
+            self.conflict_label.hide()
+            self.free_slot_button.hide()
+            return
+        self.conflict_label.setText("Overlaps: " + "; ".join(
+            f"{contact['client_name']} at "
+            f"{contact['contact_datetime'].strftime('%H:%M')}"
+            for contact in conflicts[:3]
+        ))
+        self.conflict_label.show()
+        self.free_slot = self.schedule_index.next_free_slot(
+            self._employee_id(), self._booking()[0], self.duration_spin.value(),
+            exclude_id=self._editing_id()
+        )
+        if self.free_slot is None:
+            self.free_slot_button.hide()
+            return
+        self.free_slot_button.setText(
+            "Use " + self.free_slot.strftime(
+                "%H:%M" if self.free_slot.date() == self._booking()[0].date()
+                else "%a %Y-%m-%d %H:%M"
+            )
+        )
+        self.free_slot_button.show()
+
+    @Slot()
+    def use_free_slot(self):
+        """Move the contact being edited to the offered free slot"""
+        if self.free_slot is not None:
+            self.datetime_edit.setDateTime(self.free_slot)
 
     @Slot()
     def save_contact(self):
         """Save current contact data"""
         # Validate required fields
-        if self.client_combo.currentIndex() == -1:
+        client_id = self.client_picker.client_id()
+        if client_id is None:
             QMessageBox.warning(
                 self,
                 "Validation Error",
                 "Please select a client."
             )
+            self.client_picker.setFocus()
             return
 
         # Prepare contact data
         contact_data = {
-            'client_id': self.client_combo.currentData(),
-            'employee_id': self.user_data['id'],
+            'client_id': client_id,
+            # Editing never hands a contact to someone else
+            'employee_id': self._employee_id(),
             'contact_datetime': self.datetime_edit.dateTime().toPython(),
+            'duration_minutes': self.duration_spin.value(),
             'contact_method': self.method_combo.currentText(),
             'status': self.status_combo.currentText(),
             'notes': self.notes_edit.toPlainText().strip() or None
@@ -284,32 +728,146 @@ class ScheduleManager(QWidget):
         if rating_text:
             contact_data['conversion_rating'] = int(rating_text)
 
+        # The index only knows this session's rows; ask the database too
+        if contact_data['status'] != "Cancelled":
+            start, end = self._booking()
+            conflicts = self.db_manager.get_conflicting_contacts(
+                contact_data['employee_id'], start, end, self._editing_id()
+            )
+            if conflicts:
+                reply = QMessageBox.question(
+                    self,
+                    "Double Booking",
+                    "This contact overlaps:\n" + "\n".join(
+                        f"{conflict['client_name']} at "
+                        f"{conflict['contact_datetime'].strftime('%Y-%m-%d %H:%M')}"
+                        for conflict in conflicts
+                    ) + "\n\nSave it anyway?",
+                    QMessageBox.Yes | QMessageBox.No,
+                    QMessageBox.No
+                )
+                if reply != QMessageBox.Yes:
+                    return
+
+        rule = REPEAT_CHOICES[self.repeat_combo.currentIndex()][1]
+        if self.current_contact_id is None and self.current_occurrence is None \
+                and rule is not None:
+            self.save_series(contact_data, rule)
+            return
+
+        if self.current_occurrence is not None and self.current_contact_id is None:
+            # Store this occurrence as an override of its series
+            series, occurrence_at = self.current_occurrence
+            contact_data['series_id'] = series['id']
+            contact_data['occurrence_at'] = occurrence_at
+
         if self.current_contact_id is None:
             # Create new contact
-            contact_id = self.db_manager.create_contact(contact_data)
+            contact_id = self.contact_store.create(contact_data)
             if contact_id:
                 QMessageBox.information(
                     self,
                     "Success",
                     "Contact scheduled successfully."
                 )
+            else:
+                QMessageBox.critical(
+                    self,
+                    "Error",
+                    "Failed to save contact."
+                )
+                return
         else:
             # Update existing contact
             contact_data['id'] = self.current_contact_id
-            if self.db_manager.update_contact(contact_data):
+            if self.contact_store.update(contact_data):
                 QMessageBox.information(
                     self,
                     "Success",
                     "Contact updated successfully."
                 )
+            else:
+                QMessageBox.critical(
+                    self,
+                    "Error",
+                    "Failed to save contact."
+                )
+                return
 
-        # Refresh contact list
-        self.load_contacts()
+        self.clear_form()
+
+    def save_series(self, contact_data, rule):
+        """Store the form as a recurring series starting at its date/time"""
+        frequency, every = rule
+        series_data = {
+            'client_id': contact_data['client_id'],
+            'employee_id': contact_data['employee_id'],
+            'first_datetime': contact_data['contact_datetime'],
+            'duration_minutes': contact_data['duration_minutes'],
+            'contact_method': contact_data['contact_method'],
+            'notes': contact_data['notes'],
+            'frequency': frequency,
+            'every': every,
+            'ends_on': (self.ends_on_edit.date().toPython()
+                        if self.ends_check.isChecked() else None)
+        }
+        if not self.contact_store.create_series(series_data):
+            QMessageBox.critical(self, "Error", "Failed to save recurring contact.")
+            return
+        QMessageBox.information(
+            self, "Success", "Recurring contact scheduled successfully."
+        )
+        self.clear_form()
+
+    def delete_occurrence(self):
+        """Cancel one occurrence of a series, or end the series before it"""
+        series, occurrence_at = self.current_occurrence
+        box = QMessageBox(self)
+        box.setWindowTitle("Delete Recurring Contact")
+        box.setText("Delete only this occurrence, or this and all following ones?")
+        this_button = box.addButton("This Occurrence", QMessageBox.AcceptRole)
+        following_button = box.addButton(
+            "This and Following", QMessageBox.DestructiveRole
+        )
+        box.addButton(QMessageBox.Cancel)
+        box.exec()
+
+        if box.clickedButton() is this_button:
+            # A cancelled override, so the series skips this occurrence
+            if self.current_contact_id is not None:
+                contact = dict(self.contact_store.full_row(self.current_contact_id))
+                contact['status'] = 'Cancelled'
+                done = self.contact_store.update(contact)
+            else:
+                done = self.contact_store.create({
+                    'client_id': series['client_id'],
+                    'employee_id': series['employee_id'],
+                    'contact_datetime': occurrence_at,
+                    'duration_minutes': series['duration_minutes'],
+                    'contact_method': series['contact_method'],
+                    'notes': series['notes'],
+                    'status': 'Cancelled',
+                    'series_id': series['id'],
+                    'occurrence_at': occurrence_at
+                })
+        elif box.clickedButton() is following_button:
+            done = self.contact_store.end_series(
+                series['id'], occurrence_at.date() - timedelta(days=1)
+            )
+        else:
+            return
+
+        if not done:
+            QMessageBox.critical(self, "Error", "Failed to delete contact.")
+            return
         self.clear_form()
 
     @Slot()
     def delete_contact(self):
         """Delete current contact"""
+        if self.current_occurrence is not None:
+            self.delete_occurrence()
+            return
         if self.current_contact_id is None:
             return
 
@@ -322,13 +880,12 @@ class ScheduleManager(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            if self.db_manager.delete_contact(self.current_contact_id):
+            if self.contact_store.delete(self.current_contact_id):
                 QMessageBox.information(
                     self,
                     "Success",
                     "Contact deleted successfully."
                 )
-                self.load_contacts()
                 self.clear_form()
             else:
                 QMessageBox.critical(
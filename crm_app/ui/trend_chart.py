@@ -0,0 +1,180 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy
+from PySide6.QtGui import QPainter, QPainterPath, QPen, QColor, QFont
+from PySide6.QtCore import Qt, Signal, QRectF, QPointF, QTimer
+from trends import METHODS
+
+METHOD_COLORS = {
+    'phone': QColor("#0d6efd"),
+    'email': QColor("#198754"),
+    'in_person': QColor("#fd7e14"),
+    'other': QColor("#6c757d")
+}
+
+
+class TrendPlot(QWidget):
+    """Line or stacked-bar plot of one bucketed series
+
+    The painter paths are built once per data or size change and then only
+    replayed, so repaints cost the same however many contacts the buckets
+    summarise.
+    """
+
+    MARGIN = 24
+
+    def __init__(self, kind, parent=None):
+        super().__init__(parent)
+        self.kind = kind  # 'total', 'avg_rating' or 'methods'
+        self.buckets = []
+        self._paths = None
+        self.setMinimumHeight(120)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def set_buckets(self, buckets):
+        """Replace the plotted buckets"""
+        self.buckets = buckets
+        self._paths = None
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._paths = None
+
+    def _plot_rect(self):
+        return QRectF(self.MARGIN, self.MARGIN / 2,
+                      max(1, self.width() - 2 * self.MARGIN),
+                      max(1, self.height() - 1.5 * self.MARGIN))
+
+    def _max_value(self):
+        if self.kind == 'avg_rating':
+            return 5.0
+        return max([b['total'] for b in self.buckets] + [1])
+
+    def _build_paths(self):
+        rect = self._plot_rect()
+        count = len(self.buckets)
+        step = rect.width() / max(count, 1)
+        top = self._max_value()
+
+        def y_for(value):
+            return rect.bottom() - rect.height() * value / top
+
+        if self.kind == 'methods':
+            paths = {method: QPainterPath() for method in METHODS}
+            for index, bucket in enumerate(self.buckets):
+                base = 0
+                x = rect.left() + index * step
+                for method in METHODS:
+                    value = bucket[method]
+                    if value:
+                        paths[method].addRect(QRectF(
+                            x, y_for(base + value), max(step - 1, 1),
+                            y_for(base) - y_for(base + value)
+                        ))
+                    base += value
+            return paths
+
+        path = QPainterPath()
+        started = False
+        for index, bucket in enumerate(self.buckets):
+            value = bucket[self.kind]
+            if value is None:
+                # No rated contacts; break the line rather than draw zero
+                started = False
+                continue
+            point = QPointF(rect.left() + (index + 0.5) * step, y_for(value))
+            if started:
+                path.lineTo(point)
+            else:
+                path.moveTo(point)
+                started = True
+        return {self.kind: path}
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self._plot_rect()
+
+        # Axes
+        painter.setPen(QPen(QColor("#dee2e6"), 1))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+        painter.drawLine(rect.bottomLeft(), rect.topLeft())
+        painter.setPen(QColor("#6c757d"))
+        painter.setFont(QFont("Arial", 8))
+        top = self._max_value()
+        painter.drawText(QRectF(0, rect.top() - 6, self.MARGIN - 2, 12),
+                         Qt.AlignRight | Qt.AlignVCenter,
+                         f"{top:g}" if self.kind == 'avg_rating' else str(int(top)))
+        if self.buckets:
+            first = self.buckets[0]['start'].strftime("%Y-%m-%d")
+            last = self.buckets[-1]['start'].strftime("%Y-%m-%d")
+            label_rect = QRectF(rect.left(), rect.bottom() + 2, rect.width(), 12)
+            painter.drawText(label_rect, Qt.AlignLeft, first)
+            painter.drawText(label_rect, Qt.AlignRight, last)
+
+        if self._paths is None:
+            self._paths = self._build_paths()
+        for name, path in self._paths.items():
+            if self.kind == 'methods':
+                painter.fillPath(path, METHOD_COLORS[name])
+            else:
+                painter.setPen(QPen(QColor("#0d6efd"), 2))
+                painter.drawPath(path)
+        painter.end()
+
+
+class TrendCharts(QWidget):
+    """Contacts per bucket, average rating over time and method mix"""
+
+    # Emitted with the plot width in pixels when the buckets should change
+    width_changed = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+
+        self.bucket_label = QLabel()
+        layout.addWidget(self.bucket_label)
+
+        layout.addWidget(QLabel("Contacts"))
+        self.total_plot = TrendPlot('total')
+        layout.addWidget(self.total_plot)
+
+        layout.addWidget(QLabel("Average Rating"))
+        self.rating_plot = TrendPlot('avg_rating')
+        layout.addWidget(self.rating_plot)
+
+        legend = "   ".join(
+            f"<span style='color:{METHOD_COLORS[m].name()}'>&#9632;</span> "
+            f"{m.replace('_', '-')}" for m in METHODS
+        )
+        layout.addWidget(QLabel(f"Contact Methods   {legend}"))
+        self.method_plot = TrendPlot('methods')
+        layout.addWidget(self.method_plot)
+
+        # Re-bucket once resizing settles rather than on every pixel
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(300)
+        self.resize_timer.timeout.connect(
+            lambda: self.width_changed.emit(self.plot_width())
+        )
+
+    def plot_width(self):
+        """Pixel width available to the plotted buckets"""
+        return max(1, self.total_plot.width() - 2 * TrendPlot.MARGIN)
+
+    def set_buckets(self, buckets):
+        """Show new bucketed statistics in every plot"""
+        if buckets:
+            days = buckets[0]['days']
+            unit = "day" if days == 1 else f"{days} days"
+            self.bucket_label.setText(f"One point per {unit}")
+        else:
+            self.bucket_label.setText("No data")
+        for plot in (self.total_plot, self.rating_plot, self.method_plot):
+            plot.set_buckets(buckets)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if event.oldSize().width() != event.size().width():
+            self.resize_timer.start()